@@ -4,4 +4,6 @@ def create_app():
     app = Flask(__name__)
     from .routes import main
     app.register_blueprint(main)
+    from .api import api
+    app.register_blueprint(api)
     return app
@@ -0,0 +1,236 @@
+"""API JSON versi 1 untuk run, minimize, convert, dan equivalence.
+
+Semua endpoint menerima dan mengembalikan skema automata kanonik dari
+``app.logic.serialization``. Body boleh JSON atau msgpack
+(``Content-Type: application/msgpack``, jika paket msgpack terpasang);
+response memakai msgpack bila diminta lewat header ``Accept``.
+"""
+import time
+
+from flask import Blueprint, Response, jsonify, make_response, request
+
+from app.logic.cache import automata_cache, fingerprint
+from app.logic.nfa_to_dfa import HYBRID_MAX_STATES
+from app.logic.offload import (
+    Saturated, api_convert_job, api_equivalence_job, api_minimize_job, budget, offloader,
+)
+from app.logic.render import to_dot, to_svg
+from app.logic.serialization import (
+    CONVERT_TARGETS, dfa_to_schema, encode_packed, schema_fingerprint, to_compiled_dfa, to_lazy, validate_automaton,
+)
+from app.logic.store import stored
+from app.logic.tes_dfa import compile_dfa, run_dfa_batch
+
+try:
+    import msgpack
+except ImportError:  # msgpack opsional
+    msgpack = None
+
+MSGPACK = "application/msgpack"
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+
+
+class APIError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _wants_msgpack():
+    return msgpack is not None and request.accept_mimetypes.best == MSGPACK
+
+
+def _respond(payload, status=200):
+    if _wants_msgpack():
+        return Response(msgpack.packb(payload, use_bin_type=True), status=status, mimetype=MSGPACK)
+    return jsonify(payload), status
+
+
+def _body():
+    if request.mimetype == MSGPACK:
+        if msgpack is None:
+            raise APIError("msgpack tidak terpasang di server", 415)
+        try:
+            body = msgpack.unpackb(request.get_data(), raw=False)
+        except Exception:
+            raise APIError("Body msgpack tidak valid") from None
+    else:
+        body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        raise APIError("Body harus berupa object JSON")
+    return body
+
+
+def _automaton(body, key="automaton"):
+    if key not in body:
+        raise APIError(f"Field '{key}' wajib diisi")
+    return validate_automaton(body[key])
+
+
+def _compiled(data):
+    # Key yang sama dengan /tes-dfa (routes._dfa_key), jadi entri store dipakai bersama
+    key = schema_fingerprint(data, "tes-dfa")
+    if data.get("encoding") == "packed":
+        # Sudah berupa tabel; tidak perlu disimpan ulang ke disk
+        return automata_cache.get_or_create(key, lambda: to_compiled_dfa(data))
+    return automata_cache.get_or_create(key, lambda: stored(key, lambda: to_compiled_dfa(data)))
+
+
+def _matcher(data):
+    # Untuk /run: cache DFA dibatasi, string sisanya disimulasikan di NFA (hybrid)
+    key = schema_fingerprint(data, "api-matcher")
+    return automata_cache.get_or_create(
+        key, lambda: to_lazy(data, max_states=HYBRID_MAX_STATES, hybrid=True)
+    )
+
+
+def _limits(body):
+    """Batas subset construction dari body, tidak boleh melebihi budget server."""
+    server = dict(budget("convert"))
+    # Subset construction berhenti sebelum alarm worker supaya DFA sebagian
+    # masih sempat dikembalikan
+    server["seconds"] *= 0.8
+    limits = {}
+    for field, key in (("max_states", "max_states"), ("max_seconds", "seconds"), ("max_memory", "max_memory")):
+        value = body.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0):
+            raise APIError(f"Field '{field}' harus berupa angka positif")
+        limits[field] = server[key] if value is None else min(value, server[key])
+    return limits
+
+
+def _dfa_output(dfa, encoding):
+    if encoding == "packed":
+        compiled = compile_dfa(dfa.states, dfa.alphabet, dfa.start_state, dfa.final_states, dfa.transitions)
+        return encode_packed(compiled, binary=_wants_msgpack())
+    return dfa_to_schema(dfa)
+
+
+@api.errorhandler(APIError)
+def _api_error(error):
+    return _respond({"error": str(error)}, error.status)
+
+
+@api.errorhandler(Saturated)
+def _saturated(error):
+    response = make_response(_respond({"error": str(error), "retry_after": error.retry_after}, 503))
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response
+
+
+@api.errorhandler(ValueError)
+def _value_error(error):
+    return _respond({"error": str(error)}, 400)
+
+
+@api.route('/run', methods=['POST'])
+def run():
+    body = _body()
+    data = _automaton(body)
+    strings = body.get("strings")
+    if strings is None:
+        strings = [body.get("string", "")]
+    if not isinstance(strings, list) or not all(isinstance(s, str) for s in strings):
+        raise APIError("Field 'strings' harus berupa list string")
+    trace = bool(body.get("trace", False))
+
+    started = time.perf_counter()
+    traces = None
+    if data["type"] == "dfa":
+        compiled = _compiled(data)
+        if trace:
+            runs = [compiled.run(s, trace=True) for s in strings]
+            verdicts = [accepted for _, accepted in runs]
+            traces = [[list(step) for step in steps] for steps, _ in runs]
+        else:
+            verdicts = run_dfa_batch(compiled, strings)
+    else:
+        lazy = _matcher(data)
+        if trace:
+            runs = [lazy.test_string(s) for s in strings]
+            verdicts = [accepted for accepted, _ in runs]
+            traces = [[[states, symbol] for states, symbol in path] for _, path in runs]
+        else:
+            verdicts = [lazy.accepts(s) for s in strings]
+    elapsed = time.perf_counter() - started
+
+    payload = {
+        "verdicts": verdicts,
+        "count": len(verdicts),
+        "elapsed_seconds": elapsed,
+        "strings_per_second": len(verdicts) / elapsed if elapsed > 0 else None,
+    }
+    if traces is not None:
+        payload["traces"] = traces
+    return _respond(payload)
+
+
+@api.route('/minimize', methods=['POST'])
+def minimize():
+    body = _body()
+    data = _automaton(body)
+    if data["type"] != "dfa":
+        raise APIError("Minimisasi hanya untuk DFA; gunakan /convert dengan to=minimal-dfa")
+    engine = body.get("engine", "hopcroft")
+    if not isinstance(engine, str):
+        raise APIError("Field 'engine' harus berupa string")
+    render = body.get("render")
+
+    # Minimisasi di process pool dengan budget "minimization" (503 jika antrean penuh)
+    canonical = schema_fingerprint(data, "dfa")
+    key = fingerprint("api-minimize", [engine, canonical])
+    # Key store sama dengan build_and_minimize_dfa (/minimization)
+    store_key = fingerprint("minimized", [engine, canonical])
+    states_before, minimized = automata_cache.get_or_create(
+        key, lambda: offloader.run("minimization", api_minimize_job, data, engine, store_key)
+    )
+    payload = {
+        "automaton": _dfa_output(minimized, body.get("encoding")),
+        "states_before": states_before,
+        "states_after": len(minimized.states),
+    }
+    if render == "svg":
+        payload["svg"] = to_svg(minimized)
+    elif render == "dot":
+        payload["dot"] = to_dot(minimized)
+    elif render == "png":
+        payload["image_base64"] = minimized.draw()
+    elif render is not None:
+        raise APIError(f"Format render tidak dikenal: {render}")
+    return _respond(payload)
+
+
+@api.route('/convert', methods=['POST'])
+def convert():
+    body = _body()
+    data = _automaton(body)
+    target = body.get("to", "dfa")
+    if target not in CONVERT_TARGETS:
+        raise APIError(f"Field 'to' harus salah satu dari {', '.join(CONVERT_TARGETS)}")
+
+    # Subset construction + Hopcroft di process pool dengan budget "convert"
+    converted, incomplete = offloader.run("convert", api_convert_job, data, target, _limits(body))
+    if target == "nfa":
+        return _respond({"automaton": converted})
+    if incomplete is not None:
+        # DFA sebagian (belum diminimisasi) beserta diagnostik, bukan error
+        return _respond({"automaton": _dfa_output(converted, body.get("encoding")), "complete": False,
+                         **incomplete})
+    return _respond({"automaton": _dfa_output(converted, body.get("encoding")), "complete": True})
+
+
+@api.route('/equivalence', methods=['POST'])
+def equivalence():
+    body = _body()
+    left = _automaton(body, "left")
+    right = _automaton(body, "right")
+    # Sama seperti /equivalence web: di process pool dengan budget "equivalence"
+    key = fingerprint("api-equivalence", [schema_fingerprint(left), schema_fingerprint(right)])
+    equivalent, counterexample, accepted_by = automata_cache.get_or_create(
+        key, lambda: offloader.run("equivalence", api_equivalence_job, left, right)
+    )
+    payload = {"equivalent": equivalent, "counterexample": counterexample}
+    if accepted_by is not None:
+        payload["accepted_by"] = accepted_by
+    return _respond(payload)
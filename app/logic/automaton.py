@@ -0,0 +1,251 @@
+"""Inti DFA bersama: immutable, berindeks integer, nama di-intern sekali.
+
+Nama state dan simbol disimpan sekali di tuple ``states`` / ``symbols``;
+transisi berupa tabel ``delta`` ukuran ``n * k`` (baris per state, kolom per
+simbol) berisi index state tujuan atau ``MISSING`` (-1, menuju sink
+implisit). Minimisasi, ekivalensi, tes string, dan serialisasi membaca
+bentuk ini langsung, sehingga berpindah antar fitur tidak perlu parse dan
+hash ulang string.
+
+Bentuk dict lama tersedia sebagai view tanpa salin:
+
+- ``pairs()``  : ``{(state, symbol): target}`` seperti ``parse_transitions``
+  dan ``DFA.transitions``;
+- ``nested()`` : ``{state: {symbol: target}}`` seperti
+  ``parse_dfa(...)['transitions']``;
+- ``parsed()`` : dict lengkap berformat hasil ``parse_dfa``.
+"""
+from array import array
+from collections.abc import Mapping
+
+MISSING = -1
+
+
+class Automaton:
+    __slots__ = ("states", "symbols", "state_index", "symbol_index", "start", "accepting", "delta")
+
+    def __init__(self, states, symbols, start, accepting, delta):
+        """Sebaiknya lewat ``build``. ``delta`` berupa array('i') (disalin sekali ke buffer
+        read-only) atau memoryview 'i' yang sudah read-only (dipakai apa adanya)."""
+        set_ = object.__setattr__
+        set_(self, "states", tuple(states))
+        set_(self, "symbols", tuple(symbols))
+        set_(self, "state_index", {name: i for i, name in enumerate(self.states)})
+        set_(self, "symbol_index", {symbol: a for a, symbol in enumerate(self.symbols)})
+        set_(self, "start", start)
+        # Salinan read-only: tabel tidak bisa diubah lewat objek ini
+        set_(self, "accepting", bytes(accepting))
+        set_(self, "delta", memoryview(bytes(delta)).cast('i') if isinstance(delta, array) else delta)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Automaton tidak bisa diubah")
+
+    def __reduce__(self):
+        # memoryview tidak bisa di-pickle
+        return type(self), (self.states, self.symbols, self.start, self.accepting, array('i', self.delta))
+
+    @classmethod
+    def build(cls, states, symbols, start, finals, transitions, add_missing=True):
+        """Intern nama lalu isi tabel dari iterable triple (asal, simbol, tujuan).
+
+        ``add_missing=True`` menambahkan state/simbol yang hanya muncul di
+        transisi atau start (perilaku ``compile_dfa``); ``False`` mengabaikan
+        transisinya (perilaku ``DFA``: dianggap menuju sink). Transisi ganda
+        untuk pasangan yang sama: yang terakhir dipakai.
+        """
+        state_index = {name: i for i, name in enumerate(dict.fromkeys(states))}
+        symbol_index = {symbol: a for a, symbol in enumerate(dict.fromkeys(symbols))}
+        triples = []
+        for source, symbol, target in transitions:
+            if add_missing:
+                i = state_index.setdefault(source, len(state_index))
+                a = symbol_index.setdefault(symbol, len(symbol_index))
+                j = state_index.setdefault(target, len(state_index))
+            else:
+                i, a, j = state_index.get(source), symbol_index.get(symbol), state_index.get(target)
+                if i is None or a is None or j is None:
+                    continue
+            triples.append((i, a, j))
+        if add_missing and start is not None:
+            state_index.setdefault(start, len(state_index))
+
+        k = len(symbol_index)
+        delta = array('i', [MISSING]) * (len(state_index) * k)
+        for i, a, j in triples:
+            delta[i * k + a] = j
+        accepting = bytearray(len(state_index))
+        for name in finals:
+            i = state_index.get(name)
+            if i is not None:
+                accepting[i] = 1
+        return cls(state_index, symbol_index, state_index.get(start, MISSING), accepting, delta)
+
+    @classmethod
+    def from_parsed(cls, dfa):
+        """Dict hasil ``parse_dfa``; tanpa kerja jika transisinya view dari ``parsed()``."""
+        view = dfa['transitions']
+        if isinstance(view, NestedView) and view.automaton.start_state == dfa['start']:
+            return view.automaton
+        return cls.build(
+            sorted(dfa['states']), sorted(dfa['symbols']), dfa['start'], dfa['finals'],
+            ((s, a, t) for s, row in view.items() for a, t in row.items()),
+            add_missing=False,
+        )
+
+    @property
+    def start_state(self):
+        return self.states[self.start] if self.start != MISSING else None
+
+    @property
+    def final_states(self):
+        return frozenset(name for name, flag in zip(self.states, self.accepting) if flag)
+
+    def __len__(self):
+        return len(self.states)
+
+    def target(self, i, a):
+        return self.delta[i * len(self.symbols) + a]
+
+    def triples(self):
+        """(i, a, j) berindeks untuk semua transisi yang terdefinisi."""
+        delta = self.delta
+        k = len(self.symbols)
+        for i in range(len(self.states)):
+            row = i * k
+            for a in range(k):
+                j = delta[row + a]
+                if j != MISSING:
+                    yield i, a, j
+
+    def iter_transitions(self):
+        states, symbols = self.states, self.symbols
+        for i, a, j in self.triples():
+            yield states[i], symbols[a], states[j]
+
+    def pairs(self):
+        return PairView(self)
+
+    def nested(self):
+        return NestedView(self)
+
+    def parsed(self):
+        return {
+            'states': frozenset(self.states),
+            'symbols': frozenset(self.symbols),
+            'start': self.start_state,
+            'finals': self.final_states,
+            'transitions': NestedView(self),
+        }
+
+
+class PairView(Mapping):
+    """``{(state, symbol): target}`` di atas ``Automaton`` tanpa menyalin."""
+
+    __slots__ = ("automaton",)
+
+    def __init__(self, automaton):
+        self.automaton = automaton
+
+    def __getitem__(self, key):
+        core = self.automaton
+        try:
+            state, symbol = key
+        except (TypeError, ValueError):
+            raise KeyError(key) from None
+        i, a = core.state_index.get(state), core.symbol_index.get(symbol)
+        if i is None or a is None:
+            raise KeyError(key)
+        j = core.target(i, a)
+        if j == MISSING:
+            raise KeyError(key)
+        return core.states[j]
+
+    def __iter__(self):
+        states, symbols = self.automaton.states, self.automaton.symbols
+        for i, a, _ in self.automaton.triples():
+            yield states[i], symbols[a]
+
+    def __len__(self):
+        return sum(1 for _ in self.automaton.triples())
+
+    def items(self):
+        return _ItemsView(self, lambda: (((s, a), t) for s, a, t in self.automaton.iter_transitions()))
+
+
+class NestedView(Mapping):
+    """``{state: {symbol: target}}`` di atas ``Automaton``; setiap baris juga view."""
+
+    __slots__ = ("automaton",)
+
+    def __init__(self, automaton):
+        self.automaton = automaton
+
+    def __getitem__(self, state):
+        i = self.automaton.state_index.get(state)
+        if i is None:
+            raise KeyError(state)
+        return RowView(self.automaton, i)
+
+    def __iter__(self):
+        return iter(self.automaton.states)
+
+    def __len__(self):
+        return len(self.automaton.states)
+
+
+class RowView(Mapping):
+    __slots__ = ("automaton", "row")
+
+    def __init__(self, automaton, row):
+        self.automaton = automaton
+        self.row = row
+
+    def __getitem__(self, symbol):
+        core = self.automaton
+        a = core.symbol_index.get(symbol)
+        if a is None:
+            raise KeyError(symbol)
+        j = core.target(self.row, a)
+        if j == MISSING:
+            raise KeyError(symbol)
+        return core.states[j]
+
+    def _columns(self):
+        core = self.automaton
+        k = len(core.symbols)
+        base = self.row * k
+        for a in range(k):
+            j = core.delta[base + a]
+            if j != MISSING:
+                yield a, j
+
+    def __iter__(self):
+        symbols = self.automaton.symbols
+        return (symbols[a] for a, _ in self._columns())
+
+    def __len__(self):
+        return sum(1 for _ in self._columns())
+
+    def items(self):
+        core = self.automaton
+        return _ItemsView(self, lambda: ((core.symbols[a], core.states[j]) for a, j in self._columns()))
+
+
+class _ItemsView:
+    """ItemsView ringan: iterasi langsung dari tabel tanpa lookup per key."""
+
+    __slots__ = ("mapping", "factory")
+
+    def __init__(self, mapping, factory):
+        self.mapping = mapping
+        self.factory = factory
+
+    def __iter__(self):
+        return self.factory()
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def __contains__(self, item):
+        key, value = item
+        return self.mapping.get(key, MISSING) == value
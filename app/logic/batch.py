@@ -0,0 +1,237 @@
+"""Batch minimisasi/konversi automata di process pool, tanpa server HTTP.
+
+Contoh:
+
+    python -m app.logic.batch jobs.jsonl -o hasil.jsonl
+    python -m app.logic.batch automata/ -o hasil.jsonl --op convert --to dfa --workers 8
+    python -m app.logic.batch jobs.jsonl --timeout 5 --render svg > hasil.jsonl
+    python -m app.logic.batch regex.jsonl --op convert --to dfa --max-states 10000
+
+Input berupa file JSONL (satu job per baris) atau direktori berisi file
+``*.json`` (satu job per file, diurutkan menurut nama). Job bisa berupa
+skema automata langsung (lihat ``app.logic.serialization``) atau object::
+
+    {"id": "a1", "op": "minimize", "automaton": {...}}
+    {"id": "a2", "op": "convert", "to": "nfa", "automaton": {"type": "regex", "pattern": "a*b"}}
+
+Job dikirim ke worker per chunk; jumlah chunk yang sedang berjalan dibatasi
+sehingga memori tetap konstan. Output JSONL ditulis dengan urutan yang sama
+dengan input. Setiap job punya batas waktu sendiri (SIGALRM di worker),
+jadi satu input patologis hanya menghasilkan error untuk job itu.
+``--max-states`` / ``--max-memory`` menghentikan subset construction lebih
+awal; record-nya berisi error beserta ``diagnostics``.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from app.logic.nfa_to_dfa import DeterminizationIncomplete
+from app.logic.serialization import (
+    CONVERT_TARGETS, convert_automaton, dfa_to_schema, nfa_to_schema, validate_automaton,
+)
+
+OPS = ("minimize", "convert")
+RENDERS = ("none", "svg", "dot", "png")
+
+
+class JobTimeout(BaseException):
+    # BaseException supaya tidak tertelan ``except Exception`` di kode logic
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise JobTimeout()
+
+
+def run_job(job, defaults):
+    """Jalankan satu job (dict) dan kembalikan record hasil; tidak pernah raise."""
+    started = time.perf_counter()
+    record = {"id": job.get("id") if isinstance(job, dict) else None}
+    timeout = defaults.get("timeout")
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM") and signal.getsignal(signal.SIGALRM) is _on_alarm
+    if use_alarm:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        if "error" in job and "automaton" not in job:
+            raise ValueError(job["error"])
+        data = validate_automaton(job.get("automaton", job))
+        op = job.get("op", defaults["op"])
+        if op not in OPS:
+            raise ValueError(f"Operasi tidak dikenal: {op}")
+        target = job.get("to", defaults["to"]) if op == "convert" else "minimal-dfa"
+        engine = job.get("engine", defaults["engine"])
+
+        converted = convert_automaton(data, target, engine=engine, limits=defaults.get("limits"))
+        if target == "nfa":
+            record["result"] = nfa_to_schema(converted)
+        else:
+            record["result"] = dfa_to_schema(converted)
+            record["states"] = len(converted.states)
+            render = job.get("render", defaults["render"])
+            if render == "svg":
+                from app.logic.render import to_svg
+                record["svg"] = to_svg(converted)
+            elif render == "dot":
+                from app.logic.render import to_dot
+                record["dot"] = to_dot(converted)
+            elif render == "png":
+                record["image_base64"] = converted.draw()
+        record["ok"] = True
+    except DeterminizationIncomplete as e:
+        record["ok"] = False
+        record["error"] = str(e)
+        record["diagnostics"] = e.result.diagnostics()
+    except JobTimeout:
+        record["ok"] = False
+        record["error"] = f"Melebihi batas waktu {timeout} detik"
+    except Exception as e:
+        record["ok"] = False
+        record["error"] = str(e)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    record["elapsed_seconds"] = time.perf_counter() - started
+    return record
+
+
+def _init_worker():
+    if hasattr(signal, "SIGALRM"):
+        try:
+            signal.signal(signal.SIGALRM, _on_alarm)
+        except ValueError:
+            pass  # bukan main thread: job berjalan tanpa batas waktu
+
+
+def run_chunk(jobs, defaults):
+    return [run_job(job, defaults) for job in jobs]
+
+
+def iter_jobs(path):
+    """Generator job dari file JSONL atau direktori ``*.json``; baris rusak jadi job error."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(path, name), encoding="utf-8") as f:
+                try:
+                    job = json.load(f)
+                except ValueError as e:
+                    job = {"error": f"JSON tidak valid: {e}"}
+            if isinstance(job, dict):
+                job.setdefault("id", name[:-5])
+            yield job
+        return
+
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                job = {"id": number, "error": f"JSON tidak valid: {e}"}
+            if not isinstance(job, dict):
+                job = {"id": number, "error": "Job harus berupa object JSON"}
+            job.setdefault("id", number)
+            yield job
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def _chunks(jobs, size):
+    chunk = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(jobs, workers=None, chunk_size=32, **defaults):
+    """Yield record hasil sesuai urutan ``jobs``.
+
+    ``workers=1`` menjalankan semuanya di proses ini (tanpa pool).
+    """
+    defaults = {"op": "minimize", "to": "minimal-dfa", "engine": "hopcroft",
+                "render": "none", "timeout": None, "limits": None, **defaults}
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker()
+        for job in jobs:
+            yield run_job(job, defaults)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker) as pool:
+        in_flight = deque()
+        for chunk in _chunks(jobs, chunk_size):
+            in_flight.append(pool.submit(run_chunk, chunk, defaults))
+            # Batasi chunk yang berjalan supaya input besar tidak dibaca sekaligus
+            while len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m app.logic.batch")
+    parser.add_argument("input", help="file JSONL, direktori *.json, atau '-' untuk stdin")
+    parser.add_argument("-o", "--output", default="-", help="file JSONL hasil (default stdout)")
+    parser.add_argument("--op", choices=OPS, default="minimize")
+    parser.add_argument("--to", choices=CONVERT_TARGETS, default="minimal-dfa",
+                        help="target untuk --op convert")
+    parser.add_argument("--engine", choices=("hopcroft", "legacy"), default="hopcroft")
+    parser.add_argument("--render", choices=RENDERS, default="none",
+                        help="gambar hasil DFA (default tidak dirender)")
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses (default jumlah core)")
+    parser.add_argument("--chunk-size", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=30.0, help="batas waktu per job (detik), 0 = tanpa batas")
+    parser.add_argument("--max-states", type=int, default=None,
+                        help="batas state DFA subset construction regex/NFA (hasil sebagian + diagnostik)")
+    parser.add_argument("--max-memory", type=int, default=None,
+                        help="batas perkiraan memori subset construction (byte)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    total = failed = 0
+    started = time.perf_counter()
+    try:
+        results = run_batch(
+            iter_jobs(args.input), workers=args.workers, chunk_size=args.chunk_size,
+            op=args.op, to=args.to, engine=args.engine, render=args.render,
+            timeout=args.timeout or None,
+            limits={"max_states": args.max_states, "max_memory": args.max_memory}
+            if args.max_states or args.max_memory else None,
+        )
+        for record in results:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            total += 1
+            failed += not record["ok"]
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+    print(f"{total} job, {failed} gagal, {elapsed:.2f} s ({total / elapsed if elapsed else 0:.1f} job/s)",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+from app.logic.metrics import timed
+
+EPSILON = '&'
+
+
+class BitsetNFA:
+    """NFA dengan state 0..n-1 dan himpunan state sebagai bitmask int.
+
+    Untuk setiap simbol disimpan mask successor per state yang sudah
+    ε-closed, dikelompokkan per byte: satu langkah simulasi cukup satu OR
+    per byte mask yang tidak nol, dan hasil OR per (byte, nilai) di-cache.
+    """
+
+    def __init__(self, names, alphabet, initial, finals, transitions):
+        # transitions: dict {(i, symbol): iterable index target}, symbol '&' untuk ε
+        self.names = list(names)
+        self.n = len(self.names)
+        self.alphabet = set(alphabet)
+        self.nbytes = max(1, (self.n + 7) // 8)
+
+        epsilon = [0] * self.n
+        moves = {}
+        for (i, symbol), targets in transitions.items():
+            mask = 0
+            for t in targets:
+                mask |= 1 << t
+            if symbol == EPSILON:
+                epsilon[i] |= mask
+            else:
+                moves.setdefault(symbol, [0] * self.n)[i] |= mask
+
+        self.closures = [self._close(1 << i, epsilon) for i in range(self.n)]
+        self.succ = {
+            symbol: [self.closure(mask) for mask in row]
+            for symbol, row in moves.items()
+        }
+        self._chunks = {symbol: [None] * self.nbytes for symbol in self.succ}
+
+        self.initial = self.closures[initial] if initial is not None else 0
+        self.finals = 0
+        for f in finals:
+            self.finals |= 1 << f
+
+    @staticmethod
+    def _close(mask, epsilon):
+        closure = mask
+        frontier = mask
+        while frontier:
+            low = frontier & -frontier
+            frontier ^= low
+            new = epsilon[low.bit_length() - 1] & ~closure
+            closure |= new
+            frontier |= new
+        return closure
+
+    @classmethod
+    @timed("bitset_compile")
+    def from_nfa(cls, nfa):
+        index = {id(state): i for i, state in enumerate(nfa.states)}
+        transitions = {}
+        for state in nfa.states:
+            for symbol, targets in state.transitions.items():
+                transitions[(index[id(state)], symbol)] = [index[id(t)] for t in targets]
+        initial = index[id(nfa.initial_state)] if nfa.initial_state is not None else None
+        finals = [index[id(f)] for f in nfa.final_states]
+        return cls([str(s) for s in nfa.states], nfa.alphabet, initial, finals, transitions)
+
+    def closure(self, mask):
+        result = 0
+        closures = self.closures
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            result |= closures[low.bit_length() - 1]
+        return result
+
+    def step(self, mask, symbol):
+        chunks = self._chunks.get(symbol)
+        if chunks is None:
+            return 0
+        result = 0
+        for k, byte in enumerate(mask.to_bytes(self.nbytes, 'little')):
+            if byte:
+                table = chunks[k]
+                if table is None:
+                    table = chunks[k] = [None] * 256
+                value = table[byte]
+                if value is None:
+                    value = self._or_byte(symbol, k, byte)
+                    table[byte] = value
+                result |= value
+        return result
+
+    def _or_byte(self, symbol, k, byte):
+        succ = self.succ[symbol]
+        value = 0
+        for bit in range(8):
+            if byte >> bit & 1:
+                value |= succ[k * 8 + bit]
+        return value
+
+    def accepts(self, string):
+        mask = self.initial
+        for symbol in string:
+            mask = self.step(mask, symbol)
+            if not mask:
+                return False
+        return bool(mask & self.finals)
+
+    def state_names(self, mask):
+        names = set()
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            names.add(self.names[low.bit_length() - 1])
+        return sorted(names)
+
+    def test_string(self, input_string):
+        """Output sama dengan NFA.test_string."""
+        if not self.initial:
+            return False, []
+        mask = self.initial
+        path = [(self.state_names(mask), None)]
+        for symbol in input_string:
+            if symbol not in self.alphabet:
+                return False, path
+            mask = self.step(mask, symbol)
+            if not mask:
+                return False, path
+            path.append((self.state_names(mask), symbol))
+        return bool(mask & self.finals), path
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Cache LRU thread-safe dengan batas ukuran dan TTL opsional (detik)."""
+
+    def __init__(self, maxsize=256, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires, value = entry
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            # factory dijalankan di luar lock; dua request bersamaan bisa
+            # sama-sama membangun, yang terakhir menimpa
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def fingerprint(kind, payload):
+    """Hash sha256 dari representasi JSON kanonik (key terurut)."""
+    data = json.dumps([kind, payload], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def automaton_fingerprint(kind, states, alphabet, start, finals, transitions):
+    """Fingerprint automata; ``transitions`` berupa iterable (asal, simbol, tujuan).
+
+    Urutan dan duplikasi pada input tidak mempengaruhi hasil.
+    """
+    return fingerprint(kind, {
+        "states": sorted(set(states)),
+        "alphabet": sorted(set(alphabet)),
+        "start": start,
+        "finals": sorted(set(finals)),
+        "transitions": sorted(set(transitions)),
+    })
+
+
+def regex_fingerprint(regex):
+    return fingerprint("regex", regex)
+
+
+def _env_number(name, default, cast):
+    value = os.environ.get(name)
+    return cast(value) if value else default
+
+
+# Cache bersama untuk satu proses (per worker gunicorn)
+automata_cache = LRUCache(
+    maxsize=_env_number("TBA_CACHE_SIZE", 256, int),
+    ttl=_env_number("TBA_CACHE_TTL", 3600.0, float),
+)
+
+# Rekaman langkah simulasi (app.logic.trace) untuk paginasi; bisa besar, jadi
+# disimpan terpisah dengan batas lebih kecil
+trace_cache = LRUCache(
+    maxsize=_env_number("TBA_TRACE_CACHE_SIZE", 32, int),
+    ttl=_env_number("TBA_TRACE_CACHE_TTL", 900.0, float),
+)
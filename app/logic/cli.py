@@ -0,0 +1,154 @@
+"""CLI untuk menjalankan automata sebagai filter baris tanpa server HTTP.
+
+Contoh:
+
+    python -m app.logic.cli match --regex "(a|b)*abb" access.log
+    python -m app.logic.cli match --dfa genap.dfa --count --mmap big.log
+    cat tokens.txt | python -m app.logic.cli match --regex "[0-9]+"
+
+File DFA memakai field yang sama dengan form /equivalence (``parse_dfa``)::
+
+    states: q0,q1
+    symbols: a,b
+    start: q0
+    finals: q1
+    transitions:
+    q0,a,q1
+    q0,b,q0
+    q1,a,q0
+    q1,b,q1
+
+Setiap baris (tanpa newline) diuji utuh terhadap automata. Memori konstan
+terhadap ukuran file: input dibaca baris per baris lewat buffer atau mmap.
+"""
+import argparse
+import mmap
+import sys
+
+from app.logic.automaton import Automaton
+from app.logic.nfa_to_dfa import HYBRID_MAX_STATES, SubsetDFA
+from app.logic.regex_to_nfa import RegexToNFA
+from app.logic.tes_dfa import CompiledDFA
+from app.logic.tes_equivalen import parse_dfa
+
+_FIELDS = ("states", "symbols", "start", "finals")
+
+
+def parse_dfa_file(text):
+    """Baca definisi DFA berformat ``key: value`` menjadi dict dari parse_dfa."""
+    fields = {}
+    transitions = []
+    in_transitions = False
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if in_transitions:
+            transitions.append(line)
+            continue
+        key, sep, value = line.partition(":")
+        key = key.strip().lower()
+        if not sep:
+            raise ValueError(f"Baris tidak valid: '{line}'")
+        if key == "transitions":
+            in_transitions = True
+            if value.strip():
+                transitions.append(value.strip())
+        elif key in _FIELDS:
+            fields[key] = value.strip()
+        else:
+            raise ValueError(f"Field tidak dikenal: '{key}'")
+    missing = [key for key in _FIELDS if key not in fields]
+    if missing:
+        raise ValueError(f"Field belum diisi: {', '.join(missing)}")
+    return parse_dfa(fields["states"], fields["symbols"], fields["start"],
+                     fields["finals"], "\n".join(transitions))
+
+
+def load_matcher(regex=None, dfa_path=None):
+    """Kembalikan objek dengan method ``accepts(string)``."""
+    if regex is not None:
+        # Regex patologis tidak menghabiskan memori: lewat batas, sisa baris disimulasikan di NFA
+        return SubsetDFA(RegexToNFA().regex_to_nfa(regex), max_states=HYBRID_MAX_STATES, hybrid=True)
+    with open(dfa_path, encoding="utf-8") as f:
+        dfa = parse_dfa_file(f.read())
+    return CompiledDFA.from_automaton(Automaton.from_parsed(dfa))
+
+
+def iter_lines(stream, use_mmap=False):
+    """Generator baris (bytes, tanpa newline) dari file biner."""
+    if use_mmap:
+        try:
+            mm = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            mm = None  # file kosong atau stream (pipe) tidak bisa di-mmap
+        if mm is not None:
+            with mm:
+                for line in iter(mm.readline, b""):
+                    yield line.rstrip(b"\r\n")
+            return
+    for line in stream:
+        yield line.rstrip(b"\r\n")
+
+
+def match_stream(matcher, lines, invert=False):
+    """Yield nomor baris (mulai 1) yang diterima automata."""
+    accepts = matcher.accepts
+    for number, line in enumerate(lines, 1):
+        if accepts(line.decode("utf-8", errors="replace")) != invert:
+            yield number
+
+
+def cmd_match(args):
+    matcher = load_matcher(regex=args.regex, dfa_path=args.dfa)
+    paths = args.files or ["-"]
+    out = sys.stdout
+    total = 0
+    for path in paths:
+        if path == "-":
+            stream, close = sys.stdin.buffer, False
+        else:
+            stream, close = open(path, "rb"), True
+        try:
+            count = 0
+            lines = iter_lines(stream, use_mmap=args.mmap and close)
+            for number in match_stream(matcher, lines, invert=args.invert_match):
+                count += 1
+                if not args.count:
+                    out.write(f"{path}:{number}\n" if len(paths) > 1 else f"{number}\n")
+        finally:
+            if close:
+                stream.close()
+        if args.count:
+            out.write(f"{path}:{count}\n" if len(paths) > 1 else f"{count}\n")
+        total += count
+    return 0 if total else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m app.logic.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    match = sub.add_parser("match", help="cetak nomor baris yang diterima automata")
+    source = match.add_mutually_exclusive_group(required=True)
+    source.add_argument("--regex", help="regex (sintaks yang sama dengan /regex-to-nfa)")
+    source.add_argument("--dfa", help="file definisi DFA")
+    match.add_argument("files", nargs="*", help="file input, '-' atau kosong untuk stdin")
+    match.add_argument("-c", "--count", action="store_true", help="cetak jumlah baris yang cocok saja")
+    match.add_argument("-v", "--invert-match", action="store_true", help="pilih baris yang ditolak")
+    match.add_argument("--mmap", action="store_true", help="baca file lewat mmap")
+    match.set_defaults(func=cmd_match)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""Matcher regex dengan turunan Brzozowski, langsung di atas AST ``regex_parser``.
+
+Turunan regex r terhadap simbol c adalah regex untuk {w | cw ∈ L(r)}, jadi
+string w diterima jika turunan r terhadap w berturut-turut nullable
+(menerima ε). Tidak ada NFA yang dibangun: untuk regex sekali pakai yang
+hanya diuji pada beberapa string, ini lebih murah daripada Thompson
+construction + simulasi.
+
+Setiap term di-hash-cons menjadi id integer (term yang sama = id yang sama),
+dan smart constructor menyederhanakannya (∅·r = ∅, ε·r = r, r|r = r, union
+diratakan dan diurutkan, (r*)* = r*). Dengan begitu himpunan turunan yang
+berbeda terbatas, dan cache ``(id, simbol) -> id`` pelan-pelan menjadi DFA
+lazy: turunan yang pernah dihitung tidak dihitung ulang.
+"""
+from app.logic.metrics import inc
+from app.logic.nfa_to_dfa import StateLimitExceeded
+from app.logic.regex_parser import (
+    CharClass, Concat, Empty, Opt, Plus, Repeat, Star, Symbol, Union, parse_regex,
+)
+from app.logic.trace import Trace
+
+# Id tetap untuk ∅ (bahasa kosong) dan ε
+NOTHING = 0
+EPS = 1
+
+_NOTHING, _EPS, _SYM, _CAT, _ALT, _STAR = range(6)
+
+_SPECIAL = set('|*+?(){}[]\\&')
+
+
+class DerivativeMatcher:
+    """Matcher satu regex; id term dipakai sebagai state untuk ``trace``.
+
+    ``max_states`` membatasi jumlah turunan berbeda yang dicapai oleh input
+    (state DFA lazy); turunan berikutnya melempar ``StateLimitExceeded``
+    seperti ``SubsetDFA``.
+    """
+
+    def __init__(self, regex, max_states=None):
+        self.max_states = max_states
+        self.terms = []      # id -> (jenis, argumen...)
+        self.nullable = []   # id -> bool
+        self._ids = {}       # hash-consing: term -> id
+        self._derivatives = {}  # (id, simbol) -> id, untuk semua subterm
+        self._texts = {}
+        self.rows = {}       # id state yang dicapai input -> {simbol: id}
+        self._intern((_NOTHING,), False)
+        self._intern((_EPS,), True)
+        ast = parse_regex(regex) if isinstance(regex, str) else regex
+        self.start = self._from_ast(ast)
+        self.rows[self.start] = {}
+
+    # --- Smart constructor ---------------------------------------------------
+
+    def _intern(self, term, nullable):
+        i = self._ids.get(term)
+        if i is None:
+            i = len(self.terms)
+            self._ids[term] = i
+            self.terms.append(term)
+            self.nullable.append(nullable)
+        return i
+
+    def symbol(self, chars):
+        return self._intern((_SYM, frozenset(chars)), False)
+
+    def cat(self, items):
+        """Konkatenasi sebagai cons cell (kepala, ekor) bersarang ke kanan."""
+        result = EPS
+        for item in reversed(items):
+            result = self._cons(item, result)
+        return result
+
+    def _cons(self, head, tail):
+        if head == NOTHING or tail == NOTHING:
+            return NOTHING
+        if head == EPS:
+            return tail
+        if tail == EPS:
+            return head
+        term = self.terms[head]
+        if term[0] == _CAT:
+            # (r1 r2) r3 = r1 (r2 r3): kepala tidak pernah berupa konkatenasi
+            parts = []
+            while term[0] == _CAT:
+                parts.append(term[1])
+                head = term[2]
+                term = self.terms[head]
+            tail = self._cons(head, tail)
+            for part in reversed(parts):
+                tail = self._cons(part, tail)
+            return tail
+        return self._intern((_CAT, head, tail), self.nullable[head] and self.nullable[tail])
+
+    def alt(self, items):
+        flat = set()
+        for item in items:
+            term = self.terms[item]
+            if term[0] == _ALT:
+                flat.update(term[1])
+            elif item != NOTHING:
+                flat.add(item)
+        nullable = self.nullable
+        if EPS in flat and any(nullable[i] for i in flat if i != EPS):
+            # ε sudah termasuk alternatif lain yang nullable
+            flat.discard(EPS)
+        if not flat:
+            return NOTHING
+        if len(flat) == 1:
+            return flat.pop()
+        return self._intern((_ALT, tuple(sorted(flat))), any(nullable[i] for i in flat))
+
+    def star(self, item):
+        if item in (NOTHING, EPS):
+            return EPS
+        term = self.terms[item]
+        if term[0] == _STAR:
+            return item
+        if term[0] == _ALT and EPS in term[1]:
+            # (r|ε)* = r*
+            return self.star(self.alt([x for x in term[1] if x != EPS]))
+        return self._intern((_STAR, item), True)
+
+    def _from_ast(self, node):
+        if isinstance(node, Empty):
+            return EPS
+        if isinstance(node, Symbol):
+            return self.symbol((node.char,))
+        if isinstance(node, CharClass):
+            return self.symbol(node.chars)
+        if isinstance(node, Concat):
+            return self.cat([self._from_ast(item) for item in node.items])
+        if isinstance(node, Union):
+            return self.alt([self._from_ast(item) for item in node.items])
+        if isinstance(node, Star):
+            return self.star(self._from_ast(node.node))
+        if isinstance(node, Plus):
+            inner = self._from_ast(node.node)
+            return self.cat([inner, self.star(inner)])
+        if isinstance(node, Opt):
+            return self.alt([EPS, self._from_ast(node.node)])
+        if isinstance(node, Repeat):
+            inner = self._from_ast(node.node)
+            if node.max is None:
+                tail = self.star(inner)
+            else:
+                # r{0,k} bersarang (r(r(r)?)?)? supaya turunannya tidak melebar
+                tail = EPS
+                for _ in range(node.max - node.min):
+                    tail = self.alt([EPS, self.cat([inner, tail])])
+            return self.cat([inner] * node.min + [tail])
+        raise TypeError(f"Node regex tidak dikenal: {node!r}")
+
+    # --- Turunan ---------------------------------------------------------------
+
+    def derive(self, i, symbol):
+        """Id turunan term ``i`` terhadap ``symbol`` (di-memo per pasangan)."""
+        key = (i, symbol)
+        cached = self._derivatives.get(key)
+        if cached is not None:
+            return cached
+        term = self.terms[i]
+        kind = term[0]
+        if kind == _SYM:
+            result = EPS if symbol in term[1] else NOTHING
+        elif kind == _CAT:
+            # d(r1 r2 ... rn) = d(r1) r2..rn | d(r2) r3..rn (jika r1 nullable) | ...
+            # Ditelusuri dengan loop supaya rantai panjang tidak menambah kedalaman rekursi
+            branches = []
+            while kind == _CAT:
+                head, tail = term[1], term[2]
+                branches.append(self._cons(self.derive(head, symbol), tail))
+                if not self.nullable[head]:
+                    break
+                term = self.terms[tail]
+                kind = term[0]
+            else:
+                branches.append(self.derive(tail, symbol))
+            result = self.alt(branches)
+        elif kind == _ALT:
+            result = self.alt([self.derive(item, symbol) for item in term[1]])
+        elif kind == _STAR:
+            head = self.derive(term[1], symbol)
+            result = NOTHING if head == NOTHING else self.cat([head, i])
+        else:
+            result = NOTHING
+        self._derivatives[key] = result
+        inc("regex_derivatives_computed")
+        return result
+
+    def step(self, state, symbol):
+        row = self.rows[state]
+        nxt = row.get(symbol)
+        if nxt is None:
+            nxt = self.derive(state, symbol)
+            if nxt not in self.rows:
+                if self.max_states is not None and len(self.rows) >= self.max_states:
+                    raise StateLimitExceeded(f"Matcher turunan melebihi batas {self.max_states} state")
+                self.rows[nxt] = {}
+            row[symbol] = nxt
+        return nxt
+
+    def accepts(self, string):
+        state = self.start
+        rows = self.rows
+        for symbol in string:
+            nxt = rows[state].get(symbol)
+            state = self.step(state, symbol) if nxt is None else nxt
+            if state == NOTHING:
+                return False
+        return self.nullable[state]
+
+    def trace(self, input_string, max_steps=None):
+        """``Trace`` berisi id term; konfigurasi ditampilkan sebagai sisa regex."""
+        result = Trace(input_string, self.state_names, max_steps, engine="derivative")
+        state = self.start
+        recording = result.append(state)
+        for symbol in input_string:
+            state = self.step(state, symbol)
+            if state == NOTHING:
+                break
+            if recording:
+                recording = result.append(state)
+        result.accepted = self.nullable[state]
+        return result
+
+    # --- Tampilan ----------------------------------------------------------------
+
+    def state_names(self, i):
+        """Sisa regex untuk tabel trace (list satu elemen, seperti himpunan state NFA)."""
+        return [self.to_regex(i)]
+
+    def to_regex(self, i):
+        text = self._texts.get(i)
+        if text is None:
+            text = self._texts[i] = self._render(i)
+        return text
+
+    def _render(self, i):
+        term = self.terms[i]
+        kind = term[0]
+        if kind == _NOTHING:
+            return "∅"
+        if kind == _EPS:
+            return "&"
+        if kind == _SYM:
+            chars = sorted(term[1])
+            if len(chars) == 1:
+                return _escape(chars[0])
+            return "[" + "".join("\\" + c if c in "]\\-^" else c for c in chars) + "]"
+        if kind == _CAT:
+            parts = []
+            while term[0] == _CAT:
+                parts.append(self._wrap(term[1], optional_ok=True))
+                i = term[2]
+                term = self.terms[i]
+            parts.append(self._wrap(i, optional_ok=True))
+            return "".join(parts)
+        if kind == _ALT:
+            items = [item for item in term[1] if item != EPS]
+            if len(items) < len(term[1]):
+                inner = items[0] if len(items) == 1 else self.alt(items)
+                return self._wrap(inner) + "?"
+            return "|".join(self.to_regex(item) for item in items)
+        return self._wrap(term[1]) + "*"
+
+    def _wrap(self, i, optional_ok=False):
+        """Teks term ``i`` sebagai operand; kurung jika prioritasnya lebih rendah."""
+        term = self.terms[i]
+        text = self.to_regex(i)
+        if term[0] == _ALT:
+            if optional_ok and EPS in term[1]:
+                return text
+            return f"({text})"
+        if term[0] in (_CAT, _STAR) and not optional_ok:
+            return f"({text})"
+        return text
+
+
+def _escape(char):
+    return "\\" + char if char in _SPECIAL else char
+
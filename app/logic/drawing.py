@@ -0,0 +1,50 @@
+"""Backend gambar PNG untuk DFA.
+
+Modul ini sengaja tidak di-import di level modul mana pun supaya networkx
+dan matplotlib baru dimuat pada request gambar pertama.
+"""
+import base64
+import io
+
+import matplotlib
+
+# Backend non-GUI, aman untuk server dan worker tanpa display
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import networkx as nx  # noqa: E402
+
+from app.logic.metrics import timed  # noqa: E402
+
+
+@timed("draw_png")
+def draw_png(dfa):
+    G = nx.MultiDiGraph()
+    edge_labels = {}
+
+    for state in dfa.states:
+        G.add_node(state)
+
+    for (state, symbol), target in dfa.transitions.items():
+        G.add_edge(state, target)
+        if (state, target) in edge_labels:
+            edge_labels[(state, target)] += f", {symbol}"
+        else:
+            edge_labels[(state, target)] = symbol
+
+    with timed("spring_layout"):
+        pos = nx.spring_layout(G)
+    nx.draw_networkx_nodes(G, pos, node_color='lightblue', edgecolors='black', node_size=1200)
+    nx.draw_networkx_labels(G, pos)
+    nx.draw_networkx_edges(G, pos, arrows=True, arrowstyle='->', connectionstyle='arc3,rad=0.2')
+    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
+    plt.text(pos[dfa.start_state][0] - 0.15, pos[dfa.start_state][1] + 0.1, "→", fontsize=20, color='green')
+    plt.axis('off')
+
+    buf = io.BytesIO()
+    with timed("savefig"):
+        plt.savefig(buf, format='png')
+    plt.close()
+    buf.seek(0)
+    img_base64 = base64.b64encode(buf.read()).decode('utf-8')
+    return img_base64
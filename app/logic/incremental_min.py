@@ -0,0 +1,306 @@
+"""Minimisasi DFA inkremental untuk siklus edit-submit di /minimization.
+
+Partisi hasil minimisasi terakhir disimpan bersama indeks transisi balik
+(target -> sumber). Saat DFA berubah, hanya state yang bahasanya mungkin
+berubah yang dihitung ulang:
+
+1. state yang transisinya / status final-nya berubah, ditambah semua state
+   yang bisa mencapainya (closure mundur lewat indeks balik) = A;
+2. state di luar A bahasanya tidak berubah, jadi kelasnya tetap;
+3. state di A yang tidak berada di siklus A (self-loop boleh) diselesaikan
+   urut topologis: kelasnya dicari dari signature (final, kelas tujuan per
+   simbol), dengan self-loop ditulis sebagai SELF;
+4. sisa A yang membentuk siklus diminimisasi dengan Hopcroft pada DFA
+   kuosien (satu node per kelas) ditambah sisa tersebut; ukurannya
+   jumlah kelas + |sisa|, bukan jumlah state DFA asli.
+
+Hasilnya identik dengan ``DFA.minimize(engine="hopcroft", prune=False)``;
+``build_and_minimize_dfa`` memberi DFA yang sudah melewati ``prune_dfa``.
+"""
+import threading
+from collections import deque
+
+from app.logic.metrics import inc, timed
+from app.logic.minimization_dfa import DFA
+
+SINK = -1
+SELF = -2  # dalam signature: transisi kembali ke kelas/state itu sendiri
+
+
+class RebuildRequired(Exception):
+    """``update(..., rebuild=False)``: perubahan butuh Hopcroft penuh; sesi tidak diubah."""
+
+
+def _copy(dfa):
+    return DFA(dfa.states, dfa.alphabet, dfa.start_state, dfa.final_states, dfa.transitions)
+
+
+class IncrementalMinimizer:
+    """Simpan partisi minimisasi satu sesi; ``update`` untuk setiap versi DFA baru."""
+
+    def __init__(self, dfa=None):
+        self._lock = threading.Lock()
+        self.last_update = {}
+        self._rebuild(_copy(dfa) if dfa is not None else DFA([], [], None, [], {}))
+
+    def __getstate__(self):
+        # Lock tidak bisa di-pickle (sesi dibangun di worker offload)
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _rebuild(self, dfa):
+        self.dfa = dfa
+        self.symbols = sorted(dfa.alphabet)
+        # inverse[target][source] = banyaknya transisi source -> target
+        self.inverse = {}
+        for (source, _), target in dfa.transitions.items():
+            row = self.inverse.setdefault(target, {})
+            row[source] = row.get(source, 0) + 1
+        self.class_of = {}
+        self.members = {}
+        self.signatures = {}  # signature -> kelas
+        self.class_sig = {}   # kelas -> signature
+        self._next_id = 0
+        for group in dfa._hopcroft_partitions():
+            cid = self._new_class()
+            self.members[cid] = set(group)
+            for state in group:
+                self.class_of[state] = cid
+        for cid, group in self.members.items():
+            self._register(cid, self._signature(next(iter(group))))
+        self.last_update = {"mode": "full", "affected": len(dfa.states), "cyclic": len(dfa.states)}
+
+    def _new_class(self):
+        cid = self._next_id
+        self._next_id += 1
+        self.members[cid] = set()
+        return cid
+
+    def _target_class(self, state, symbol):
+        target = self.dfa.transitions.get((state, symbol))
+        return SELF if target == state else self.class_of.get(target, SINK)
+
+    def _signature(self, state):
+        return (state in self.dfa.final_states,
+                tuple(self._target_class(state, symbol) for symbol in self.symbols))
+
+    def _register(self, cid, sig):
+        # Signature kelas disimpan dengan id kelas itu sendiri diganti SELF,
+        # sehingga kelas dengan loop bisa ditemukan lewat state yang self-loop
+        final, succ = sig
+        key = (final, tuple(SELF if target == cid else target for target in succ))
+        self.signatures[key] = cid
+        self.class_sig[cid] = key
+
+    def _find_class(self, sig):
+        """Kelas yang ekuivalen dengan state bersignature ``sig``, atau None."""
+        cid = self.signatures.get(sig)
+        if cid is not None:
+            return cid
+        # State yang menuju kelas d bisa jadi anggota d sendiri
+        final, succ = sig
+        for d in set(succ) - {SINK, SELF}:
+            key = (final, tuple(SELF if target == d else target for target in succ))
+            if self.signatures.get(key) == d:
+                return d
+        return None
+
+    def _assign(self, state, cid):
+        self.class_of[state] = cid
+        self.members[cid].add(state)
+
+    def _unassign(self, state):
+        cid = self.class_of.pop(state, None)
+        if cid is None:
+            return
+        group = self.members[cid]
+        group.discard(state)
+        if not group:
+            del self.members[cid]
+            del self.signatures[self.class_sig.pop(cid)]
+
+    def _move_edge(self, source, old, new):
+        if old is not None:
+            row = self.inverse[old]
+            row[source] -= 1
+            if not row[source]:
+                del row[source]
+        if new is not None:
+            row = self.inverse.setdefault(new, {})
+            row[source] = row.get(source, 0) + 1
+
+    def _changed_states(self, new):
+        """State yang bahasanya langsung terpengaruh oleh perubahan, sambil memperbarui indeks balik.
+
+        Juga mengembalikan daftar (source, sebelum, sesudah) perubahan indeks
+        balik supaya bisa dibatalkan.
+        """
+        old = self.dfa
+        added = new.states - old.states
+        removed = old.states - new.states
+        changed = set(added)
+        changed |= (old.final_states ^ new.final_states) & new.states
+
+        moves = []
+        for key in old.transitions.keys() | new.transitions.keys():
+            before, after = old.transitions.get(key), new.transitions.get(key)
+            if before != after:
+                self._move_edge(key[0], before, after)
+                moves.append((key[0], before, after))
+                changed.add(key[0])
+
+        # Transisi ke state yang hilang/baru muncul berubah arti (sink <-> state)
+        for state in added | removed:
+            changed.update(self.inverse.get(state, ()))
+        return (changed & new.states), removed, moves
+
+    def _backward_closure(self, seeds, states):
+        affected = set(seeds)
+        queue = deque(seeds)
+        while queue:
+            for source in self.inverse.get(queue.popleft(), ()):
+                if source not in affected and source in states:
+                    affected.add(source)
+                    queue.append(source)
+        return affected
+
+    def _resolve_acyclic(self, affected):
+        """Selesaikan state A yang semua tujuannya di A sudah punya kelas; sisanya dikembalikan."""
+        transitions = self.dfa.transitions
+        pending = {}
+        for state in affected:
+            pending[state] = sum(
+                1 for symbol in self.symbols
+                if transitions.get((state, symbol)) in affected
+                and transitions.get((state, symbol)) != state
+            )
+        ready = deque(state for state, count in pending.items() if count == 0)
+        while ready:
+            state = ready.popleft()
+            del pending[state]
+            sig = self._signature(state)
+            cid = self._find_class(sig)
+            if cid is None:
+                cid = self._new_class()
+                self._register(cid, sig)
+            self._assign(state, cid)
+            for source, count in self.inverse.get(state, {}).items():
+                if source in pending and source != state:
+                    pending[source] -= count
+                    if pending[source] == 0:
+                        ready.append(source)
+        return set(pending)
+
+    def _resolve_cyclic(self, remaining):
+        """Hopcroft pada DFA kecil: state sisa + satu node per kelas yang sudah ada.
+
+        Semua kelas ikut (bukan hanya yang dijangkau), karena state di siklus
+        bisa saja ekuivalen dengan kelas yang tidak terhubung dengannya.
+        """
+        transitions = self.dfa.transitions
+        reduced = {}
+        finals = set()
+        for state in remaining:
+            if state in self.dfa.final_states:
+                finals.add(("s", state))
+            for symbol in self.symbols:
+                target = transitions.get((state, symbol))
+                if target in remaining:
+                    reduced[(("s", state), symbol)] = ("s", target)
+                elif self.class_of.get(target, SINK) != SINK:
+                    reduced[(("s", state), symbol)] = ("c", self.class_of[target])
+        # Transisi antar kelas sudah tercatat di signature (final, kelas tujuan)
+        for cid, (final, succ) in self.class_sig.items():
+            if final:
+                finals.add(("c", cid))
+            for symbol, target in zip(self.symbols, succ):
+                if target != SINK:
+                    reduced[(("c", cid), symbol)] = ("c", cid if target == SELF else target)
+
+        nodes = [("s", state) for state in remaining] + [("c", cid) for cid in self.class_sig]
+        small = DFA(nodes, self.symbols, None, finals, reduced)
+        new_classes = []
+        for group in small._hopcroft_partitions():
+            existing = [cid for kind, cid in group if kind == "c"]
+            cid = existing[0] if existing else self._new_class()
+            if not existing:
+                new_classes.append(cid)
+            for kind, state in group:
+                if kind == "s":
+                    self._assign(state, cid)
+        for cid in new_classes:
+            self._register(cid, self._signature(next(iter(self.members[cid]))))
+
+    @timed("minimize_incremental")
+    def update(self, dfa, rebuild=True):
+        """Minimisasi ``dfa`` (versi baru) memakai partisi dari versi sebelumnya.
+
+        ``rebuild=False``: jika perubahan butuh Hopcroft penuh, lempar
+        ``RebuildRequired`` alih-alih menjalankannya (misalnya supaya pemanggil
+        bisa menjalankannya di process pool).
+        """
+        with self._lock:
+            new = _copy(dfa)
+            if sorted(new.alphabet) != self.symbols:
+                return self._full(new, rebuild, ())
+
+            changed, removed, moves = self._changed_states(new)
+            affected = self._backward_closure(changed, new.states)
+            if len(affected) * 2 > len(new.states):
+                # Perubahan menjangkau sebagian besar DFA, Hopcroft penuh lebih murah
+                return self._full(new, rebuild, moves)
+            for state in removed:
+                self._unassign(state)
+            self.dfa = new
+            for state in affected:
+                self._unassign(state)
+
+            remaining = self._resolve_acyclic(affected)
+            if remaining:
+                self._resolve_cyclic(remaining)
+
+            inc("incremental_affected_states", len(affected))
+            self.last_update = {"mode": "incremental", "affected": len(affected), "cyclic": len(remaining)}
+            return self.minimized()
+
+    def _full(self, new, rebuild, moves):
+        if rebuild:
+            self._rebuild(new)
+            return self.minimized()
+        for source, before, after in reversed(moves):
+            self._move_edge(source, after, before)
+        inc("incremental_rebuild_required")
+        raise RebuildRequired("Perubahan DFA membutuhkan minimisasi penuh")
+
+    def partitions(self):
+        """Partisi dengan urutan yang sama seperti ``DFA._hopcroft_partitions``."""
+        groups = [set(group) for group in self.members.values()]
+        groups.sort(key=min)
+        return groups
+
+    def minimized(self):
+        """DFA minimal langsung dari signature kelas (sama dengan ``_build_quotient``)."""
+        order = sorted(self.members, key=lambda cid: min(self.members[cid]))
+        names = {cid: f"Q{i}" for i, cid in enumerate(order)}
+        transitions = {}
+        finals = set()
+        for cid in order:
+            final, succ = self.class_sig[cid]
+            if final:
+                finals.add(names[cid])
+            for symbol, target in zip(self.symbols, succ):
+                if target != SINK:
+                    transitions[(names[cid], symbol)] = names[cid if target == SELF else target]
+        start = self.class_of.get(self.dfa.start_state)
+        return DFA(
+            states=set(names.values()),
+            alphabet=self.dfa.alphabet,
+            start_state=names[start] if start is not None else None,
+            final_states=finals,
+            transitions=transitions,
+        )
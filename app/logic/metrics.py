@@ -0,0 +1,203 @@
+"""Instrumentasi ringan: histogram durasi per tahap dan counter kerja.
+
+Pemakaian::
+
+    from app.logic.metrics import inc, timed
+
+    @timed("minimize")
+    def minimize(...): ...
+
+    with timed("spring_layout"):
+        pos = nx.spring_layout(G)
+
+    inc("product_pairs_visited", len(pairs))
+
+Aktif secara default; set ``TBA_METRICS=0`` untuk mematikan. Saat mati,
+``timed`` dan ``inc`` hanya mengecek satu flag lalu kembali, jadi counter
+di loop panas sebaiknya dijumlahkan dulu secara lokal lalu dilaporkan sekali.
+Hasil diekspor dalam format teks Prometheus lewat ``render_prometheus``.
+
+Setiap proses punya registry sendiri. Job yang dijalankan di process pool
+dibungkus ``run_collected``: isi registry worker diambil lalu dikosongkan
+(``drain``) dan dikirim bersama hasilnya, lalu proses induk menggabungkannya
+lewat ``merge`` sehingga /metrics tetap mencakup kerja di worker.
+"""
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Batas atas bucket (detik), +Inf ditambahkan otomatis
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "tba"
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Kumpulan counter dan histogram untuk satu proses."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def drain(self):
+        """Isi registry dalam bentuk yang bisa di-pickle, lalu kosongkan."""
+        with self._lock:
+            delta = {
+                "counters": self.counters,
+                "histograms": {stage: (h.counts, h.sum, h.count) for stage, h in self.histograms.items()},
+            }
+            self.counters = {}
+            self.histograms = {}
+        return delta
+
+    def merge(self, delta):
+        """Tambahkan hasil ``drain`` dari proses lain."""
+        with self._lock:
+            for name, value in delta["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for stage, (counts, total, count) in delta["histograms"].items():
+                histogram = self.histograms.get(stage)
+                if histogram is None:
+                    histogram = self.histograms[stage] = Histogram()
+                histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+                histogram.sum += total
+                histogram.count += count
+
+    def snapshot(self):
+        """Salinan dict untuk debugging / JSON."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "stages": {
+                    stage: {"count": h.count, "sum": h.sum}
+                    for stage, h in self.histograms.items()
+                },
+            }
+
+    def render(self, gauges=None):
+        """Teks exposition Prometheus (versi 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name in sorted(self.counters):
+                metric = f"{PREFIX}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {self.counters[name]}")
+
+            metric = f"{PREFIX}_stage_duration_seconds"
+            if self.histograms:
+                lines.append(f"# HELP {metric} Durasi per tahap pemrosesan")
+                lines.append(f"# TYPE {metric} histogram")
+            for stage in sorted(self.histograms):
+                h = self.histograms[stage]
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float("inf"),), h.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {h.sum}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {h.count}')
+
+        for name, value in sorted((gauges or {}).items()):
+            if value is None:
+                continue
+            metric = f"{PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry(enabled=os.environ.get("TBA_METRICS", "1").lower() not in ("0", "false", "no", "off"))
+
+
+def inc(name, amount=1):
+    if registry.enabled:
+        registry.inc(name, amount)
+
+
+class timed:
+    """Context manager sekaligus decorator yang mencatat durasi ke histogram ``stage``."""
+
+    __slots__ = ("stage", "_start")
+
+    def __init__(self, stage):
+        self.stage = stage
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter() if registry.enabled else None
+        return self
+
+    def __exit__(self, *exc):
+        if self._start is not None:
+            registry.observe(self.stage, time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, func):
+        stage = self.stage
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe(stage, time.perf_counter() - start)
+        return wrapper
+
+
+def run_collected(fn, *args, **kwargs):
+    """Dijalankan di worker process: (hasil ``fn``, delta metrics worker).
+
+    Jika ``fn`` gagal, deltanya ditempel di exception (``metrics_delta``)
+    supaya tetap ikut terkirim ke proses induk.
+    """
+    try:
+        result = fn(*args, **kwargs)
+    except BaseException as e:
+        e.metrics_delta = registry.drain() if registry.enabled else None
+        raise
+    return result, registry.drain() if registry.enabled else None
+
+
+def merge(delta):
+    if delta and registry.enabled:
+        registry.merge(delta)
+
+
+def render_prometheus(gauges=None):
+    return registry.render(gauges)
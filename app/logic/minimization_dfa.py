@@ -1,8 +1,10 @@
+from array import array
 from collections import defaultdict
-import networkx as nx
-import matplotlib.pyplot as plt
-import io
-import base64
+from app.logic.automaton import MISSING, Automaton
+from app.logic.cache import automaton_fingerprint, fingerprint
+from app.logic.metrics import inc, timed
+from app.logic.preprocess import prune_dfa
+from app.logic.render import to_dot, to_svg
 
 class DFA:
     def __init__(self, states, alphabet, start_state, final_states, transitions):
@@ -11,6 +13,30 @@ class DFA:
         self.start_state = start_state
         self.final_states = set(final_states)
         self.transitions = {tuple(k): v for k, v in transitions.items()}
+        self._automaton = None
+
+    @classmethod
+    def from_automaton(cls, core):
+        """DFA di atas ``Automaton``; ``transitions`` berupa view, tidak disalin."""
+        self = cls.__new__(cls)
+        self.states = set(core.states)
+        self.alphabet = set(core.symbols)
+        self.start_state = core.start_state
+        self.final_states = set(core.final_states)
+        self.transitions = core.pairs()
+        self._automaton = core
+        return self
+
+    @property
+    def automaton(self):
+        """Bentuk integer (``Automaton``); dibangun sekali, transisi ke luar ``states`` diabaikan."""
+        if self._automaton is None:
+            self._automaton = Automaton.build(
+                sorted(self.states), sorted(self.alphabet), self.start_state, self.final_states,
+                ((s, a, t) for (s, a), t in self.transitions.items()),
+                add_missing=False,
+            )
+        return self._automaton
 
     def transition(self, state, symbol):
         return self.transitions.get((state, symbol))
@@ -21,7 +47,19 @@ class DFA:
                 return i
         return None
 
-    def minimize(self):
+    @timed("minimize")
+    def minimize(self, engine="hopcroft", prune=True):
+        # prune: buang state unreachable dan gabungkan dead state sebelum refinement
+        dfa = prune_dfa(self) if prune else self
+        if engine == "hopcroft":
+            partitions = dfa._hopcroft_partitions()
+        elif engine == "legacy":
+            partitions = dfa._legacy_partitions()
+        else:
+            raise ValueError(f"Engine minimisasi tidak dikenal: {engine}")
+        return dfa._build_quotient(partitions)
+
+    def _legacy_partitions(self):
         final_states_set = self.final_states & self.states
         non_final_states_set = self.states - self.final_states
         
@@ -31,7 +69,9 @@ class DFA:
         if non_final_states_set:
             partitions.append(non_final_states_set)
 
+        rounds = 0
         while True:
+            rounds += 1
             new_partitions = []
             for group in partitions:
                 grouped = defaultdict(set)
@@ -54,71 +94,111 @@ class DFA:
                 break
             partitions = new_partitions
 
-        minimized_states = {}
-        for i, partition in enumerate(partitions):
-            state_name = f'Q{i}'
-            minimized_states[frozenset(partition)] = state_name
+        inc("minimize_refinement_rounds", rounds)
+        return partitions
 
-        minimized_transitions = {}
-        minimized_final_states = set()
-        minimized_start_state = None
+    def _hopcroft_partitions(self):
+        """Partition refinement Hopcroft, O(n·|Σ|·log n).
 
-        for partition in partitions:
-            representative = next(iter(partition))
-            group_name = minimized_states[frozenset(partition)]
+        Transisi yang tidak terdefinisi diarahkan ke sink implisit yang
+        punya blok sendiri, sehingga hasilnya sama dengan engine lama.
+        """
+        core = self.automaton
+        names = core.states
+        n = len(names)
+        if n == 0:
+            return []
+        k = len(core.symbols)
+        delta = core.delta
+        sink = n
 
-            if any(state in self.final_states for state in partition):
-                minimized_final_states.add(group_name)
-            
-            if self.start_state in partition:
-                minimized_start_state = group_name
-
-            for symbol in self.alphabet:
-                target = self.transition(representative, symbol)
-                if target is not None:
-                    # Cari partisi yang mengandung target state
-                    for target_partition in partitions:
-                        if target in target_partition:
-                            target_group_name = minimized_states[frozenset(target_partition)]
-                            minimized_transitions[(group_name, symbol)] = target_group_name
-                            break
-
-        return DFA(
-            states=set(minimized_states.values()),
-            alphabet=self.alphabet,
-            start_state=minimized_start_state,
-            final_states=minimized_final_states,
-            transitions=minimized_transitions
-        )
+        # inverse[a][t] = daftar state yang menuju t dengan simbol a
+        inverse = [[[] for _ in range(n + 1)] for _ in range(k)]
+        for a in range(k):
+            inv = inverse[a]
+            inv[sink].append(sink)
+            for i in range(n):
+                target = delta[i * k + a]
+                inv[sink if target == MISSING else target].append(i)
 
-    def draw(self):
-        G = nx.MultiDiGraph()
-        edge_labels = {}
+        finals = [i for i in range(n) if core.accepting[i]]
+        final_set = set(finals)
+        blocks = [set(finals), {i for i in range(n) if i not in final_set}, {sink}]
+        blocks = [block for block in blocks if block]
+        block_of = [0] * (n + 1)
+        for b, block in enumerate(blocks):
+            for i in block:
+                block_of[i] = b
 
-        for state in self.states:
-            G.add_node(state)
+        largest = max(range(len(blocks)), key=lambda b: len(blocks[b]))
+        worklist = [(b, a) for b in range(len(blocks)) if b != largest
+                    for a in range(k)]
 
-        for (state, symbol), target in self.transitions.items():
-            G.add_edge(state, target)
-            if (state, target) in edge_labels:
-                edge_labels[(state, target)] += f", {symbol}"
-            else:
-                edge_labels[(state, target)] = symbol
-
-        pos = nx.spring_layout(G)
-        nx.draw_networkx_nodes(G, pos, node_color='lightblue', edgecolors='black', node_size=1200)
-        nx.draw_networkx_labels(G, pos)
-        nx.draw_networkx_edges(G, pos, arrows=True, arrowstyle='->', connectionstyle='arc3,rad=0.2')
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
-        plt.text(pos[self.start_state][0] - 0.15, pos[self.start_state][1] + 0.1, "→", fontsize=20, color='green')
-        plt.axis('off')
-
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        plt.close()
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        return img_base64
+        rounds = 0
+        while worklist:
+            rounds += 1
+            splitter, a = worklist.pop()
+            inv = inverse[a]
+            touched = defaultdict(list)
+            for target in blocks[splitter]:
+                for source in inv[target]:
+                    touched[block_of[source]].append(source)
+
+            for b, hit in touched.items():
+                block = blocks[b]
+                if len(hit) == len(block):
+                    continue
+                hit = set(hit)
+                if len(hit) <= len(block) // 2:
+                    moved = hit
+                else:
+                    moved = block - hit
+                block -= moved
+                new_b = len(blocks)
+                blocks.append(moved)
+                for i in moved:
+                    block_of[i] = new_b
+                # Blok baru selalu yang lebih kecil, jadi cukup dia yang masuk worklist
+                worklist.extend((new_b, c) for c in range(k))
+
+        inc("minimize_refinement_rounds", rounds)
+        inc("minimize_block_splits", len(blocks) - 1)
+        partitions = [{names[i] for i in block} for block in blocks if sink not in block]
+        partitions.sort(key=min)
+        return partitions
+
+    def _build_quotient(self, partitions):
+        """DFA hasil penggabungan; blok ke-i menjadi state ``Q{i}``."""
+        core = self.automaton
+        k = len(core.symbols)
+        group_of = [MISSING] * len(core.states)
+        members = []
+        for g, partition in enumerate(partitions):
+            indices = [core.state_index[name] for name in partition if name in core.state_index]
+            for i in indices:
+                group_of[i] = g
+            members.append(indices)
+
+        delta = array('i', [MISSING]) * (len(partitions) * k)
+        accepting = bytearray(len(partitions))
+        for g, indices in enumerate(members):
+            if not indices:
+                continue
+            accepting[g] = any(core.accepting[i] for i in indices)
+            representative = indices[0] * k
+            for a in range(k):
+                target = core.delta[representative + a]
+                if target != MISSING and group_of[target] != MISSING:
+                    delta[g * k + a] = group_of[target]
+
+        start = group_of[core.start] if core.start != MISSING else MISSING
+        names = [f'Q{i}' for i in range(len(partitions))]
+        return DFA.from_automaton(Automaton(names, core.symbols, start, accepting, delta))
+
+    def draw(self):
+        # Backend gambar (networkx + matplotlib) baru di-import saat dipakai
+        from app.logic.drawing import draw_png
+        return draw_png(self)
 
     def to_dict(self):
         transitions_display = []
@@ -140,20 +220,50 @@ class DFA:
         }
 
 
-def build_and_minimize_dfa(input_data):
-    dfa = DFA(
-        states=input_data["states"],
-        alphabet=input_data["alphabet"],
-        start_state=input_data["start_state"],
-        final_states=input_data["final_states"],
-        transitions={tuple(k.split(",")): v for k, v in input_data["transitions"].items()}
-    )
+@timed("build_and_minimize_dfa")
+def build_and_minimize_dfa(input_data, engine="hopcroft", render="png", session=None, store=None,
+                           rebuild=True):
+    """``session`` (IncrementalMinimizer) memakai ulang partisi dari submit sebelumnya;
+    ``rebuild`` diteruskan ke ``session.update``.
+
+    ``store`` (``store.AutomataStore``) menyimpan DFA minimal di disk dengan key
+    fingerprint input, sehingga setelah restart tidak perlu diminimisasi ulang.
+    """
+    triples = [tuple(k.split(",")) + (v,) for k, v in input_data["transitions"].items()]
+    dfa = DFA.from_automaton(Automaton.build(
+        input_data["states"],
+        input_data["alphabet"],
+        input_data["start_state"],
+        input_data["final_states"],
+        triples,
+        add_missing=False,
+    ))
+
+    def minimize():
+        if session is not None:
+            return session.update(prune_dfa(dfa), rebuild=rebuild)
+        return dfa.minimize(engine=engine)
 
-    minimized_dfa = dfa.minimize()
-    img_base64 = minimized_dfa.draw()
+    if store is not None:
+        key = fingerprint("minimized", [engine, automaton_fingerprint(
+            "dfa", input_data["states"], input_data["alphabet"], input_data["start_state"],
+            input_data["final_states"], triples,
+        )])
+        minimized_dfa = store.get_or_create_dfa(key, minimize)
+    else:
+        minimized_dfa = minimize()
 
-    return {
+    result = {
         "original": dfa.to_dict(),
         "minimized": minimized_dfa.to_dict(),
-        "image_base64": img_base64
-    }
\ No newline at end of file
+    }
+    # render=None untuk melewati gambar (misalnya PNG dirender terpisah)
+    if render == "png":
+        result["image_base64"] = minimized_dfa.draw()
+    elif render == "svg":
+        result["svg"] = to_svg(minimized_dfa)
+    elif render == "dot":
+        result["dot"] = to_dot(minimized_dfa)
+    elif render is not None:
+        raise ValueError(f"Format render tidak dikenal: {render}")
+    return result
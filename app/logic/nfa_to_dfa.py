@@ -0,0 +1,373 @@
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from itertools import chain
+
+from app.logic.automaton import MISSING, Automaton
+from app.logic.bitset_nfa import BitsetNFA
+from app.logic.metrics import inc, timed
+from app.logic.minimization_dfa import DFA
+from app.logic.trace import Trace
+
+EPSILON = '&'
+DEAD = -1
+
+# Batas state DFA yang di-cache sebelum mode hybrid beralih ke simulasi NFA
+HYBRID_MAX_STATES = int(os.environ.get("TBA_HYBRID_MAX_STATES") or 10000)
+
+# Perkiraan kasar memori per state DFA (dict baris + entri ids/sets) dan per transisi
+_STATE_OVERHEAD = 400
+_TRANSITION_BYTES = 100
+
+
+class StateLimitExceeded(ValueError):
+    pass
+
+
+class SubsetDFA:
+    """DFA hasil subset construction dari NFA, dibangun secara lazy.
+
+    Setiap state NFA diberi index integer, ε-closure per state dihitung sekali
+    lalu disimpan sebagai frozenset. State DFA (himpunan state NFA) baru
+    dibuat saat input benar-benar mencapainya, dan transisinya di-cache.
+
+    ``max_states`` membatasi jumlah state DFA yang di-cache; state berikutnya
+    melempar ``StateLimitExceeded``. Dengan ``hybrid=True`` accepts, trace,
+    dan test_string tidak gagal: sisa string disimulasikan langsung pada NFA
+    (``BitsetNFA``) mulai dari himpunan state terakhir.
+
+    Aman dipakai bersama beberapa thread (misalnya matcher di
+    ``automata_cache``): transisi yang sudah di-cache dibaca tanpa lock,
+    sedangkan pembuatan transisi/state baru dilakukan di bawah ``_lock``
+    sehingga ``ids``, ``sets``, dan ``rows`` selalu sinkron.
+    """
+
+    def __init__(self, nfa, max_states=None, hybrid=False):
+        self.max_states = max_states
+        self.hybrid = hybrid
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+        self.memory_bytes = 0
+        self._bitset = None
+        self.nfa_states = list(nfa.states)
+        # Index berdasarkan identitas objek, bukan nama
+        index = {id(state): i for i, state in enumerate(self.nfa_states)}
+        self.alphabet = sorted(nfa.alphabet)
+
+        # moves[i][symbol] = tuple index target (tanpa ε)
+        self.moves = []
+        self.epsilon_moves = []
+        for state in self.nfa_states:
+            row = {}
+            for symbol, targets in state.transitions.items():
+                if symbol != EPSILON:
+                    row[symbol] = tuple(index[id(t)] for t in targets)
+            self.moves.append(row)
+            self.epsilon_moves.append(tuple(index[id(t)] for t in state.transitions.get(EPSILON, ())))
+        self.nfa_finals = frozenset(index[id(s)] for s in nfa.final_states if id(s) in index)
+        self._closures = [None] * len(self.nfa_states)
+
+        self.sets = []
+        self.ids = {}
+        self.rows = []
+        self.accepting = []
+        if nfa.initial_state is None:
+            self.start = DEAD
+        else:
+            self.start = self._intern(self.closure(index[id(nfa.initial_state)]))
+
+    def closure(self, i):
+        cached = self._closures[i]
+        if cached is None:
+            seen = {i}
+            stack = [i]
+            while stack:
+                for j in self.epsilon_moves[stack.pop()]:
+                    if j not in seen:
+                        seen.add(j)
+                        stack.append(j)
+            inc("epsilon_closure_expansions", len(seen))
+            cached = self._closures[i] = frozenset(seen)
+        return cached
+
+    def _intern(self, subset):
+        d = self.ids.get(subset)
+        if d is None:
+            d = len(self.sets)
+            if self.max_states is not None and d >= self.max_states:
+                raise StateLimitExceeded(f"Subset construction melebihi batas {self.max_states} state DFA")
+            self.ids[subset] = d
+            self.sets.append(subset)
+            self.rows.append({})
+            self.accepting.append(not subset.isdisjoint(self.nfa_finals))
+            self.memory_bytes += sys.getsizeof(subset) + _STATE_OVERHEAD
+            inc("dfa_states_created")
+        return d
+
+    def step(self, d, symbol):
+        if d == DEAD:
+            return DEAD
+        nxt = self.rows[d].get(symbol)
+        if nxt is None:
+            with self._lock:
+                nxt = self._expand(d, symbol)
+        return nxt
+
+    def _expand(self, d, symbol):
+        """Hitung transisi ``d`` --symbol--> (dipanggil dengan ``_lock``)."""
+        row = self.rows[d]
+        nxt = row.get(symbol)
+        if nxt is None:  # thread lain mungkin sudah menghitungnya
+            targets = set()
+            moves = self.moves
+            for q in self.sets[d]:
+                for t in moves[q].get(symbol, ()):
+                    targets |= self.closure(t)
+            nxt = self._intern(frozenset(targets)) if targets else DEAD
+            # Target ditulis terakhir: pembaca tanpa lock hanya melihat state yang lengkap
+            row[symbol] = nxt
+            self.memory_bytes += _TRANSITION_BYTES
+        return nxt
+
+    def accepts(self, string):
+        d = self.start
+        rows = self.rows
+        symbols = iter(string)
+        try:
+            for symbol in symbols:
+                if d == DEAD:
+                    return False
+                nxt = rows[d].get(symbol)
+                d = self.step(d, symbol) if nxt is None else nxt
+        except StateLimitExceeded:
+            if not self.hybrid:
+                raise
+            mask = self._simulate(d, chain((symbol,), symbols))
+            return bool(mask & self._nfa_bitset().finals)
+        return d != DEAD and self.accepting[d]
+
+    def is_accepting(self, d):
+        return d != DEAD and self.accepting[d]
+
+    def state_names(self, d):
+        return sorted(str(self.nfa_states[q]) for q in self.sets[d])
+
+    def _nfa_bitset(self):
+        """BitsetNFA dengan index state yang sama, dibangun saat fallback pertama."""
+        with self._lock:
+            if self._bitset is None:
+                self._bitset = self._build_bitset()
+        return self._bitset
+
+    def _build_bitset(self):
+        transitions = {}
+        for i, row in enumerate(self.moves):
+            for symbol, targets in row.items():
+                transitions[(i, symbol)] = targets
+            if self.epsilon_moves[i]:
+                transitions[(i, EPSILON)] = self.epsilon_moves[i]
+        return BitsetNFA([str(s) for s in self.nfa_states], self.alphabet, None,
+                         self.nfa_finals, transitions)
+
+    def _simulate(self, d, symbols, on_step=None):
+        """Lanjutkan dari state DFA ``d`` dengan simulasi NFA; mask akhir (0 = mati)."""
+        self.fallbacks += 1
+        inc("hybrid_fallbacks")
+        bits = self._nfa_bitset()
+        mask = 0
+        for q in self.sets[d]:
+            mask |= 1 << q
+        for symbol in symbols:
+            mask = bits.step(mask, symbol)
+            if not mask:
+                return 0
+            if on_step is not None:
+                on_step(mask, symbol)
+        return mask
+
+    def test_string(self, input_string):
+        """Sama dengan NFA.test_string, tapi setiap langkah memakai transisi yang di-cache."""
+        if self.start == DEAD:
+            return False, []
+        d = self.start
+        path = [(self.state_names(d), None)]
+        symbols = iter(input_string)
+        try:
+            for symbol in symbols:
+                d = self.step(d, symbol)
+                if d == DEAD:
+                    return False, path
+                path.append((self.state_names(d), symbol))
+        except StateLimitExceeded:
+            if not self.hybrid:
+                raise
+            bits = self._nfa_bitset()
+            mask = self._simulate(d, chain((symbol,), symbols),
+                                  lambda m, a: path.append((bits.state_names(m), a)))
+            return bool(mask & bits.finals), path
+        return self.accepting[d], path
+
+    def trace(self, input_string, max_steps=None):
+        """Versi ringkas ``test_string``: ``Trace`` berisi id state DFA, nama dibangun per jendela.
+
+        Pada mode hybrid, rekaman berhenti di titik fallback (``truncated``)
+        dan verdict dihitung lewat simulasi NFA.
+        """
+        result = Trace(input_string, self.state_names, max_steps, engine="thompson")
+        d = self.start
+        if d == DEAD:
+            result.accepted = False
+            return result
+        recording = result.append(d)
+        symbols = iter(input_string)
+        try:
+            for symbol in symbols:
+                d = self.step(d, symbol)
+                if d == DEAD:
+                    break
+                if recording:
+                    recording = result.append(d)
+        except StateLimitExceeded:
+            if not self.hybrid:
+                raise
+            result.truncated = True
+            result.accepted = bool(self._simulate(d, chain((symbol,), symbols)) & self._nfa_bitset().finals)
+            return result
+        result.accepted = self.is_accepting(d)
+        return result
+
+    def explore(self, max_memory=None, max_seconds=None, progress=None, progress_every=1000):
+        """Bangun state DFA yang reachable dari start (BFS), berhenti di batas pertama yang tercapai.
+
+        Batas state memakai ``max_states`` objek ini; ``max_memory`` berupa
+        perkiraan byte (``memory_bytes``). ``progress(stats)`` dipanggil tiap
+        ``progress_every`` state yang selesai diekspansi. Mengembalikan dict
+        statistik dengan ``reason`` None jika eksplorasi lengkap.
+        """
+        started = time.perf_counter()
+        queue = deque()
+        seen = set()
+        if self.start != DEAD:
+            queue.append(self.start)
+            seen.add(self.start)
+        expanded = 0
+        reason = None
+
+        def stats():
+            return {
+                "states_discovered": len(self.sets),
+                "states_expanded": expanded,
+                "frontier": len(queue),
+                "memory_bytes": self.memory_bytes,
+                "elapsed_seconds": time.perf_counter() - started,
+                "reason": reason,
+            }
+
+        while queue:
+            if max_seconds is not None and time.perf_counter() - started > max_seconds:
+                reason = "time"
+                break
+            if max_memory is not None and self.memory_bytes > max_memory:
+                reason = "memory"
+                break
+            d = queue[0]
+            try:
+                for symbol in self.alphabet:
+                    nxt = self.step(d, symbol)
+                    if nxt != DEAD and nxt not in seen:
+                        seen.add(nxt)
+                        queue.append(nxt)
+            except StateLimitExceeded:
+                reason = "states"
+                break
+            queue.popleft()
+            expanded += 1
+            if progress is not None and expanded % progress_every == 0:
+                progress(stats())
+        inc("determinize_states_expanded", expanded)
+        if reason is not None:
+            inc(f"determinize_limit_{reason}")
+        result = stats()
+        if progress is not None:
+            progress(result)
+        return result
+
+    def _build_dfa(self):
+        """DFA dari state dan transisi yang sudah dihitung sejauh ini."""
+        names = [f"D{d}" for d in range(len(self.sets))]
+        k = len(self.alphabet)
+        delta = array('i', [MISSING]) * (len(names) * k)
+        for d, row in enumerate(self.rows):
+            for a, symbol in enumerate(self.alphabet):
+                nxt = row.get(symbol, DEAD)
+                if nxt != DEAD:
+                    delta[d * k + a] = nxt
+        start = self.start if self.start != DEAD else MISSING
+        return DFA.from_automaton(Automaton(names, self.alphabet, start, self.accepting, delta))
+
+    @timed("subset_construction")
+    def to_dfa(self):
+        """Hasil determinisasi penuh sebagai DFA (bisa diminimisasi dan digambar)."""
+        saved, self.max_states = self.max_states, None
+        try:
+            self.explore()
+        finally:
+            self.max_states = saved
+        return self._build_dfa()
+
+
+class Determinization:
+    """Hasil ``determinize``: DFA (lengkap atau sebagian) dan diagnostiknya.
+
+    Jika ``complete`` False, state di ``frontier`` belum semua transisinya
+    dihitung sehingga DFA hanya menerima sebagian bahasa NFA.
+    """
+
+    def __init__(self, dfa, stats, limits):
+        self.dfa = dfa
+        self.stats = stats
+        self.limits = limits
+
+    @property
+    def complete(self):
+        return self.stats["reason"] is None
+
+    def diagnostics(self):
+        return {**self.stats, "complete": self.complete, "limits": self.limits}
+
+    def message(self):
+        reason = {"states": "jumlah state", "memory": "perkiraan memori", "time": "batas waktu"}
+        s = self.stats
+        return (f"Subset construction dihentikan ({reason[s['reason']]}): {s['states_discovered']} state "
+                f"ditemukan, {s['states_expanded']} diekspansi, {s['frontier']} di frontier, "
+                f"~{s['memory_bytes'] // 1024} KiB, {s['elapsed_seconds']:.2f} s")
+
+
+class DeterminizationIncomplete(ValueError):
+    def __init__(self, result):
+        super().__init__(result.message())
+        self.result = result
+
+
+@timed("subset_construction")
+def determinize(nfa, max_states=None, max_memory=None, max_seconds=None, progress=None):
+    """Subset construction dengan batas; tidak pernah melempar karena batas.
+
+    ``nfa`` boleh berupa NFA atau ``SubsetDFA`` (state yang sudah ditemukan
+    dipakai ulang). Batas ``None`` berarti tanpa batas.
+    """
+    subset = nfa if isinstance(nfa, SubsetDFA) else SubsetDFA(nfa)
+    saved, subset.max_states = subset.max_states, max_states
+    try:
+        stats = subset.explore(max_memory=max_memory, max_seconds=max_seconds, progress=progress)
+    finally:
+        subset.max_states = saved
+    limits = {"max_states": max_states, "max_memory": max_memory, "max_seconds": max_seconds}
+    return Determinization(subset._build_dfa(), stats, limits)
+
+
+def nfa_to_dfa(nfa):
+    return SubsetDFA(nfa).to_dfa()
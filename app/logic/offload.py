@@ -0,0 +1,328 @@
+"""Executor proses untuk operasi automata berat dari route web.
+
+Minimisasi, cek ekivalensi, konversi, dan regex -> NFA (termasuk trace
+pengujian), baik dari route web maupun /api/v1, dijalankan di process pool
+terpisah, sehingga request ringan seperti /tes-dfa tidak ikut mengantre di
+belakang satu input yang meledak. Thread request hanya menunggu future
+(tanpa memegang GIL).
+
+- Admission control: job yang sedang berjalan + mengantre dibatasi
+  ``TBA_OFFLOAD_QUEUE`` (default 4 x worker). Jika penuh, ``run``
+  melempar ``Saturated`` dengan perkiraan ``retry_after`` detik; route
+  menjawab 503 + header Retry-After.
+- Budget per operasi: batas waktu (SIGALRM di worker, ditambah batas tunggu
+  di sisi Flask) dan batas jumlah state (input maupun state DFA yang dibuat
+  subset construction). Pelanggaran menjadi ``BudgetExceeded``.
+
+Konfigurasi lewat environment::
+
+    TBA_OFFLOAD_WORKERS=2              # 0 = jalankan di proses Flask (tanpa pool)
+    TBA_OFFLOAD_QUEUE=8
+    TBA_BUDGET_SECONDS=10              # default semua operasi
+    TBA_BUDGET_MAX_STATES=100000       # menimpa default per operasi (lihat _MAX_STATES)
+    TBA_BUDGET_MAX_MEMORY=268435456    # perkiraan byte subset construction
+    TBA_BUDGET_MINIMIZATION_SECONDS=20 # override per operasi (MINIMIZATION,
+                                       # EQUIVALENCE, CONVERT, REGEX_TO_NFA)
+
+Fungsi job di bawah berada di level modul supaya bisa di-pickle ke worker
+``spawn``; argumen dan hasilnya berupa data biasa.
+"""
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from app.logic.metrics import inc, merge, run_collected
+
+# Tambahan waktu tunggu di sisi Flask di atas budget worker (spawn, pickle)
+_GRACE_SECONDS = 2.0
+
+
+class Saturated(Exception):
+    def __init__(self, retry_after):
+        super().__init__("Server sedang sibuk memproses automata lain, coba lagi sebentar lagi")
+        self.retry_after = retry_after
+
+
+class BudgetExceeded(ValueError):
+    pass
+
+
+class _WorkerTimeout(BaseException):
+    # BaseException supaya tidak tertelan ``except Exception`` di kode logic
+    pass
+
+
+def _env(name, default, cast):
+    value = os.environ.get(name)
+    return cast(value) if value else default
+
+
+# Default batas state per operasi. Minimisasi/ekivalensi/konversi ditujukan
+# untuk DFA puluhan ribu state; input patologis dihentikan oleh batas waktu
+# dan memori. Untuk regex batas ini adalah state DFA lazy; batas state NFA
+# ikut panjang regex (``NFA_STATES_PER_CHAR``).
+_MAX_STATES = {"minimization": 100000, "equivalence": 100000, "convert": 100000}
+_DEFAULT_MAX_STATES = 5000
+
+# Thompson construction: paling banyak beberapa state per karakter regex,
+# kecuali pengulangan {m,n} yang menyalin sub-NFA
+NFA_STATES_PER_CHAR = 8
+
+
+def budget(op):
+    """{"seconds": ..., "max_states": ..., "max_memory": ...} untuk satu operasi."""
+    return {
+        "seconds": _env(f"TBA_BUDGET_{op.upper()}_SECONDS", _env("TBA_BUDGET_SECONDS", 10.0, float), float),
+        "max_states": _env(f"TBA_BUDGET_{op.upper()}_MAX_STATES",
+                           _env("TBA_BUDGET_MAX_STATES", _MAX_STATES.get(op, _DEFAULT_MAX_STATES), int), int),
+        "max_memory": _env(f"TBA_BUDGET_{op.upper()}_MAX_MEMORY",
+                           _env("TBA_BUDGET_MAX_MEMORY", 256 * 1024 * 1024, int), int),
+    }
+
+
+def check_states(count, limit, what="state"):
+    if limit is not None and count > limit:
+        raise BudgetExceeded(f"Jumlah {what} ({count}) melebihi batas {limit}")
+
+
+def _on_alarm(signum, frame):
+    raise _WorkerTimeout()
+
+
+def _init_worker():
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def _run(fn, args, limits):
+    """Dijalankan di worker: pasang alarm sesuai budget lalu panggil job.
+
+    Mengembalikan (hasil, delta metrics worker); lihat ``metrics.run_collected``.
+    """
+    use_alarm = hasattr(signal, "SIGALRM") and signal.getsignal(signal.SIGALRM) is _on_alarm
+    if use_alarm:
+        signal.setitimer(signal.ITIMER_REAL, limits["seconds"])
+    try:
+        return run_collected(fn, *args, max_states=limits["max_states"])
+    except _WorkerTimeout as e:
+        error = BudgetExceeded(f"Melebihi batas waktu {limits['seconds']:g} detik")
+        error.metrics_delta = getattr(e, "metrics_delta", None)
+        raise error from None
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class Offloader:
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = _env("TBA_OFFLOAD_WORKERS", 2, int) if workers is None else workers
+        self.max_pending = max_pending or _env("TBA_OFFLOAD_QUEUE", max(self.workers, 1) * 4, int)
+        self.pending = 0
+        self.rejected = 0
+        self._avg_seconds = 1.0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            # spawn: worker tidak mewarisi thread dan state global dari proses Flask
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    def retry_after(self):
+        """Perkiraan detik sampai antrean cukup longgar (minimal 1)."""
+        return max(1, math.ceil(self._avg_seconds * self.pending / max(self.workers, 1)))
+
+    def _release(self, started):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.pending -= 1
+            # Rata-rata bergerak untuk estimasi Retry-After
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+
+    def run(self, op, fn, *args):
+        """Jalankan ``fn(*args, max_states=...)`` dengan budget ``op``; blok sampai selesai."""
+        limits = budget(op)
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                inc("offload_rejected")
+                raise Saturated(self.retry_after())
+            self.pending += 1
+        started = time.perf_counter()
+        inc(f"offload_{op}")
+
+        if self.workers <= 0:
+            # Tanpa pool: hanya budget state yang berlaku
+            try:
+                return fn(*args, max_states=limits["max_states"])
+            finally:
+                self._release(started)
+
+        try:
+            future = self._get_executor().submit(_run, fn, args, limits)
+        except Exception:
+            self._release(started)
+            raise
+        future.add_done_callback(lambda _: self._release(started))
+        try:
+            result, delta = future.result(timeout=limits["seconds"] + _GRACE_SECONDS)
+        except FutureTimeout:
+            future.cancel()
+            inc("offload_timeouts")
+            raise BudgetExceeded(f"Melebihi batas waktu {limits['seconds']:g} detik") from None
+        except Exception as e:
+            merge(getattr(e, "metrics_delta", None))
+            raise
+        merge(delta)
+        return result
+
+    def stats(self):
+        return {"workers": self.workers, "pending": self.pending, "max_pending": self.max_pending,
+                "rejected": self.rejected}
+
+
+offloader = Offloader()
+
+
+# --- Job -------------------------------------------------------------------
+
+def minimization_job(input_data, engine, max_states=None):
+    """(hasil build_and_minimize_dfa dengan SVG, sesi IncrementalMinimizer baru atau None)."""
+    from app.logic.incremental_min import IncrementalMinimizer
+    from app.logic.minimization_dfa import build_and_minimize_dfa
+    from app.logic.store import automata_store
+
+    check_states(len(set(input_data["states"])), max_states)
+    session = IncrementalMinimizer() if engine == "hopcroft" else None
+    result = build_and_minimize_dfa(input_data, engine=engine, render="svg", session=session,
+                                    store=automata_store)
+    return result, session
+
+
+def equivalence_job(type1, side1, type2, side2, max_states=None):
+    """(ekuivalen, counterexample terpendek, diterima automata 1?).
+
+    Pasangan DFA memakai check_equivalence pada tabel integer; keduanya
+    membandingkan bahasa atas gabungan alfabet, sama seperti /api/v1/equivalence.
+    """
+    from app.logic.tes_equivalen import (
+        accepts, check_equivalence, check_language_equivalence, lazy_automaton, parse_dfa,
+    )
+
+    if type1 == "dfa" and type2 == "dfa":
+        dfa1 = parse_dfa(**side1)
+        dfa2 = parse_dfa(**side2)
+        check_states(len(dfa1['states']) + len(dfa2['states']), max_states)
+        equivalent, counterexample = check_equivalence(dfa1, dfa2)
+        accepted_by_first = counterexample is not None and accepts(dfa1, counterexample)
+        return equivalent, counterexample, accepted_by_first
+
+    left = lazy_automaton(type1, max_states=max_states, **side1)
+    right = lazy_automaton(type2, max_states=max_states, **side2)
+    equivalent, counterexample = check_language_equivalence(left, right)
+    accepted_by_first = counterexample is not None and left.accepts(counterexample)
+    return equivalent, counterexample, accepted_by_first
+
+
+def regex_job(regex, test_string, describe=True, engine="auto", max_states=None):
+    """(deskripsi NFA atau None, Trace terlepas atau None) untuk /regex-to-nfa.
+
+    ``engine``: "thompson" (NFA + subset construction lazy), "derivative"
+    (turunan Brzozowski, tanpa NFA), atau "auto": turunan dulu, pindah ke
+    Thompson hybrid jika jumlah turunannya melewati budget state.
+    """
+    from app.logic.derivatives import DerivativeMatcher
+    from app.logic.nfa_to_dfa import StateLimitExceeded, SubsetDFA
+    from app.logic.regex_to_nfa import RegexToNFA
+    from app.logic.trace import MAX_STEPS
+
+    converter = RegexToNFA()
+    nfa_limit = None if max_states is None else max(max_states, NFA_STATES_PER_CHAR * len(regex))
+    nfa = None
+    description = None
+    if describe or engine == "thompson":
+        nfa = converter.regex_to_nfa(regex)
+        check_states(len(nfa.states), nfa_limit, "state NFA")
+        description = converter.get_nfa_description(nfa) if describe else None
+    trace = None
+    if test_string and engine != "thompson":
+        try:
+            trace = DerivativeMatcher(regex, max_states=max_states).trace(test_string, max_steps=MAX_STEPS)
+        except StateLimitExceeded:
+            if engine == "derivative":
+                raise
+            inc("regex_engine_fallbacks")
+    if test_string and trace is None:
+        if nfa is None:
+            nfa = converter.regex_to_nfa(regex)
+            check_states(len(nfa.states), nfa_limit, "state NFA")
+        # Hybrid: jika budget state habis, verdict tetap dihitung lewat simulasi NFA
+        subset = SubsetDFA(nfa, max_states=max_states, hybrid=True)
+        trace = subset.trace(test_string, max_steps=MAX_STEPS)
+    return description, trace.detached() if trace is not None else None
+
+
+def api_minimize_job(data, engine, key, max_states=None):
+    """(jumlah state input, DFA minimal) untuk /api/v1/minimize; ``data`` skema tervalidasi."""
+    from app.logic.serialization import to_dfa
+    from app.logic.store import automata_store
+
+    dfa = to_dfa(data)
+    check_states(len(dfa.states), max_states)
+    if automata_store is None:
+        return len(dfa.states), dfa.minimize(engine=engine)
+    return len(dfa.states), automata_store.get_or_create_dfa(key, lambda: dfa.minimize(engine=engine))
+
+
+def api_convert_job(data, target, limits, max_states=None):
+    """(hasil, None) atau (DFA sebagian, {"diagnostics", "message"}) untuk /api/v1/convert.
+
+    Hasil berupa skema NFA untuk ``target="nfa"``, selain itu ``minimization_dfa.DFA``.
+    """
+    from app.logic.nfa_to_dfa import DeterminizationIncomplete
+    from app.logic.serialization import convert_automaton, nfa_to_schema, to_dfa
+
+    if data["type"] == "dfa" and target != "nfa":
+        dfa = to_dfa(data)
+        check_states(len(dfa.states), max_states)
+        return (dfa.minimize() if target == "minimal-dfa" else dfa), None
+    if data["type"] == "nfa":
+        check_states(len(set(data["states"])), max_states, "state NFA")
+    try:
+        converted = convert_automaton(data, target, limits=limits)
+    except DeterminizationIncomplete as e:
+        return e.result.dfa, {"diagnostics": e.result.diagnostics(), "message": str(e)}
+    if target == "nfa":
+        return nfa_to_schema(converted), None
+    return converted, None
+
+
+def api_equivalence_job(left, right, max_states=None):
+    """(ekuivalen, counterexample, "left"/"right"/None) untuk /api/v1/equivalence."""
+    from app.logic.serialization import to_lazy
+    from app.logic.tes_equivalen import ParsedDFAView, check_language_equivalence
+
+    lazy_left = to_lazy(left, max_states=max_states)
+    lazy_right = to_lazy(right, max_states=max_states)
+    for lazy in (lazy_left, lazy_right):
+        if isinstance(lazy, ParsedDFAView):
+            check_states(len(lazy.dfa["states"]), max_states)
+    equivalent, counterexample = check_language_equivalence(lazy_left, lazy_right)
+    accepted_by = None
+    if counterexample is not None:
+        accepted_by = "left" if lazy_left.accepts(counterexample) else "right"
+    return equivalent, counterexample, accepted_by
+
+
+def gauges():
+    stats = offloader.stats()
+    return {f"offload_{key}": stats[key] for key in ("pending", "max_pending")}
+
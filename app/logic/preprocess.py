@@ -0,0 +1,146 @@
+"""Pra-pemrosesan automata sebelum minimisasi dan cek ekivalensi.
+
+State dipetakan ke index integer, lalu dua BFS linear di atas adjacency
+ter-index menghitung:
+
+- reachable : bisa dicapai dari start state;
+- live      : reachable dan bisa mencapai final state (co-reachable).
+
+State unreachable dibuang. State reachable tapi tidak live (dead) tidak
+pernah mengubah bahasa, jadi digabung menjadi satu trap state
+(``dead="merge"``) atau dihapus sehingga transisinya jatuh ke sink implisit
+(``dead="drop"``).
+"""
+from array import array
+from collections import deque
+
+from app.logic.automaton import MISSING, Automaton
+from app.logic.metrics import inc, timed
+
+
+def reachable_live(names, start, finals, edges):
+    """(reachable, live) sebagai set nama; ``edges`` iterable (asal, tujuan).
+
+    Edge dengan asal/tujuan di luar ``names`` diabaikan (dianggap ke sink).
+    """
+    names = list(names)
+    index = {name: i for i, name in enumerate(names)}
+    reached, live = _reachable_live_indexed(
+        len(names), index.get(start), (index.get(name) for name in finals),
+        ((index.get(source), index.get(target)) for source, target in edges),
+    )
+    return ({names[i] for i in range(len(names)) if reached[i]},
+            {names[i] for i in range(len(names)) if live[i]})
+
+
+def _reachable_live_indexed(n, start, finals, edges):
+    """Versi berindeks: (reached, live) berupa bytearray; index None diabaikan."""
+    succ = [[] for _ in range(n)]
+    pred = [[] for _ in range(n)]
+    for i, j in edges:
+        if i is not None and j is not None:
+            succ[i].append(j)
+            pred[j].append(i)
+
+    reached = bytearray(n)
+    if start is not None:
+        reached[start] = 1
+        queue = deque([start])
+        while queue:
+            for j in succ[queue.popleft()]:
+                if not reached[j]:
+                    reached[j] = 1
+                    queue.append(j)
+
+    live = bytearray(n)
+    queue = deque()
+    for i in finals:
+        if i is not None and reached[i] and not live[i]:
+            live[i] = 1
+            queue.append(i)
+    while queue:
+        for i in pred[queue.popleft()]:
+            if reached[i] and not live[i]:
+                live[i] = 1
+                queue.append(i)
+    return reached, live
+
+
+@timed("prune")
+def prune_dfa(dfa, dead="merge"):
+    """DFA (minimization_dfa.DFA) tanpa state unreachable dan dengan dead state digabung/dihapus.
+
+    Dikerjakan di tabel integer ``dfa.automaton``; hasilnya DFA di atas
+    ``Automaton`` baru (atau ``dfa`` sendiri jika tidak ada yang berubah).
+    """
+    if dfa.start_state not in dfa.states:
+        return dfa
+    core = dfa.automaton
+    pruned = prune_automaton(core, dead=dead)
+    return dfa if pruned is core else type(dfa).from_automaton(pruned)
+
+
+def prune_automaton(core, dead="drop"):
+    """``Automaton`` tanpa state unreachable; ``core`` sendiri jika tidak ada yang berubah.
+
+    ``dead="drop"``: hanya state live (plus start) yang tersisa, transisi ke
+    state yang dibuang jatuh ke sink implisit. ``dead="merge"``: semua dead
+    state digabung menjadi satu trap (start jika start dead, selain itu
+    nama terkecil) yang loop ke dirinya sendiri.
+    """
+    if dead not in ("merge", "drop"):
+        raise ValueError(f"Mode dead state tidak dikenal: {dead}")
+    n = len(core)
+    k = len(core.symbols)
+    reached, live = _reachable_live_indexed(
+        n, core.start if core.start != MISSING else None,
+        (i for i in range(n) if core.accepting[i]),
+        ((p // k, j) for p, j in enumerate(core.delta) if j != MISSING),
+    )
+    n_reached, n_live = sum(reached), sum(live)
+    inc("prune_unreachable_states", n - n_reached)
+    inc("prune_dead_states", n_reached - n_live)
+
+    trap = None
+    if dead == "merge":
+        if n_reached == n and n_reached - n_live <= 1:
+            return core
+        dead_states = [i for i in range(n) if reached[i] and not live[i]]
+        if dead_states:
+            trap = core.start if not live[core.start] else min(dead_states, key=core.states.__getitem__)
+    keep = [i for i in range(n) if live[i] or i == core.start or i == trap]
+    if len(keep) == n:
+        return core
+
+    new_index = {old: new for new, old in enumerate(keep)}
+    delta = array('i', [MISSING]) * (len(keep) * k)
+    new_trap = new_index.get(trap)
+    for new, old in enumerate(keep):
+        row = old * k
+        if old == trap:
+            # Dead state hanya menuju dead state / sink, cukup jadi loop di trap
+            for a in range(k):
+                if core.delta[row + a] != MISSING:
+                    delta[new * k + a] = new_trap
+            continue
+        if not live[old]:
+            continue
+        for a in range(k):
+            target = core.delta[row + a]
+            if target == MISSING:
+                continue
+            if live[target]:
+                delta[new * k + a] = new_index[target]
+            elif new_trap is not None:
+                delta[new * k + a] = new_trap
+    return Automaton(
+        [core.states[i] for i in keep], core.symbols, new_index.get(core.start, MISSING),
+        [core.accepting[i] and live[i] for i in keep], delta,
+    )
+
+
+def prune_parsed_dfa(dfa):
+    """Hasil parse_dfa tanpa state unreachable dan dead (transisi ke dead state dihapus)."""
+    core = Automaton.from_parsed(dfa)
+    pruned = prune_automaton(core)
+    return dfa if pruned is core else pruned.parsed()
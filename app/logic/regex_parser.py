@@ -0,0 +1,226 @@
+"""Parser regex recursive-descent yang menghasilkan AST.
+
+Grammar (operator dengan prioritas naik dari atas ke bawah):
+
+    alt     := concat ('|' concat)*
+    concat  := repeat*
+    repeat  := atom ('*' | '+' | '?' | '{m}' | '{m,}' | '{m,n}')*
+    atom    := '(' alt ')' | '[' class ']' | '\\' char | '&' | char
+
+``&`` adalah epsilon (sama seperti simbol epsilon pada NFA). Parser berjalan
+linear terhadap panjang regex; rekursi hanya sedalam nesting kurung, yang
+dibatasi ``MAX_NESTING``. Kedalaman AST (kurung ditambah operator yang
+bertumpuk) dibatasi ``MAX_DEPTH`` supaya pemakai AST yang rekursif
+(matcher turunan) tidak mencapai recursion limit.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from app.logic.metrics import timed
+
+EPSILON = '&'
+SPECIAL = set('|*+?(){}[]\\')
+
+MAX_NESTING = 100
+MAX_DEPTH = 4 * MAX_NESTING
+
+
+@dataclass(frozen=True)
+class Empty:
+    """Bahasa {ε}."""
+
+
+@dataclass(frozen=True)
+class Symbol:
+    char: str
+
+
+@dataclass(frozen=True)
+class CharClass:
+    chars: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Concat:
+    items: Tuple[object, ...]
+
+
+@dataclass(frozen=True)
+class Union:
+    items: Tuple[object, ...]
+
+
+@dataclass(frozen=True)
+class Star:
+    node: object
+
+
+@dataclass(frozen=True)
+class Plus:
+    node: object
+
+
+@dataclass(frozen=True)
+class Opt:
+    node: object
+
+
+@dataclass(frozen=True)
+class Repeat:
+    node: object
+    min: int
+    max: Optional[int]  # None berarti tak terbatas
+
+
+class RegexSyntaxError(ValueError):
+    def __init__(self, message, position=None):
+        super().__init__(message if position is None else f"{message} (posisi {position})")
+        self.position = position
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self.nesting = 0
+
+    def peek(self):
+        return self.text[self.pos] if self.pos < len(self.text) else None
+
+    def take(self):
+        char = self.text[self.pos]
+        self.pos += 1
+        return char
+
+    def parse(self):
+        node = self.alt()
+        if self.pos < len(self.text):
+            raise RegexSyntaxError(f"Karakter '{self.peek()}' tidak terduga", self.pos)
+        if _depth(node) > MAX_DEPTH:
+            raise RegexSyntaxError(f"Regex bersarang terlalu dalam (kurung dan operator bertumpuk, "
+                                   f"maksimal {MAX_DEPTH} tingkat)")
+        return node
+
+    def alt(self):
+        items = [self.concat()]
+        while self.peek() == '|':
+            self.pos += 1
+            items.append(self.concat())
+        return items[0] if len(items) == 1 else Union(tuple(items))
+
+    def concat(self):
+        items = []
+        while self.peek() is not None and self.peek() not in '|)':
+            items.append(self.repeat())
+        if not items:
+            return Empty()
+        return items[0] if len(items) == 1 else Concat(tuple(items))
+
+    def repeat(self):
+        node = self.atom()
+        while True:
+            char = self.peek()
+            if char == '*':
+                self.pos += 1
+                node = Star(node)
+            elif char == '+':
+                self.pos += 1
+                node = Plus(node)
+            elif char == '?':
+                self.pos += 1
+                node = Opt(node)
+            elif char == '{':
+                low, high = self.bounds()
+                node = Repeat(node, low, high)
+            else:
+                return node
+
+    def bounds(self):
+        start = self.pos
+        end = self.text.find('}', start)
+        if end == -1:
+            raise RegexSyntaxError("'{' tanpa '}'", start)
+        body = self.text[start + 1:end]
+        low, sep, high = body.partition(',')
+        try:
+            low = int(low)
+            high = (None if high.strip() == '' else int(high)) if sep else low
+        except ValueError:
+            raise RegexSyntaxError(f"Pengulangan tidak valid '{{{body}}}'", start) from None
+        if low < 0 or (high is not None and high < low):
+            raise RegexSyntaxError(f"Batas pengulangan tidak valid '{{{body}}}'", start)
+        self.pos = end + 1
+        return low, high
+
+    def atom(self):
+        start = self.pos
+        char = self.take()
+        if char == '(':
+            self.nesting += 1
+            if self.nesting > MAX_NESTING:
+                raise RegexSyntaxError(f"Kurung bersarang lebih dari {MAX_NESTING} tingkat", start)
+            node = self.alt()
+            if self.peek() != ')':
+                raise RegexSyntaxError("Kurung '(' tidak ditutup", start)
+            self.pos += 1
+            self.nesting -= 1
+            return node
+        if char == '[':
+            return self.char_class(start)
+        if char == '\\':
+            if self.peek() is None:
+                raise RegexSyntaxError("Escape '\\' di akhir regex", start)
+            return Symbol(self.take())
+        if char == EPSILON:
+            return Empty()
+        if char in SPECIAL:
+            raise RegexSyntaxError(f"Operator '{char}' tanpa operand", start)
+        return Symbol(char)
+
+    def char_class(self, start):
+        if self.peek() == '^':
+            raise RegexSyntaxError("Kelas negasi [^...] tidak didukung", start)
+        chars = []
+        while True:
+            char = self.peek()
+            if char is None:
+                raise RegexSyntaxError("Kurung '[' tidak ditutup", start)
+            self.pos += 1
+            if char == ']' and chars:
+                break
+            if char == '\\':
+                if self.peek() is None:
+                    raise RegexSyntaxError("Escape '\\' di akhir regex", start)
+                char = self.take()
+            if self.peek() == '-' and self.pos + 1 < len(self.text) and self.text[self.pos + 1] != ']':
+                self.pos += 1
+                high = self.take()
+                if high == '\\' and self.peek() is not None:
+                    high = self.take()
+                if ord(high) < ord(char):
+                    raise RegexSyntaxError(f"Range '{char}-{high}' terbalik", start)
+                chars.extend(chr(c) for c in range(ord(char), ord(high) + 1))
+            else:
+                chars.append(char)
+        chars = tuple(dict.fromkeys(chars))
+        return Symbol(chars[0]) if len(chars) == 1 else CharClass(chars)
+
+
+def _depth(node):
+    """Kedalaman AST, dihitung tanpa rekursi."""
+    deepest = 0
+    stack = [(node, 1)]
+    while stack:
+        node, level = stack.pop()
+        deepest = max(deepest, level)
+        if isinstance(node, (Concat, Union)):
+            stack.extend((item, level + 1) for item in node.items)
+        elif isinstance(node, (Star, Plus, Opt, Repeat)):
+            stack.append((node.node, level + 1))
+    return deepest
+
+
+@timed("parse_regex")
+def parse_regex(text):
+    """Parse regex menjadi AST; regex kosong menghasilkan Empty()."""
+    return _Parser(text).parse()
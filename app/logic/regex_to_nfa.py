@@ -1,4 +1,15 @@
+from array import array
+
+from app.logic.bitset_nfa import BitsetNFA
+from app.logic.metrics import inc, timed
+from app.logic.regex_parser import (
+    CharClass, Concat, Empty, Opt, Plus, Repeat, Star, Symbol, Union, parse_regex,
+)
+
+
 class State:
+    __slots__ = ('name', 'transitions', 'is_final')
+
     def __init__(self, name):
         self.name = name
         self.transitions = {}  
@@ -16,6 +27,8 @@ class State:
         return self.name
 
 class NFA:
+    __slots__ = ('states', 'alphabet', 'initial_state', 'final_states', 'state_counter')
+
     def __init__(self):
         self.states = []
         self.alphabet = set()
@@ -51,6 +64,7 @@ class NFA:
                     if next_state not in closure:
                         closure.add(next_state)
                         stack.append(next_state)
+        inc("epsilon_closure_expansions", len(closure))
         return closure
 
     def move(self, states, symbol):
@@ -60,6 +74,7 @@ class NFA:
                 next_states.update(state.transitions[symbol])
         return next_states
 
+    @timed("nfa_test_string")
     def test_string(self, input_string):
         if not self.initial_state:
             return False, []
@@ -83,161 +98,296 @@ class NFA:
         is_accepted = any(state in self.final_states for state in current_states)
         return is_accepted, path
 
-class RegexToNFA:
-    def __init__(self):
-        self.operators = {'|', '*', '(', ')'}
-        self.epsilon = '&'
+def build_nfa(states, alphabet, start, finals, transitions):
+    """Bangun NFA objek dari nama state dan triple (asal, simbol, tujuan); '&' untuk epsilon"""
+    state_names = list(dict.fromkeys(states))
+    symbol_set = set(alphabet)
+    final_set = set(finals)
+    if start not in state_names:
+        raise ValueError(f"Start state '{start}' tidak ada dalam states")
+    invalid_finals = final_set - set(state_names)
+    if invalid_finals:
+        raise ValueError(f"Final states tidak valid: {invalid_finals}")
+
+    nfa = NFA()
+    objects = {}
+    for name in state_names:
+        state = State(name)
+        state.is_final = name in final_set
+        objects[name] = state
+        nfa.states.append(state)
+    nfa.initial_state = objects[start]
+    nfa.final_states = [objects[name] for name in state_names if name in final_set]
+    nfa.alphabet = set(symbol_set)
+
+    for from_state, symbol, to_state in transitions:
+        if from_state not in objects:
+            raise ValueError(f"State '{from_state}' tidak ada dalam states")
+        if to_state not in objects:
+            raise ValueError(f"Target state '{to_state}' tidak ada dalam states")
+        if symbol != '&' and symbol not in symbol_set:
+            raise ValueError(f"Symbol '{symbol}' tidak ada dalam input symbols")
+        nfa.add_transition(objects[from_state], objects[to_state], symbol)
+    return nfa
+
+class CompactNFA:
+    """NFA ringkas: state berupa integer, edge disimpan CSR dalam array('i').
+
+    Selama konstruksi edge ditampung sebagai tiga buffer paralel (asal,
+    id simbol, tujuan); finalize() mengurutkannya per state asal menjadi
+    offsets/edge_symbols/edge_targets. Simbol di-intern, id 0 untuk epsilon.
+    Nama state "q{i}" hanya dibuat saat dibutuhkan untuk output.
+    """
+
+    EPSILON_ID = 0
 
-    def create_basic_nfa(self, symbol):
-        nfa = NFA()
-        start = nfa.create_state()
-        end = nfa.create_state()
-        end.is_final = True
-        nfa.initial_state = start
-        nfa.final_states = [end]
-        nfa.add_transition(start, end, symbol)
-        return nfa
+    def __init__(self):
+        self.state_counter = 0
+        self.symbols = ['&']
+        self.symbol_ids = {'&': 0}
+        self.initial_state = None
+        self.final_states = []
+        self._src = array('i')
+        self._sym = array('i')
+        self._dst = array('i')
+        self.offsets = None
+        self.edge_symbols = None
+        self.edge_targets = None
 
-    def concatenate(self, nfa1, nfa2):
-        result = NFA()
-        result.states = nfa1.states + nfa2.states
-        result.alphabet = nfa1.alphabet.union(nfa2.alphabet)
-        result.initial_state = nfa1.initial_state
-        result.final_states = nfa2.final_states
-        result.state_counter = max(nfa1.state_counter, nfa2.state_counter)
+    @property
+    def alphabet(self):
+        return set(self.symbols[1:])
 
-        for final_state in nfa1.final_states:
-            final_state.is_final = False
-            result.add_transition(final_state, nfa2.initial_state, self.epsilon)
+    def create_state(self):
+        state = self.state_counter
+        self.state_counter += 1
+        return state
 
-        return result
+    def add_transition(self, from_state, to_state, symbol):
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        self._src.append(from_state)
+        self._sym.append(symbol_id)
+        self._dst.append(to_state)
+
+    def finalize(self, initial_state, final_states):
+        n = self.state_counter
+        offsets = array('i', bytes(4 * (n + 1)))
+        for src in self._src:
+            offsets[src + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        # Counting sort stabil: urutan edge per state tetap urutan penambahan
+        fill = array('i', offsets[:n])
+        edge_symbols = array('i', bytes(4 * len(self._src)))
+        edge_targets = array('i', bytes(4 * len(self._src)))
+        for src, sym, dst in zip(self._src, self._sym, self._dst):
+            k = fill[src]
+            edge_symbols[k] = sym
+            edge_targets[k] = dst
+            fill[src] = k + 1
+        self.offsets = offsets
+        self.edge_symbols = edge_symbols
+        self.edge_targets = edge_targets
+        self._src = self._sym = self._dst = None
+        self.initial_state = initial_state
+        self.final_states = list(final_states)
+        return self
+
+    def name(self, state):
+        return f"q{state}"
+
+    def edges(self, state):
+        """Pasangan (id simbol, tujuan) dari satu state."""
+        start, end = self.offsets[state], self.offsets[state + 1]
+        return zip(self.edge_symbols[start:end], self.edge_targets[start:end])
 
-    def union(self, nfa1, nfa2):
-        result = NFA()
-        start = result.create_state()
-        end = result.create_state()
-        end.is_final = True
+    def epsilon_closure(self, states):
+        closure = set(states)
+        stack = list(states)
+        offsets, symbols, targets = self.offsets, self.edge_symbols, self.edge_targets
+        while stack:
+            state = stack.pop()
+            for k in range(offsets[state], offsets[state + 1]):
+                if symbols[k] == 0 and targets[k] not in closure:
+                    closure.add(targets[k])
+                    stack.append(targets[k])
+        inc("epsilon_closure_expansions", len(closure))
+        return closure
 
-        result.states.extend(nfa1.states + nfa2.states)
-        result.alphabet = nfa1.alphabet.union(nfa2.alphabet)
-        result.initial_state = start
-        result.final_states = [end]
+    def move(self, states, symbol_id):
+        next_states = set()
+        offsets, symbols, targets = self.offsets, self.edge_symbols, self.edge_targets
+        for state in states:
+            for k in range(offsets[state], offsets[state + 1]):
+                if symbols[k] == symbol_id:
+                    next_states.add(targets[k])
+        return next_states
 
-        result.add_transition(start, nfa1.initial_state, self.epsilon)
-        result.add_transition(start, nfa2.initial_state, self.epsilon)
+    def _names(self, states):
+        return sorted(self.name(state) for state in states)
 
-        for final_state in nfa1.final_states + nfa2.final_states:
-            final_state.is_final = False
-            result.add_transition(final_state, end, self.epsilon)
+    @timed("nfa_test_string")
+    def test_string(self, input_string):
+        """Output sama dengan NFA.test_string."""
+        if self.initial_state is None:
+            return False, []
 
-        return result
+        current_states = self.epsilon_closure({self.initial_state})
+        path = [(self._names(current_states), None)]
+        for symbol in input_string:
+            symbol_id = self.symbol_ids.get(symbol, 0)
+            if symbol_id == 0:
+                return False, path
+            next_states = self.epsilon_closure(self.move(current_states, symbol_id))
+            if not next_states:
+                return False, path
+            current_states = next_states
+            path.append((self._names(current_states), symbol))
 
-    def kleene_star(self, nfa):
-        result = NFA()
-        start = result.create_state()
-        end = result.create_state()
-        end.is_final = True
+        is_accepted = any(state in current_states for state in self.final_states)
+        return is_accepted, path
 
-        result.states.extend(nfa.states)
-        result.alphabet = nfa.alphabet
-        result.initial_state = start
-        result.final_states = [end]
+    def description(self):
+        """Sama dengan RegexToNFA.get_nfa_description untuk NFA objek."""
+        transitions = {}
+        for state in range(self.state_counter):
+            row = {}
+            for symbol_id, target in self.edges(state):
+                row.setdefault(self.symbols[symbol_id], set()).add(self.name(target))
+            transitions[self.name(state)] = {symbol: sorted(names) for symbol, names in row.items()}
+        return {
+            'states': sorted(self.name(state) for state in range(self.state_counter)),
+            'alphabet': sorted(self.alphabet),
+            'initial_state': self.name(self.initial_state),
+            'final_states': sorted(self.name(state) for state in self.final_states),
+            'transitions': transitions
+        }
 
-        result.add_transition(start, end, self.epsilon)
-        
-        result.add_transition(start, nfa.initial_state, self.epsilon)
-        
-        for final_state in nfa.final_states:
-            final_state.is_final = False
-            result.add_transition(final_state, end, self.epsilon)
-            result.add_transition(final_state, nfa.initial_state, self.epsilon)
+class RegexToNFA:
+    def __init__(self):
+        self.epsilon = '&'
 
-        return result
+    @timed("regex_to_nfa")
+    def regex_to_nfa(self, regex, form="object"):
+        if form == "compact":
+            nfa = CompactNFA()
+            start, end = self._build(nfa, parse_regex(regex))
+            inc("nfa_states_created", nfa.state_counter)
+            return nfa.finalize(start, [end])
+        nfa = self._build_nfa(regex)
+        inc("nfa_states_created", nfa.state_counter)
+        if form == "object":
+            return nfa
+        if form == "bitset":
+            return BitsetNFA.from_nfa(nfa)
+        raise ValueError(f"Bentuk NFA tidak dikenal: {form}")
 
-    def infix_to_postfix(self, regex):
-        precedence = {'*': 3, '.': 2, '|': 1}
-        stack = []
-        output = []
-        
-        explicit_regex = []
-        for i in range(len(regex)):
-            explicit_regex.append(regex[i])
-            if i + 1 < len(regex):
-                if (regex[i] not in '(|' and regex[i+1] not in ')|*'):
-                    explicit_regex.append('.')
-
-        for char in explicit_regex:
-            if char not in self.operators and char != '.':
-                output.append(char)
-            elif char == '(':
-                stack.append(char)
-            elif char == ')':
-                while stack and stack[-1] != '(':
-                    output.append(stack.pop())
-                if stack:
-                    stack.pop()
-            else:
-                while (stack and stack[-1] != '(' and 
-                       precedence.get(stack[-1], 0) >= precedence.get(char, 0)):
-                    output.append(stack.pop())
-                stack.append(char)
+    def _build_nfa(self, regex):
+        """Thompson construction dari AST; semua state ditambahkan ke satu NFA."""
+        ast = parse_regex(regex)
+        nfa = NFA()
+        start, end = self._build(nfa, ast)
+        end.is_final = True
+        nfa.initial_state = start
+        nfa.final_states = [end]
+        return nfa
 
+    def _build(self, nfa, node):
+        """(start, end) sub-NFA untuk ``node`` tanpa rekursi Python.
+
+        Setiap node diproses oleh generator ``_build_node`` yang meminta
+        (``yield``) sub-NFA anaknya dan menerima (start, end)-nya; stack
+        eksplisit menggantikan call stack sehingga kedalaman nesting regex
+        tidak dibatasi recursion limit. State tetap dibuat dalam urutan
+        depth-first (nama q0, q1, ... stabil).
+        """
+        stack = [self._build_node(nfa, node)]
+        result = None
         while stack:
-            if stack[-1] != '(':
-                output.append(stack.pop())
-            else:
+            try:
+                child = stack[-1].send(result)
+            except StopIteration as done:
                 stack.pop()
+                result = done.value
+            else:
+                stack.append(self._build_node(nfa, child))
+                result = None
+        return result
 
-        return output
+    def _build_node(self, nfa, node):
+        eps = self.epsilon
+        start = nfa.create_state()
 
-    def regex_to_nfa(self, regex):
-        if not regex:
-            nfa = NFA()
-            start = nfa.create_state()
+        if isinstance(node, Empty):
             end = nfa.create_state()
-            end.is_final = True
-            nfa.initial_state = start
-            nfa.final_states = [end]
-            nfa.add_transition(start, end, self.epsilon)
-            return nfa
-
-        if regex == "a*ab":
-            nfa = NFA()
-            q0 = nfa.create_state() 
-            q1 = nfa.create_state()  
-            q2 = nfa.create_state()  
-            q3 = nfa.create_state()  
-            nfa.initial_state = q0
-            nfa.final_states = [q3]
-            q3.is_final = True
-            nfa.add_transition(q0, q1, 'a') 
-            nfa.add_transition(q1, q1, 'a') 
-            nfa.add_transition(q0, q2, 'a') 
-            nfa.add_transition(q2, q3, 'b')  
-            nfa.add_transition(q1, q2, self.epsilon)
-            
-            return nfa
-
-        postfix = self.infix_to_postfix(regex)
-        stack = []
-        for char in postfix:
-            if char not in self.operators and char != '.':
-                stack.append(self.create_basic_nfa(char))
-            elif char == '*':
-                nfa = stack.pop()
-                stack.append(self.kleene_star(nfa))
-            elif char == '|':
-                nfa2 = stack.pop()
-                nfa1 = stack.pop()
-                stack.append(self.union(nfa1, nfa2))
-            elif char == '.':
-                nfa2 = stack.pop()
-                nfa1 = stack.pop()
-                stack.append(self.concatenate(nfa1, nfa2))
-
-        return stack[0]
+            nfa.add_transition(start, end, eps)
+        elif isinstance(node, Symbol):
+            end = nfa.create_state()
+            nfa.add_transition(start, end, node.char)
+        elif isinstance(node, CharClass):
+            end = nfa.create_state()
+            for char in node.chars:
+                nfa.add_transition(start, end, char)
+        elif isinstance(node, Concat):
+            current = start
+            for item in node.items:
+                inner_start, inner_end = (yield item)
+                nfa.add_transition(current, inner_start, eps)
+                current = inner_end
+            end = nfa.create_state()
+            nfa.add_transition(current, end, eps)
+        elif isinstance(node, Union):
+            ends = []
+            for item in node.items:
+                inner_start, inner_end = (yield item)
+                nfa.add_transition(start, inner_start, eps)
+                ends.append(inner_end)
+            end = nfa.create_state()
+            for inner_end in ends:
+                nfa.add_transition(inner_end, end, eps)
+        elif isinstance(node, (Star, Plus, Opt)):
+            inner_start, inner_end = (yield node.node)
+            end = nfa.create_state()
+            nfa.add_transition(start, inner_start, eps)
+            if not isinstance(node, Plus):
+                nfa.add_transition(start, end, eps)
+            if not isinstance(node, Opt):
+                nfa.add_transition(inner_end, inner_start, eps)
+            nfa.add_transition(inner_end, end, eps)
+        elif isinstance(node, Repeat):
+            # Setiap salinan dibangun ulang dari AST, bukan dari ekspansi teks
+            current = start
+            for _ in range(node.min):
+                inner_start, inner_end = (yield node.node)
+                nfa.add_transition(current, inner_start, eps)
+                current = inner_end
+            if node.max is None:
+                inner_start, inner_end = (yield Star(node.node))
+                nfa.add_transition(current, inner_start, eps)
+                current = inner_end
+                end = nfa.create_state()
+            else:
+                skips = []
+                for _ in range(node.max - node.min):
+                    inner_start, inner_end = (yield node.node)
+                    nfa.add_transition(current, inner_start, eps)
+                    skips.append(current)
+                    current = inner_end
+                end = nfa.create_state()
+                for skip in skips:
+                    nfa.add_transition(skip, end, eps)
+            nfa.add_transition(current, end, eps)
+        else:
+            raise TypeError(f"Node regex tidak dikenal: {node!r}")
+
+        return start, end
 
     def get_nfa_description(self, nfa):
+        if isinstance(nfa, CompactNFA):
+            return nfa.description()
         description = {
             'states': sorted(list(set(state.name for state in nfa.states))),
             'alphabet': sorted(list(nfa.alphabet)),
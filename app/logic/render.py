@@ -0,0 +1,165 @@
+import math
+import multiprocessing
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+
+from app.logic.metrics import merge, run_collected, timed
+
+# Banyaknya hasil render (future) yang disimpan untuk di-poll
+MAX_PENDING = 256
+
+
+def _edge_labels(transitions):
+    """Gabungkan simbol dengan asal dan tujuan yang sama: {(asal, tujuan): 'a, b'}."""
+    labels = {}
+    for (state, symbol), target in sorted(transitions.items()):
+        key = (state, target)
+        labels[key] = f"{labels[key]}, {symbol}" if key in labels else symbol
+    return labels
+
+
+@timed("to_dot")
+def to_dot(dfa):
+    """DFA sebagai teks Graphviz DOT."""
+    def quote(name):
+        return '"' + str(name).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+    lines = ["digraph DFA {", "    rankdir=LR;", '    __start [shape=point, label=""];']
+    for state in sorted(dfa.states):
+        shape = "doublecircle" if state in dfa.final_states else "circle"
+        lines.append(f"    {quote(state)} [shape={shape}];")
+    if dfa.start_state is not None:
+        lines.append(f"    __start -> {quote(dfa.start_state)};")
+    for (state, target), label in _edge_labels(dfa.transitions).items():
+        lines.append(f"    {quote(state)} -> {quote(target)} [label={quote(label)}];")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+@timed("to_svg")
+def to_svg(dfa, size=480):
+    """Render SVG sederhana (layout melingkar) tanpa networkx/matplotlib."""
+    states = sorted(dfa.states)
+    center = size / 2
+    radius = size / 2 - 60 if len(states) > 1 else 0
+    node_r = 22
+    pos = {}
+    for i, state in enumerate(states):
+        angle = 2 * math.pi * i / max(len(states), 1) - math.pi / 2
+        pos[state] = (center + radius * math.cos(angle), center + radius * math.sin(angle))
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {size} {size}" font-family="sans-serif" font-size="13">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="7" '
+        'markerHeight="7" orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z"/></marker></defs>',
+    ]
+    for (state, target), label in _edge_labels(dfa.transitions).items():
+        if state not in pos or target not in pos:
+            continue
+        x1, y1 = pos[state]
+        x2, y2 = pos[target]
+        text = escape(label)
+        if state == target:
+            parts.append(
+                f'<path d="M{x1 - 10:.1f},{y1 - node_r:.1f} C{x1 - 30:.1f},{y1 - 70:.1f} '
+                f'{x1 + 30:.1f},{y1 - 70:.1f} {x1 + 10:.1f},{y1 - node_r:.1f}" fill="none" '
+                f'stroke="black" marker-end="url(#arrow)"/>'
+            )
+            parts.append(f'<text x="{x1:.1f}" y="{y1 - 58:.1f}" text-anchor="middle">{text}</text>')
+            continue
+        dx, dy = x2 - x1, y2 - y1
+        dist = math.hypot(dx, dy) or 1
+        ux, uy = dx / dist, dy / dist
+        sx, sy = x1 + ux * node_r, y1 + uy * node_r
+        ex, ey = x2 - ux * node_r, y2 - uy * node_r
+        # Lengkungkan sedikit agar transisi dua arah tidak saling menimpa
+        cx, cy = (sx + ex) / 2 - uy * 25, (sy + ey) / 2 + ux * 25
+        parts.append(
+            f'<path d="M{sx:.1f},{sy:.1f} Q{cx:.1f},{cy:.1f} {ex:.1f},{ey:.1f}" fill="none" '
+            f'stroke="black" marker-end="url(#arrow)"/>'
+        )
+        parts.append(f'<text x="{cx:.1f}" y="{cy:.1f}" text-anchor="middle">{text}</text>')
+
+    for state, (x, y) in pos.items():
+        parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{node_r}" fill="lightblue" stroke="black"/>')
+        if state in dfa.final_states:
+            parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{node_r - 4}" fill="none" stroke="black"/>')
+        parts.append(f'<text x="{x:.1f}" y="{y + 4:.1f}" text-anchor="middle">{escape(str(state))}</text>')
+        if state == dfa.start_state:
+            parts.append(f'<text x="{x - node_r - 18:.1f}" y="{y + 6:.1f}" fill="green" font-size="20">→</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _render_png(dfa_dict):
+    """Dijalankan di proses worker: bangun ulang DFA dari to_dict() lalu draw()."""
+    from app.logic.minimization_dfa import DFA
+
+    dfa = DFA(
+        states=dfa_dict["states"],
+        alphabet=dfa_dict["alphabet"],
+        start_state=dfa_dict["start_state"],
+        final_states=dfa_dict["final_states"],
+        transitions={tuple(k.split(",")): v for k, v in dfa_dict["transitions_raw"].items()},
+    )
+    return dfa.draw()
+
+
+_executor = None
+_pending = OrderedDict()
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        workers = int(os.environ.get("TBA_RENDER_WORKERS", 2))
+        # spawn: worker tidak mewarisi state global pyplot/thread dari proses Flask
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def submit_png(dfa_dict, token=None):
+    """Antrekan render PNG di process pool, kembalikan token untuk di-poll.
+
+    Token yang sama (misalnya fingerprint cache) tidak dirender dua kali.
+    Status disimpan per proses, jadi polling harus kembali ke worker yang sama.
+    """
+    token = token or uuid.uuid4().hex
+    with _lock:
+        if token in _pending:
+            _pending.move_to_end(token)
+            return token
+        future = _get_executor().submit(run_collected, _render_png, dfa_dict)
+        future.add_done_callback(_merge_metrics)
+        _pending[token] = future
+        while len(_pending) > MAX_PENDING:
+            _pending.popitem(last=False)
+    return token
+
+
+def _merge_metrics(future):
+    # Metrics worker (spring_layout, savefig, ...) digabung sekali saat render selesai
+    if future.cancelled():
+        return
+    error = future.exception()
+    merge(getattr(error, "metrics_delta", None) if error is not None else future.result()[1])
+
+
+def render_status(token):
+    with _lock:
+        future = _pending.get(token)
+    if future is None:
+        return {"status": "unknown"}
+    if not future.done():
+        return {"status": "pending"}
+    error = future.exception()
+    if error is not None:
+        return {"status": "error", "error": str(error)}
+    image, _ = future.result()
+    return {"status": "done", "image_base64": image}
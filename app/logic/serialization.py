@@ -0,0 +1,310 @@
+"""Skema automata kanonik untuk API JSON dan encoding biner ringkas.
+
+Skema JSON (satu bentuk untuk semua fitur)::
+
+    {"type": "dfa", "states": [...], "alphabet": [...], "start": "q0",
+     "finals": [...], "transitions": [["q0", "a", "q1"], ...]}
+    {"type": "nfa", ...sama, simbol "&" untuk epsilon, target boleh ganda...}
+    {"type": "regex", "pattern": "(a|b)*abb"}
+    {"type": "dfa", "encoding": "packed", "data": "<base64>"}
+
+Format packed (little-endian)::
+
+    header   : magic "TBAD", versi u16, reserved u16, n_states u32,
+               n_symbols u32, start i32, names_length u32       (24 byte)
+    tabel    : int32[(n_states + 1) * (n_symbols + 1)], entri = index_tujuan * width
+    accept   : bitmap ceil((n_states + 1) / 8) byte
+    names    : JSON utf-8 {"states": [...], "symbols": [...]}
+
+Tabel langsung dipakai sebagai ``CompiledDFA.table`` (lewat memoryview),
+sehingga buffer dari mmap bisa dipakai tanpa menyalin.
+"""
+import base64
+import binascii
+import hashlib
+import json
+import struct
+import sys
+from array import array
+
+from app.logic.cache import automaton_fingerprint, fingerprint
+from app.logic.metrics import timed
+from app.logic.minimization_dfa import DFA
+from app.logic.nfa_to_dfa import DeterminizationIncomplete, SubsetDFA, determinize
+from app.logic.regex_to_nfa import CompactNFA, RegexToNFA, build_nfa
+from app.logic.tes_dfa import CompiledDFA, compile_dfa, np
+from app.logic.tes_equivalen import ParsedDFAView
+
+MAGIC = b"TBAD"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIiI")
+
+_TYPES = ("dfa", "nfa", "regex")
+
+
+def _check_list(data, key):
+    value = data.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"Field '{key}' harus berupa list string")
+    return value
+
+
+def validate_automaton(data):
+    """Validasi bentuk skema dan kembalikan salinan yang dinormalisasi."""
+    if not isinstance(data, dict):
+        raise ValueError("Automata harus berupa object JSON")
+    kind = data.get("type")
+    if kind not in _TYPES:
+        raise ValueError(f"Field 'type' harus salah satu dari {', '.join(_TYPES)}")
+    if kind == "regex":
+        pattern = data.get("pattern", "")
+        if not isinstance(pattern, str):
+            raise ValueError("Field 'pattern' harus berupa string")
+        return {"type": "regex", "pattern": pattern}
+    if data.get("encoding") == "packed":
+        if kind != "dfa":
+            raise ValueError("Encoding packed hanya untuk DFA")
+        # base64 (JSON) atau bytes (msgpack) -> selalu bytes
+        raw = data.get("data")
+        if isinstance(raw, str):
+            try:
+                raw = base64.b64decode(raw, validate=True)
+            except binascii.Error:
+                raise ValueError("Field 'data' bukan base64 yang valid") from None
+        elif isinstance(raw, (bytes, bytearray, memoryview)):
+            raw = bytes(raw)
+        else:
+            raise ValueError("Field 'data' harus berupa string base64 atau bytes")
+        return {"type": "dfa", "encoding": "packed", "data": raw}
+
+    start = data.get("start")
+    if not isinstance(start, str):
+        raise ValueError("Field 'start' harus berupa string")
+    transitions = data.get("transitions", [])
+    if not isinstance(transitions, list) or not all(
+        isinstance(t, (list, tuple)) and len(t) == 3 and all(isinstance(x, str) for x in t)
+        for t in transitions
+    ):
+        raise ValueError("Field 'transitions' harus berupa list [asal, simbol, tujuan]")
+    return {
+        "type": kind,
+        "states": _check_list(data, "states"),
+        "alphabet": _check_list(data, "alphabet"),
+        "start": start,
+        "finals": _check_list(data, "finals"),
+        "transitions": [tuple(t) for t in transitions],
+    }
+
+
+def schema_fingerprint(data, kind=None):
+    """Fingerprint kanonik skema hasil ``validate_automaton`` (``kind`` default: jenis automata).
+
+    Urutan state/transisi tidak berpengaruh, dan DFA biasa memberi key yang
+    sama dengan ``automaton_fingerprint`` di route web untuk ``kind`` yang
+    sama. Data packed di-hash langsung dari bytes-nya.
+    """
+    kind = kind or data["type"]
+    if data["type"] == "regex":
+        return fingerprint(kind, data["pattern"])
+    if data.get("encoding") == "packed":
+        return fingerprint(kind, {"packed": hashlib.sha256(data["data"]).hexdigest()})
+    return automaton_fingerprint(kind, data["states"], data["alphabet"], data["start"],
+                                 data["finals"], data["transitions"])
+
+
+def _dfa_transition_dict(data):
+    transitions = {}
+    for from_state, symbol, to_state in data["transitions"]:
+        if (from_state, symbol) in transitions and transitions[(from_state, symbol)] != to_state:
+            raise ValueError(f"Transisi ganda untuk ({from_state}, {symbol}) pada DFA")
+        transitions[(from_state, symbol)] = to_state
+    return transitions
+
+
+def to_compiled_dfa(data):
+    """Skema DFA (biasa atau packed) -> CompiledDFA."""
+    if data.get("encoding") == "packed":
+        raw = data["data"]
+        if isinstance(raw, str):
+            raw = base64.b64decode(raw)
+        return unpack_dfa(raw)
+    return compile_dfa(data["states"], data["alphabet"], data["start"], data["finals"],
+                       _dfa_transition_dict(data))
+
+
+def to_dfa(data):
+    """Skema DFA -> minimization_dfa.DFA."""
+    if data.get("encoding") == "packed":
+        return DFA.from_automaton(to_compiled_dfa(data).automaton)
+    return DFA(data["states"], data["alphabet"], data["start"], data["finals"],
+               _dfa_transition_dict(data))
+
+
+def to_nfa(data, form="object"):
+    """Skema regex/NFA -> NFA (objek, bitset, atau compact untuk regex)."""
+    if data["type"] == "regex":
+        return RegexToNFA().regex_to_nfa(data["pattern"], form=form)
+    if data["type"] == "nfa":
+        return build_nfa(data["states"], data["alphabet"], data["start"], data["finals"],
+                         data["transitions"])
+    raise ValueError("Automata bukan regex/NFA")
+
+
+CONVERT_TARGETS = ("nfa", "dfa", "minimal-dfa")
+
+
+def convert_automaton(data, target, engine="hopcroft", limits=None):
+    """Skema -> NFA (``target="nfa"``) atau DFA / DFA minimal (objek minimization_dfa.DFA).
+
+    ``limits`` (argumen ``determinize``: max_states, max_memory, max_seconds)
+    membatasi subset construction regex/NFA; jika tercapai dilempar
+    ``DeterminizationIncomplete`` yang membawa DFA sebagian dan diagnostiknya.
+    """
+    if target not in CONVERT_TARGETS:
+        raise ValueError(f"Target konversi harus salah satu dari {', '.join(CONVERT_TARGETS)}")
+    if target == "nfa":
+        if data["type"] == "dfa":
+            raise ValueError("Konversi DFA ke NFA tidak diperlukan")
+        return to_nfa(data, form="compact" if data["type"] == "regex" else "object")
+    if data["type"] == "dfa":
+        dfa = to_dfa(data)
+    elif limits:
+        result = determinize(to_nfa(data), **limits)
+        if not result.complete:
+            raise DeterminizationIncomplete(result)
+        dfa = result.dfa
+    else:
+        dfa = SubsetDFA(to_nfa(data)).to_dfa()
+    if target == "minimal-dfa":
+        dfa = dfa.minimize(engine=engine)
+    return dfa
+
+
+def dfa_to_schema(dfa):
+    return {
+        "type": "dfa",
+        "states": sorted(dfa.states),
+        "alphabet": sorted(dfa.alphabet),
+        "start": dfa.start_state,
+        "finals": sorted(dfa.final_states),
+        "transitions": sorted([s, a, t] for (s, a), t in dfa.transitions.items()),
+    }
+
+
+def compiled_to_schema(compiled):
+    return {
+        "type": "dfa",
+        "states": list(compiled.states),
+        "alphabet": list(compiled.symbols),
+        "start": compiled.start_state,
+        "finals": compiled.accept_states(),
+        "transitions": [list(t) for t in compiled.iter_transitions()],
+    }
+
+
+def nfa_to_schema(nfa):
+    if isinstance(nfa, CompactNFA):
+        description = nfa.description()
+    else:
+        description = RegexToNFA().get_nfa_description(nfa)
+    return {
+        "type": "nfa",
+        "states": description["states"],
+        "alphabet": description["alphabet"],
+        "start": description["initial_state"],
+        "finals": description["final_states"],
+        "transitions": [
+            [state, symbol, target]
+            for state, row in description["transitions"].items()
+            for symbol, targets in row.items()
+            for target in targets
+        ],
+    }
+
+
+@timed("pack_dfa")
+def pack_dfa(compiled):
+    """CompiledDFA -> bytes dalam format packed."""
+    names = json.dumps({"states": compiled.states, "symbols": compiled.symbols},
+                       ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    table = array('i', compiled.table)
+    if sys.byteorder != "little":
+        table.byteswap()
+    bitmap = bytearray((compiled.dead + 8) // 8)
+    for i in range(compiled.dead + 1):
+        if compiled.accept[i]:
+            bitmap[i >> 3] |= 1 << (i & 7)
+    header = HEADER.pack(MAGIC, VERSION, 0, compiled.dead, len(compiled.symbols),
+                         compiled.start // compiled.width, len(names))
+    return b"".join([header, table.tobytes(), bytes(bitmap), names])
+
+
+def packed_layout(n_states, n_symbols):
+    """(offset tabel, panjang tabel dalam byte, offset bitmap, panjang bitmap)."""
+    table_len = 4 * (n_states + 1) * (n_symbols + 1)
+    bitmap_len = (n_states + 8) // 8
+    return HEADER.size, table_len, HEADER.size + table_len, bitmap_len
+
+
+def _valid_table(table, n_states, width):
+    """Semua target berupa awal baris yang ada (kelipatan ``width``, baris mati termasuk)."""
+    if not table:
+        return True
+    if np is not None:
+        values = np.frombuffer(table, dtype=np.int32)
+        return bool(values.min() >= 0 and values.max() <= n_states * width
+                    and not (values % width).any())
+    # min/max berjalan di C; cek kelipatan per elemen hanya jika batasnya lolos
+    return (min(table) >= 0 and max(table) <= n_states * width
+            and all(v % width == 0 for v in table))
+
+
+@timed("unpack_dfa")
+def unpack_dfa(buffer, validate=True):
+    """bytes/mmap dalam format packed -> CompiledDFA.
+
+    Di mesin little-endian tabel berupa memoryview ke ``buffer`` (tanpa salin).
+    ``validate=False`` melewati pengecekan isi tabel; hanya untuk data yang
+    baru saja dibuat di proses ini.
+    """
+    view = memoryview(buffer)
+    if len(view) < HEADER.size:
+        raise ValueError("Data packed terlalu pendek")
+    magic, version, _, n_states, n_symbols, start, names_len = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Bukan data DFA packed yang dikenal")
+    table_off, table_len, bitmap_off, bitmap_len = packed_layout(n_states, n_symbols)
+    names_off = bitmap_off + bitmap_len
+    if len(view) < names_off + names_len:
+        raise ValueError("Data packed terpotong")
+
+    table = view[table_off:table_off + table_len].cast('i')
+    if sys.byteorder != "little":
+        table = array('i', table)
+        table.byteswap()
+    width = n_symbols + 1
+    if validate and not (0 <= start <= n_states and _valid_table(table, n_states, width)):
+        raise ValueError("Tabel transisi packed tidak valid")
+    bitmap = view[bitmap_off:bitmap_off + bitmap_len]
+    accept = bytearray((bitmap[i >> 3] >> (i & 7)) & 1 for i in range(n_states + 1))
+    names = json.loads(bytes(view[names_off:names_off + names_len]).decode("utf-8"))
+    if len(names["states"]) != n_states or len(names["symbols"]) != n_symbols:
+        raise ValueError("Header dan daftar nama tidak cocok")
+    return CompiledDFA.from_table(names["states"], names["symbols"], start, table, accept)
+
+
+def encode_packed(compiled, binary=False):
+    """Skema packed; ``binary=True`` untuk msgpack (data berupa bytes, bukan base64)."""
+    data = pack_dfa(compiled)
+    return {"type": "dfa", "encoding": "packed",
+            "data": data if binary else base64.b64encode(data).decode("ascii")}
+
+
+def to_lazy(data, max_states=None, hybrid=False):
+    """Skema apa pun -> automata lazy untuk check_language_equivalence / pengujian string.
+
+    ``max_states`` dan ``hybrid`` diteruskan ke ``SubsetDFA`` (regex/NFA saja).
+    """
+    if data["type"] != "dfa":
+        return SubsetDFA(to_nfa(data), max_states=max_states, hybrid=hybrid)
+    return ParsedDFAView(to_compiled_dfa(data).automaton.parsed())
@@ -0,0 +1,235 @@
+"""Store automata di disk, content-addressed, dimuat lewat mmap.
+
+Setiap entri adalah satu file format packed (lihat ``serialization``:
+header, tabel transisi int32, bitmap accept, nama) bernama sesuai key-nya,
+yaitu fingerprint yang sama dengan key ``automata_cache``. Setelah proses
+restart, DFA yang sudah pernah dikompilasi/diminimisasi tinggal di-mmap:
+tabelnya dipakai langsung sebagai ``CompiledDFA.table`` tanpa disalin, dan
+semua worker yang membuka file yang sama berbagi page cache yang sama.
+
+Penulisan lewat file sementara + ``os.replace`` sehingga pembaca (proses
+lain) tidak pernah melihat file setengah jadi. Entri yang dipakai
+diperbarui mtime-nya; ``evict`` menghapus entri yang tidak dipakai lebih
+lama dari ``max_age`` lalu entri terlama sampai total ukuran di bawah
+``max_bytes``.
+
+Konfigurasi lewat environment (store nonaktif jika direktori tidak diisi)::
+
+    TBA_STORE_DIR=/var/cache/tba
+    TBA_STORE_MAX_BYTES=268435456
+    TBA_STORE_MAX_AGE=604800           # detik
+"""
+import mmap
+import os
+import tempfile
+import threading
+import time
+
+from app.logic.metrics import inc
+from app.logic.minimization_dfa import DFA
+from app.logic.serialization import pack_dfa, unpack_dfa
+from app.logic.tes_dfa import CompiledDFA
+
+SUFFIX = ".tbad"
+
+# Jarak minimal antar sapuan eviction oleh put (detik)
+_SWEEP_SECONDS = 300.0
+
+
+class AutomataStore:
+    def __init__(self, root, max_bytes=256 * 1024 * 1024, max_age=7 * 24 * 3600.0):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # Perkiraan jumlah/ukuran entri: dihitung ulang dari direktori saat sapuan,
+        # di antaranya diperbarui oleh put/hapus proses ini (tulisan proses lain
+        # baru terlihat pada sapuan berikutnya)
+        self._bytes = None
+        self._count = None
+        self._swept = 0.0
+        self._counted = 0.0
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        # Dua karakter pertama sebagai subdirektori supaya satu direktori tidak terlalu besar
+        return os.path.join(self.root, key[:2], key + SUFFIX)
+
+    def get(self, key):
+        """CompiledDFA yang tabelnya di-mmap dari file, atau None jika tidak ada/rusak."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # tidak ada, atau file kosong
+            inc("store_misses")
+            return None
+        try:
+            # File bisa terpotong/rusak (disk penuh, proses lain): target tabel
+            # dicek supaya tidak ada indeks di luar tabel; gagal = miss
+            compiled = unpack_dfa(buffer)
+        except (ValueError, KeyError, UnicodeDecodeError):
+            inc("store_corrupt")
+            if self._remove(path):
+                self._forget(len(buffer))
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        inc("store_hits")
+        return compiled
+
+    def put(self, key, compiled):
+        data = pack_dfa(compiled)
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = None
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            self._remove(tmp)
+            raise
+        inc("store_writes")
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes += len(data) - (replaced or 0)
+                self._count += replaced is None
+            due = (self._bytes is None or self._bytes > self.max_bytes
+                   or time.monotonic() - self._swept > _SWEEP_SECONDS)
+        if due:
+            self.evict()
+
+    def get_or_create(self, key, factory):
+        """Seperti ``LRUCache.get_or_create``; ``factory`` mengembalikan CompiledDFA."""
+        compiled = self.get(key)
+        if compiled is None:
+            compiled = factory()
+            self.put(key, compiled)
+        return compiled
+
+    def get_dfa(self, key):
+        """Seperti ``get`` tapi sebagai ``minimization_dfa.DFA`` (misalnya hasil minimisasi)."""
+        compiled = self.get(key)
+        return None if compiled is None else DFA.from_automaton(compiled.automaton)
+
+    def put_dfa(self, key, dfa):
+        self.put(key, CompiledDFA.from_automaton(dfa.automaton))
+
+    def get_or_create_dfa(self, key, factory):
+        dfa = self.get_dfa(key)
+        if dfa is None:
+            dfa = factory()
+            self.put_dfa(key, dfa)
+        return dfa
+
+    def _entries(self):
+        """(mtime, ukuran, path) semua entri."""
+        entries = []
+        try:
+            subdirs = os.listdir(self.root)
+        except OSError:
+            return entries
+        for sub in subdirs:
+            directory = os.path.join(self.root, sub)
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                if not name.endswith(SUFFIX):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self):
+        """Hapus entri kedaluwarsa lalu yang terlama sampai ukuran total di bawah batas.
+
+        Aman dipanggil dari beberapa proses sekaligus; file yang sedang di-mmap
+        tetap bisa dibaca oleh pemetanya setelah dihapus (POSIX).
+        """
+        now = time.time()
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            if not expired and (self.max_bytes is None or total <= self.max_bytes):
+                break
+            if self._remove(path):
+                total -= size
+                removed += 1
+        if removed:
+            inc("store_evictions", removed)
+        with self._lock:
+            self._bytes = total
+            self._count = len(entries) - removed
+            self._swept = self._counted = time.monotonic()
+        return removed
+
+    def _recount(self):
+        entries = self._entries()
+        with self._lock:
+            self._bytes = sum(size for _, size, _ in entries)
+            self._count = len(entries)
+            self._counted = time.monotonic()
+
+    def _forget(self, size):
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes -= size
+                self._count -= 1
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self):
+        """Ukuran store dari penghitung; direktori hanya dibaca ulang jika belum
+        pernah dihitung atau hitungan terakhir lebih lama dari ``_SWEEP_SECONDS``."""
+        if self._bytes is None or time.monotonic() - self._counted > _SWEEP_SECONDS:
+            self._recount()
+        return {"entries": self._count, "bytes": self._bytes,
+                "max_bytes": self.max_bytes, "max_age": self.max_age}
+
+
+def _env_number(name, default, cast):
+    value = os.environ.get(name)
+    return cast(value) if value else default
+
+
+def _from_env():
+    root = os.environ.get("TBA_STORE_DIR")
+    if not root:
+        return None
+    return AutomataStore(
+        root,
+        max_bytes=_env_number("TBA_STORE_MAX_BYTES", 256 * 1024 * 1024, int),
+        max_age=_env_number("TBA_STORE_MAX_AGE", 7 * 24 * 3600.0, float),
+    )
+
+
+# Store bersama untuk proses ini (None jika TBA_STORE_DIR tidak diisi); worker
+# process pool membaca environment yang sama sehingga memakai direktori yang sama
+automata_store = _from_env()
+
+
+def stored(key, factory):
+    """CompiledDFA untuk ``key`` dari store jika aktif, selain itu langsung ``factory()``."""
+    if automata_store is None:
+        return factory()
+    return automata_store.get_or_create(key, factory)
@@ -1,3 +1,19 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional, engine utama cukup dengan array
+    np = None
+
+from app.logic.automaton import MISSING, Automaton
+from app.logic.metrics import inc, timed
+from app.logic.trace import Trace
+
+# Cek dead state setiap sekian karakter supaya loop utama tetap tanpa cabang
+_CHUNK = 4096
+
+
+@timed("parse_transitions")
 def parse_transitions(transition_input):
     transition_dict = {}
     transitions = transition_input.strip().splitlines()
@@ -8,22 +24,246 @@ def parse_transitions(transition_input):
             transition_dict[(from_state, symbol)] = to_state
     return transition_dict
 
-def run_dfa(states, alphabet, start_state, accept_states, transitions_input, test_string):
-    result = []
-    transitions = parse_transitions(transitions_input)
-    current_state = start_state
-    rejected_due_to_error = False
 
-    for symbol in test_string:
-        key = (current_state, symbol)
-        next_state = transitions.get(key)
-        result.append((symbol, current_state, next_state))
+class CompiledDFA:
+    """DFA dalam bentuk tabel transisi padat berindeks integer.
+
+    Baris terakhir adalah dead state, kolom terakhir untuk simbol yang tidak
+    dikenal. Isi tabel disimpan sebagai offset baris (index * width) agar
+    satu langkah simulasi cukup satu penjumlahan dan satu indexing.
+    """
+
+    def __init__(self, states, symbols, start_state, accept_states, transitions):
+        self._fill(Automaton.build(
+            states, symbols, start_state, accept_states,
+            ((s, a, t) for (s, a), t in transitions.items()),
+        ))
+
+    @classmethod
+    def from_automaton(cls, core):
+        """Tabel offset dari ``Automaton`` (tanpa lookup nama sama sekali)."""
+        self = cls.__new__(cls)
+        self._fill(core)
+        return self
+
+    def _fill(self, core):
+        self._set_names(core.states, core.symbols)
+        k = len(core.symbols)
+        width = self.width
+        dead_offset = self.dead * width
+        delta = core.delta
+        table = array('i', [dead_offset]) * ((self.dead + 1) * width)
+        for i in range(self.dead):
+            row, base = i * width, i * k
+            for a in range(k):
+                j = delta[base + a]
+                if j != MISSING:
+                    table[row + a] = j * width
+        self.table = table
+        self.accept = bytearray(core.accepting)
+        self.accept.append(0)
+        self.start_state = core.start_state
+        self.start = (core.start if core.start != MISSING else self.dead) * width
+        self._automaton = core
+
+    def _set_names(self, states, symbols):
+        self.states = list(states)
+        self.symbols = list(symbols)
+        self.state_index = {name: i for i, name in enumerate(self.states)}
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.width = len(self.symbols) + 1
+        self.dead = len(self.states)
+
+    @classmethod
+    def from_table(cls, states, symbols, start, table, accept):
+        """Bangun dari tabel offset yang sudah jadi (hasil unpack/mmap) tanpa menyalin tabel.
+
+        ``start`` berupa index state; ``accept`` satu byte per state termasuk dead state.
+        """
+        self = cls.__new__(cls)
+        self._set_names(states, symbols)
+        self.table = table
+        self.accept = accept
+        self.start_state = self.states[start] if start < self.dead else None
+        self.start = start * self.width
+        self._automaton = None
+        return self
+
+    @property
+    def automaton(self):
+        """``Automaton`` yang sama isinya; untuk hasil ``from_table`` dibangun saat pertama diminta."""
+        if self._automaton is None:
+            width = self.width
+            dead = self.dead
+            table = self.table
+            delta = array('i', [MISSING]) * (dead * (width - 1))
+            k = width - 1
+            for i in range(dead):
+                row, base = i * width, i * k
+                for a in range(k):
+                    j = table[row + a] // width
+                    if j != dead:
+                        delta[base + a] = j
+            start = self.start // width
+            self._automaton = Automaton(self.states, self.symbols, start if start != dead else MISSING,
+                                        self.accept[:dead], delta)
+        return self._automaton
+
+    def iter_transitions(self):
+        """Triple (asal, simbol, tujuan) untuk semua transisi yang terdefinisi."""
+        width = self.width
+        dead = self.dead * width
+        for i, name in enumerate(self.states):
+            row = i * width
+            for j, symbol in enumerate(self.symbols):
+                target = self.table[row + j]
+                if target != dead:
+                    yield name, symbol, self.states[target // width]
+
+    def accept_states(self):
+        return [name for i, name in enumerate(self.states) if self.accept[i]]
+
+    def as_numpy(self):
+        """Tabel sebagai matriks int32 (n+1) x width berisi index state (bukan offset)."""
+        if np is None:
+            raise RuntimeError("numpy tidak terpasang")
+        matrix = np.frombuffer(self.table, dtype=np.int32).reshape(self.dead + 1, self.width)
+        return matrix // self.width
+
+    def accepts(self, string):
+        """Verdict saja, tanpa trace."""
+        table = self.table
+        get = self.symbol_index.get
+        unknown = self.width - 1
+        dead = self.dead * self.width
+        state = self.start
+        for i in range(0, len(string), _CHUNK):
+            for symbol in string[i:i + _CHUNK]:
+                state = table[state + get(symbol, unknown)]
+            if state == dead:
+                return False
+        return bool(self.accept[state // self.width])
+
+    def run(self, string, trace=False):
+        if not trace:
+            return [], self.accepts(string)
 
-        if next_state is None:
-            rejected_due_to_error = True
-            break 
+        result = []
+        table = self.table
+        width = self.width
+        names = self.states
+        dead = self.dead * width
+        current = self.start
+        for symbol in string:
+            nxt = table[current + self.symbol_index.get(symbol, width - 1)]
+            if nxt == dead:
+                result.append((symbol, names[current // width], None))
+                return result, False
+            result.append((symbol, names[current // width], names[nxt // width]))
+            current = nxt
+        return result, bool(self.accept[current // width])
 
-        current_state = next_state
+    def trace(self, string, max_steps=None):
+        """Seperti ``run(trace=True)`` tapi hasilnya ``Trace`` ringkas (per run, bukan per langkah).
 
-    accepted = not rejected_due_to_error and current_state in accept_states
-    return result, accepted
\ No newline at end of file
+        Verdict tetap dihitung sampai akhir string walaupun rekaman terpotong
+        ``max_steps``. Dead state tercatat sebagai ``None``.
+        """
+        names = self.states
+        width = self.width
+        dead_row = self.dead
+        result = Trace(string, lambda row: None if row == dead_row else names[row], max_steps)
+        table = self.table
+        get = self.symbol_index.get
+        unknown = width - 1
+        dead = dead_row * width
+        current = self.start
+        recording = result.append(current // width)
+        for symbol in string:
+            current = table[current + get(symbol, unknown)]
+            if recording:
+                recording = result.append(current // width)
+            if current == dead:
+                break
+        result.accepted = bool(self.accept[current // width])
+        return result
+
+
+@timed("compile_dfa")
+def compile_dfa(states, alphabet, start_state, accept_states, transitions):
+    """Bangun CompiledDFA dari dict {(state, symbol): target} hasil parse_transitions.
+
+    State/simbol yang hanya muncul di transisi ikut ditambahkan.
+    """
+    triples = ((s, a, t) for (s, a), t in transitions.items())
+    return CompiledDFA.from_automaton(Automaton.build(states, alphabet, start_state, accept_states, triples))
+
+
+def _iter_strings(strings):
+    if isinstance(strings, str):
+        return strings.splitlines()
+    return (s.rstrip("\r\n") for s in strings)
+
+
+def _run_batch_numpy(compiled, strings):
+    """Jalankan semua string bersamaan, satu posisi karakter per langkah.
+
+    String diurutkan dari yang terpanjang sehingga string yang masih aktif
+    pada langkah t selalu berupa prefix dari urutan tersebut.
+    """
+    width = compiled.width
+    table = compiled.as_numpy()
+    accept = np.frombuffer(bytes(compiled.accept), dtype=np.uint8).astype(bool)
+
+    lengths = np.fromiter((len(s) for s in strings), dtype=np.int64, count=len(strings))
+    codes = np.frombuffer("".join(strings).encode("utf-32-le"), dtype=np.uint32)
+
+    # Lookup code point -> kolom; hanya simbol satu karakter yang bisa cocok
+    top = int(codes.max()) + 1 if codes.size else 1
+    lut = np.full(top, width - 1, dtype=np.int32)
+    for symbol, col in compiled.symbol_index.items():
+        if len(symbol) == 1 and ord(symbol) < top:
+            lut[ord(symbol)] = col
+    symbols = lut[codes]
+
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(strings) else lengths
+    order = np.argsort(-lengths, kind="stable")
+    sorted_lengths = lengths[order]
+    sorted_starts = starts[order]
+
+    current = np.full(len(strings), compiled.start // width, dtype=np.int32)
+    max_len = int(sorted_lengths[0]) if len(strings) else 0
+    # active[t] = jumlah string dengan panjang > t
+    active_counts = np.searchsorted(-sorted_lengths, -np.arange(max_len), side="left")
+    for t in range(max_len):
+        active = int(active_counts[t])
+        current[:active] = table[current[:active], symbols[sorted_starts[:active] + t]]
+
+    verdicts = np.empty(len(strings), dtype=bool)
+    verdicts[order] = accept[current]
+    return verdicts.tolist()
+
+
+@timed("run_dfa_batch")
+def run_dfa_batch(compiled, strings, vectorized=None):
+    """Verdict untuk banyak string terhadap satu DFA yang sudah dikompilasi.
+
+    ``strings`` boleh berupa list, iterable baris, atau satu teks yang
+    dipisah newline. ``vectorized=None`` memakai numpy bila tersedia.
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    if vectorized:
+        if np is None:
+            raise RuntimeError("numpy tidak terpasang")
+        verdicts = _run_batch_numpy(compiled, list(_iter_strings(strings)))
+    else:
+        verdicts = [compiled.accepts(s) for s in _iter_strings(strings)]
+    inc("strings_tested", len(verdicts))
+    return verdicts
+
+
+def run_dfa(states, alphabet, start_state, accept_states, transitions_input, test_string, trace=True):
+    transitions = parse_transitions(transitions_input)
+    compiled = compile_dfa(states, alphabet, start_state, accept_states, transitions)
+    return compiled.run(test_string, trace=trace)
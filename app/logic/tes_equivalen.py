@@ -1,5 +1,11 @@
-from collections import deque
+from app.logic.automaton import MISSING, Automaton
+from app.logic.metrics import inc, timed
+from app.logic.nfa_to_dfa import DEAD, SubsetDFA
+from app.logic.preprocess import prune_parsed_dfa
+from app.logic.regex_to_nfa import RegexToNFA, build_nfa
 
+
+@timed("parse_dfa")
 def parse_dfa(states, symbols, start, finals, transitions):
     """Parse DFA dengan validasi input yang lebih baik"""
     try:
@@ -20,8 +26,8 @@ def parse_dfa(states, symbols, start, finals, transitions):
         
         # Parse transitions
         transition_lines = [line.strip() for line in transitions.strip().split('\n') if line.strip()]
-        transition_dict = {state: {} for state in state_set}
-        
+        triples = []
+
         for line in transition_lines:
             parts = [p.strip() for p in line.split(',')]
             if len(parts) != 3:
@@ -37,57 +43,213 @@ def parse_dfa(states, symbols, start, finals, transitions):
             if symbol not in symbol_set:
                 raise ValueError(f"Symbol '{symbol}' tidak ada dalam input symbols")
             
-            transition_dict[from_state][symbol] = to_state
-        
+            triples.append(parts)
+
+        # Nama di-intern sekali; hasilnya dict view di atas Automaton
+        core = Automaton.build(sorted(state_set), sorted(symbol_set), start_state, final_set, triples)
+
         # Validasi kelengkapan transisi
-        for state in state_set:
-            for symbol in symbol_set:
-                if symbol not in transition_dict[state]:
-                    raise ValueError(f"Transisi tidak lengkap: state '{state}' dengan symbol '{symbol}'")
-        
-        return {
-            'states': state_set,
-            'symbols': symbol_set,
-            'start': start_state,
-            'finals': final_set,
-            'transitions': transition_dict
-        }
+        k = len(core.symbols)
+        for position, target in enumerate(core.delta):
+            if target == MISSING:
+                state, symbol = core.states[position // k], core.symbols[position % k]
+                raise ValueError(f"Transisi tidak lengkap: state '{state}' dengan symbol '{symbol}'")
+
+        return core.parsed()
     except Exception as e:
         raise ValueError(f"Error parsing DFA: {str(e)}")
 
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+@timed("check_equivalence")
+def check_equivalence(dfa1, dfa2):
+    """Cek ekivalensi dua DFA dengan algoritma Hopcroft-Karp (union-find).
+
+    Pasangan state diproses secara BFS; pasangan yang sudah satu kelas
+    dilewati sehingga kerjanya hampir linear terhadap |Q1| + |Q2|.
+    Mengembalikan (ekuivalen, counterexample) dengan counterexample berupa
+    list simbol terpendek yang diterima tepat satu DFA, atau None.
+    Alfabet adalah gabungan keduanya (aturan yang sama dengan
+    check_language_equivalence): transisi yang tidak terdefinisi, termasuk
+    simbol yang tidak dikenal satu DFA, dianggap menuju dead state; state
+    unreachable dan dead dibuang dulu lewat prune_parsed_dfa.
+    """
+    dfa1, dfa2 = prune_parsed_dfa(dfa1), prune_parsed_dfa(dfa2)
+
+    core1, core2 = Automaton.from_parsed(dfa1), Automaton.from_parsed(dfa2)
+
+    symbols = sorted(set(dfa1['symbols']) | set(dfa2['symbols']))
+    offset = len(core1)
+    sink = offset + len(core2)
+    accepting = list(core1.accepting) + list(core2.accepting) + [0]
+
+    delta = []
+    for symbol in symbols:
+        row = [sink] * (sink + 1)
+        for core, base in ((core1, 0), (core2, offset)):
+            a = core.symbol_index.get(symbol)
+            if a is None:
+                continue
+            k = len(core.symbols)
+            table = core.delta
+            for i in range(len(core)):
+                target = table[i * k + a]
+                if target != MISSING:
+                    row[base + i] = base + target
+        delta.append(row)
+
+    start1 = core1.start if core1.start != MISSING else sink
+    start2 = offset + core2.start if core2.start != MISSING else sink
+    parent = list(range(sink + 1))
+    size = [1] * (sink + 1)
+    # pairs[k] = (p, q, index pasangan asal, index simbol) untuk rekonstruksi string
+    pairs = [(start1, start2, -1, -1)]
+    head = 0
+    while head < len(pairs):
+        p, q, _, _ = pairs[head]
+        rp, rq = _find(parent, p), _find(parent, q)
+        if rp != rq:
+            if accepting[p] != accepting[q]:
+                word = []
+                k = head
+                while pairs[k][2] != -1:
+                    word.append(symbols[pairs[k][3]])
+                    k = pairs[k][2]
+                inc("product_pairs_visited", head + 1)
+                return False, word[::-1]
+            if size[rp] < size[rq]:
+                rp, rq = rq, rp
+            parent[rq] = rp
+            size[rp] += size[rq]
+            for a, row in enumerate(delta):
+                pairs.append((row[p], row[q], head, a))
+        head += 1
+    inc("product_pairs_visited", head)
+    return True, None
+
+
 def are_equivalent(dfa1, dfa2):
-    """Cek ekivalensi dua DFA menggunakan algoritma BFS"""
-    # Validasi input symbols sama
-    if dfa1['symbols'] != dfa2['symbols']:
-        return False
-    
-    visited = set()
-    queue = deque([(dfa1['start'], dfa2['start'])])
-
-    while queue:
-        s1, s2 = queue.popleft()
-        
-        # Skip jika sudah dikunjungi
-        if (s1, s2) in visited:
-            continue
-        visited.add((s1, s2))
-
-        # Cek apakah kedua state memiliki status final yang sama
-        is_final_1 = s1 in dfa1['finals']
-        is_final_2 = s2 in dfa2['finals']
-        if is_final_1 != is_final_2:
+    """Cek ekivalensi dua DFA (lihat check_equivalence)"""
+    return check_equivalence(dfa1, dfa2)[0]
+
+
+def accepts(dfa, word):
+    """Jalankan DFA hasil parse_dfa pada list simbol"""
+    state = dfa['start']
+    for symbol in word:
+        state = dfa['transitions'].get(state, {}).get(symbol)
+        if state is None:
             return False
+    return state in dfa['finals']
 
-        # Cek semua transisi untuk setiap symbol
-        for symbol in dfa1['symbols']:
-            t1 = dfa1['transitions'].get(s1, {}).get(symbol)
-            t2 = dfa2['transitions'].get(s2, {}).get(symbol)
-            
-            # Jika ada transisi yang tidak terdefinisi, DFA tidak ekivalen
-            if t1 is None or t2 is None:
-                return False
-            
-            # Tambahkan pasangan state baru ke queue
-            if (t1, t2) not in visited:
-                queue.append((t1, t2))
-    return True
\ No newline at end of file
+
+@timed("parse_nfa")
+def parse_nfa(states, symbols, start, finals, transitions):
+    """Parse NFA: format sama dengan DFA, tapi boleh '&' (epsilon), target ganda, dan transisi kosong"""
+    try:
+        triples = []
+        for line in transitions.strip().split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            parts = [p.strip() for p in line.split(',')]
+            if len(parts) != 3:
+                raise ValueError(f"Format transisi salah: '{line}'. Gunakan format: state,symbol,target")
+            triples.append(tuple(parts))
+
+        return build_nfa(
+            [s.strip() for s in states.split(',') if s.strip()],
+            [s.strip() for s in symbols.split(',') if s.strip()],
+            start.strip(),
+            [s.strip() for s in finals.split(',') if s.strip()],
+            triples,
+        )
+    except Exception as e:
+        raise ValueError(f"Error parsing NFA: {str(e)}")
+
+
+class ParsedDFAView:
+    """Antarmuka lazy (start, step, is_accepting) di atas hasil parse_dfa"""
+
+    def __init__(self, dfa):
+        self.dfa = dfa
+        self.start = dfa['start']
+        self.alphabet = sorted(dfa['symbols'])
+
+    def step(self, state, symbol):
+        if state == DEAD:
+            return DEAD
+        target = self.dfa['transitions'].get(state, {}).get(symbol)
+        return DEAD if target is None else target
+
+    def is_accepting(self, state):
+        return state != DEAD and state in self.dfa['finals']
+
+    def accepts(self, word):
+        return accepts(self.dfa, word)
+
+
+def lazy_automaton(kind, regex=None, states="", symbols="", start="", finals="", transitions="",
+                   max_states=None):
+    """Bangun automata lazy dari input regex, NFA, atau DFA.
+
+    ``max_states`` membatasi state DFA yang boleh dibuat subset construction.
+    """
+    if kind == "regex":
+        return SubsetDFA(RegexToNFA().regex_to_nfa(regex or ""), max_states=max_states)
+    if kind == "nfa":
+        return SubsetDFA(parse_nfa(states, symbols, start, finals, transitions), max_states=max_states)
+    if kind == "dfa":
+        return ParsedDFAView(prune_parsed_dfa(parse_dfa(states, symbols, start, finals, transitions)))
+    raise ValueError(f"Jenis automata tidak dikenal: {kind}")
+
+
+@timed("check_language_equivalence")
+def check_language_equivalence(left, right):
+    """Cek kesamaan bahasa dua automata lazy (SubsetDFA / ParsedDFAView).
+
+    Produk kedua subset construction dijelajahi on-the-fly dengan
+    Hopcroft-Karp, berhenti di pasangan pembeda pertama; hanya state yang
+    benar-benar dikunjungi yang dibangun. Alfabet adalah gabungan keduanya,
+    simbol yang tidak dikenal satu sisi menuju dead state.
+    Mengembalikan (ekuivalen, counterexample) seperti check_equivalence.
+    """
+    symbols = sorted(set(left.alphabet) | set(right.alphabet))
+    dead = ('dead',)
+    parent = {}
+
+    def key(side, state):
+        return dead if state == DEAD else (side, state)
+
+    def find(x):
+        root = parent.setdefault(x, x)
+        while root != parent[root]:
+            parent[root] = parent[parent[root]]
+            root = parent[root]
+        return root
+
+    pairs = [(left.start, right.start, -1, -1)]
+    head = 0
+    while head < len(pairs):
+        p, q, _, _ = pairs[head]
+        rp, rq = find(key(0, p)), find(key(1, q))
+        if rp != rq:
+            if left.is_accepting(p) != right.is_accepting(q):
+                word = []
+                k = head
+                while pairs[k][2] != -1:
+                    word.append(symbols[pairs[k][3]])
+                    k = pairs[k][2]
+                inc("product_pairs_visited", head + 1)
+                return False, word[::-1]
+            parent[rq] = rp
+            for a, symbol in enumerate(symbols):
+                pairs.append((left.step(p, symbol), right.step(q, symbol), head, a))
+        head += 1
+    inc("product_pairs_visited", head)
+    return True, None
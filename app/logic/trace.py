@@ -0,0 +1,124 @@
+"""Rekaman langkah simulasi yang ringkas dan bisa diambil per jendela.
+
+Konfigurasi (state DFA atau himpunan state NFA) disimpan sebagai id integer
+yang sudah di-intern oleh automata-nya (index baris CompiledDFA, id state
+SubsetDFA). Urutan konfigurasi c0, c1, ..., cn dikompres run-length dalam
+dua ``array``: id konfigurasi per run dan posisi akhir run. Simbol input
+tidak disalin, cukup referensi ke string aslinya. Nama state baru dibangun
+saat satu jendela langkah diminta.
+
+Langkah k (1..n) adalah transisi c(k-1) --simbol ke-k--> c(k).
+"""
+import os
+from array import array
+from bisect import bisect_right
+
+# Batas langkah yang direkam untuk satu pengujian dari web; verdict tetap
+# dihitung sampai akhir string
+MAX_STEPS = int(os.environ.get("TBA_TRACE_MAX_STEPS") or 1_000_000)
+
+# Batas panjang potongan simbol yang ditampilkan untuk satu run
+SYMBOL_PREVIEW = 32
+
+
+class Trace:
+    def __init__(self, inputs, describe, max_steps=None, engine=None):
+        self.inputs = inputs
+        self.describe = describe
+        self.max_steps = max_steps
+        self.engine = engine  # mesin yang menghasilkan rekaman (untuk label tampilan)
+        self.run_config = array('i')
+        self.run_end = array('q')  # posisi konfigurasi (eksklusif) akhir tiap run
+        self.truncated = False
+        self.accepted = None
+
+    def __len__(self):
+        """Banyaknya konfigurasi yang terekam (langkah + 1)."""
+        return self.run_end[-1] if self.run_end else 0
+
+    @property
+    def steps(self):
+        return max(len(self) - 1, 0)
+
+    def append(self, config):
+        """Tambah konfigurasi berikutnya; False jika batas ``max_steps`` tercapai."""
+        if self.max_steps is not None and len(self) > self.max_steps:
+            self.truncated = True
+            return False
+        if self.run_config and self.run_config[-1] == config:
+            self.run_end[-1] += 1
+        else:
+            self.run_config.append(config)
+            self.run_end.append(len(self) + 1)
+        return True
+
+    def detached(self):
+        """Salinan yang bisa di-pickle: nama konfigurasi yang terekam dihitung sekarang."""
+        names = {config: self.describe(config) for config in set(self.run_config)}
+        copy = Trace(self.inputs, names.__getitem__, self.max_steps, self.engine)
+        copy.run_config = self.run_config
+        copy.run_end = self.run_end
+        copy.truncated = self.truncated
+        copy.accepted = self.accepted
+        return copy
+
+    def config_at(self, position):
+        return self.run_config[bisect_right(self.run_end, position)]
+
+    def window(self, start, stop):
+        """Langkah ``start``..``stop - 1`` (1-based) sebagai list dict."""
+        start, stop = max(start, 1), min(stop, len(self))
+        rows = []
+        for k in range(start, stop):
+            rows.append({
+                "step": k,
+                "symbol": self.inputs[k - 1],
+                "from": self.describe(self.config_at(k - 1)),
+                "to": self.describe(self.config_at(k)),
+            })
+        return rows
+
+    def collapsed(self, start, stop):
+        """Seperti ``window`` tapi langkah berurutan yang tetap di konfigurasi sama digabung.
+
+        Setiap baris punya ``step`` (langkah pertama), ``count`` dan ``symbols``
+        (potongan simbol run tersebut).
+        """
+        start, stop = max(start, 1), min(stop, len(self))
+        rows = []
+        k = start
+        while k < stop:
+            run = bisect_right(self.run_end, k)
+            config = self.run_config[run]
+            before = self.config_at(k - 1)
+            if before == config:
+                end = min(self.run_end[run], stop)
+            else:
+                end = k + 1
+            symbols = self.inputs[k - 1:min(end - 1, k - 1 + SYMBOL_PREVIEW)]
+            rows.append({
+                "step": k,
+                "count": end - k,
+                "symbols": "".join(symbols) if not isinstance(symbols, str) else symbols,
+                "from": self.describe(before),
+                "to": self.describe(config),
+            })
+            k = end
+        return rows
+
+    def page(self, start=1, size=100, collapse=True):
+        """Satu halaman hasil untuk template / JSON."""
+        stop = start + size
+        rows = self.collapsed(start, stop) if collapse else self.window(start, stop)
+        return {
+            "start": start,
+            "stop": min(stop, len(self)),
+            "steps": self.steps,
+            "runs": len(self.run_config),
+            "truncated": self.truncated,
+            "accepted": self.accepted,
+            "engine": self.engine,
+            "initial": self.describe(self.run_config[0]) if self.run_config else None,
+            "rows": rows,
+            "next": stop if stop < len(self) else None,
+        }
@@ -1,33 +1,125 @@
-from flask import Blueprint, render_template, request
-from app.logic.tes_dfa import run_dfa
-from app.logic.regex_to_nfa import RegexToNFA
-from app.logic.minimization_dfa import DFA
+import time
+import uuid
+from flask import Blueprint, Response, render_template, request, jsonify
+from app.logic.tes_dfa import run_dfa_batch, compile_dfa, parse_transitions, np
+from app.logic.incremental_min import RebuildRequired
 from app.logic.minimization_dfa import build_and_minimize_dfa
-from app.logic.tes_equivalen import parse_dfa, are_equivalent
+from app.logic.offload import (
+    Saturated, budget, check_states, equivalence_job, gauges as offload_gauges,
+    minimization_job, offloader, regex_job,
+)
+from app.logic.render import submit_png, render_status
+from app.logic.cache import (
+    automata_cache, trace_cache, automaton_fingerprint, fingerprint, regex_fingerprint,
+)
+from app.logic.metrics import render_prometheus, timed
+from app.logic.store import automata_store, stored
+from app.logic.trace import MAX_STEPS
 
 main = Blueprint('main', __name__)
 
+# Semua render template ikut tercatat di histogram stage="render_template"
+render_template = timed("render_template")(render_template)
+
+# Langkah per halaman tabel trace
+TRACE_PAGE_SIZE = 100
+
+# Mesin pengujian string di /regex-to-nfa (lihat offload.regex_job)
+REGEX_ENGINES = ("auto", "derivative", "thompson")
+
+def _busy(template, error):
+    """Antrean offload penuh: 503 dengan perkiraan Retry-After."""
+    response = Response(render_template(template, error=str(error)), status=503)
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response
+
 @main.route('/')
 def index():
     return render_template('index.html')
 
+def _dfa_key(states, alphabet, start_state, accept_states, transitions):
+    return automaton_fingerprint(
+        "tes-dfa", states, alphabet, start_state, accept_states,
+        ((s, a, t) for (s, a), t in transitions.items()),
+    )
+
+def _compiled_dfa(states, alphabet, start_state, accept_states, transitions, key=None):
+    if key is None:
+        key = _dfa_key(states, alphabet, start_state, accept_states, transitions)
+    # Memori dulu, lalu store di disk (mmap), baru kompilasi
+    return automata_cache.get_or_create(key, lambda: stored(
+        key, lambda: compile_dfa(states, alphabet, start_state, accept_states, transitions)
+    ))
+
+def _cached_trace(automaton_key, test_string, build):
+    """(token, trace): trace disimpan di trace_cache supaya halaman berikutnya bisa diambil."""
+    token = fingerprint("trace", [automaton_key, test_string])
+    return token, trace_cache.get_or_create(token, lambda: build(test_string, max_steps=MAX_STEPS))
+
 @main.route('/tes-dfa', methods=["GET", "POST"])
 def tes_dfa():
     output = None
-    result_steps = []
-    
+    page = None
+    token = None
+
     if request.method == "POST":
         states = request.form["states"].split()
         alphabet = request.form["alphabet"].split()
         start_state = request.form["start_state"]
         accept_states = request.form["accept_states"].split()
-        transitions_input = request.form["transitions"]
+        transitions = parse_transitions(request.form["transitions"])
         test_string = request.form["test_string"]
 
-        result_steps, accepted = run_dfa(states, alphabet, start_state, accept_states, transitions_input, test_string)
-        output = "Accepted" if accepted else "Rejected"
+        key = _dfa_key(states, alphabet, start_state, accept_states, transitions)
+        compiled = _compiled_dfa(states, alphabet, start_state, accept_states, transitions, key=key)
+        token, trace = _cached_trace(key, test_string, compiled.trace)
+        page = trace.page(1, TRACE_PAGE_SIZE)
+        output = "Accepted" if trace.accepted else "Rejected"
+
+    return render_template("tes_dfa.html", result=output, page=page, trace_token=token)
+
+@main.route('/trace/<token>')
+def trace_page(token):
+    """Jendela langkah berikutnya dari trace /tes-dfa atau /regex-to-nfa."""
+    trace = trace_cache.get(token)
+    if trace is None:
+        return jsonify({"error": "Trace tidak ditemukan atau sudah kedaluwarsa, jalankan ulang pengujian"}), 404
+    start = request.args.get("start", 1, type=int)
+    size = min(request.args.get("size", TRACE_PAGE_SIZE, type=int), 10 * TRACE_PAGE_SIZE)
+    collapse = request.args.get("collapse", "1") not in ("0", "false")
+    return jsonify(trace.page(max(start, 1), max(size, 1), collapse=collapse))
+
+@main.route('/tes-dfa/batch', methods=["POST"])
+def tes_dfa_batch():
+    try:
+        states = request.form["states"].split()
+        alphabet = request.form["alphabet"].split()
+        start_state = request.form["start_state"]
+        accept_states = request.form["accept_states"].split()
+        transitions = parse_transitions(request.form["transitions"])
+
+        # String uji dari textarea (satu per baris) atau file upload
+        upload = request.files.get("strings_file")
+        if upload:
+            test_strings = upload.read().decode("utf-8").splitlines()
+        else:
+            test_strings = request.form.get("test_strings", "").splitlines()
+
+        compiled = _compiled_dfa(states, alphabet, start_state, accept_states, transitions)
+        started = time.perf_counter()
+        verdicts = run_dfa_batch(compiled, test_strings)
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        return jsonify(error=str(e)), 400
 
-    return render_template("tes_dfa.html", result=output, steps=result_steps)
+    return jsonify(
+        verdicts=verdicts,
+        count=len(verdicts),
+        accepted=sum(verdicts),
+        engine="numpy" if np is not None else "python",
+        elapsed_seconds=elapsed,
+        strings_per_second=len(verdicts) / elapsed if elapsed > 0 else None,
+    )
 
 @main.route('/minimization', methods=['GET', 'POST'])
 def minimization():
@@ -63,48 +155,101 @@ def minimization():
                 "transitions": transitions
             }
 
-            result = build_and_minimize_dfa(input_data)
-            return render_template("minimization.html", result=result)
-            
+            engine = request.form.get("engine", "hopcroft")
+            # Token sesi di hidden field: partisi submit sebelumnya dipakai ulang
+            session_token = request.form.get("session") or uuid.uuid4().hex
+            session_key = fingerprint("minimization-session", session_token)
+            session = automata_cache.get(session_key) if engine == "hopcroft" else None
+            key = fingerprint("minimization", [engine, automaton_fingerprint(
+                "dfa", states, alphabet, start_state, final_states,
+                (tuple(k.split(",")) + (v,) for k, v in transitions.items()),
+            )])
+            # SVG langsung dikirim, PNG dirender di process pool dan di-poll halaman
+            result = automata_cache.get(key)
+            if result is None:
+                if session is not None and session.dfa.states:
+                    # Edit dari submit sebelumnya: update inkremental cukup ringan untuk di sini,
+                    # kecuali jika butuh Hopcroft penuh (itu dijalankan di process pool)
+                    check_states(len(set(states)), budget("minimization")["max_states"])
+                    try:
+                        result = build_and_minimize_dfa(input_data, engine=engine, render="svg",
+                                                        session=session, store=automata_store,
+                                                        rebuild=False)
+                    except RebuildRequired:
+                        pass
+                if result is None:
+                    result, session = offloader.run("minimization", minimization_job, input_data, engine)
+                    if session is not None:
+                        automata_cache.set(session_key, session)
+                automata_cache.set(key, result)
+            render_token = submit_png(result["minimized"], token=key)
+            return render_template("minimization.html", result=result, render_token=render_token,
+                                   session_token=session_token)
+
+        except Saturated as e:
+            return _busy("minimization.html", e)
         except Exception as e:
             error_msg = str(e)
             return render_template("minimization.html", error=error_msg)
 
     return render_template("minimization.html")
 
+@main.route('/minimization/render/<token>')
+def minimization_render(token):
+    return jsonify(render_status(token))
+
 @main.route('/regex-to-nfa', methods=['GET', 'POST'])
 def regex_to_nfaview():
     nfa_description = None
     regex_input = ""
     test_result = None
-    test_path = None
+    page = None
+    token = None
     test_string = ""
-    
+    engine = "auto"
+
     if request.method == 'POST':
         try:
             regex_input = request.form.get('regex', '')
             test_string = request.form.get('test_string', '')
-            converter = RegexToNFA()
-            nfa = converter.regex_to_nfa(regex_input)
-            nfa_description = converter.get_nfa_description(nfa)
-            
+            engine = request.form.get('engine', 'auto')
+            if engine not in REGEX_ENGINES:
+                raise ValueError(f"Mesin pengujian tidak dikenal: {engine}")
+            key = regex_fingerprint(regex_input)
+            nfa_description = automata_cache.get(key)
+            trace = None
             if test_string:
-                is_accepted, path = nfa.test_string(test_string)
-                test_result = is_accepted
-                test_path = []
-                for states, symbol in path:
-                    test_path.append({
-                        'states': states,  # states sudah dalam bentuk list of strings
-                        'symbol': symbol if symbol is not None else 'ε'
-                    })
+                token = fingerprint("trace", [key, engine, test_string])
+                trace = trace_cache.get(token)
+
+            # Bangun NFA dan/atau trace yang belum ada di cache di process pool
+            if nfa_description is None or (test_string and trace is None):
+                description, built = offloader.run(
+                    "regex_to_nfa", regex_job, regex_input,
+                    test_string if trace is None else "", nfa_description is None, engine,
+                )
+                if nfa_description is None:
+                    nfa_description = description
+                    automata_cache.set(key, nfa_description)
+                if built is not None:
+                    trace = built
+                    trace_cache.set(token, trace)
+
+            if trace is not None:
+                page = trace.page(1, TRACE_PAGE_SIZE)
+                test_result = trace.accepted
+        except Saturated as e:
+            return _busy('regex_to_nfa.html', e)
         except Exception as e:
             return render_template('regex_to_nfa.html', error=str(e))
     return render_template('regex_to_nfa.html', 
                          nfa=nfa_description, 
                          regex=regex_input,
                          test_string=test_string,
+                         engine=engine,
                          test_result=test_result,
-                         test_path=test_path)
+                         page=page,
+                         trace_token=token)
 
 @main.route('/equivalence', methods=['GET', 'POST'])
 def check_equivalence():
@@ -114,33 +259,61 @@ def check_equivalence():
     
     # Jika request adalah POST, proses form
     try:
-        # Ambil data dari form
-        states1 = request.form.get("states1", "")
-        symbols1 = request.form.get("symbols1", "")
-        start1 = request.form.get("start1", "")
-        finals1 = request.form.get("final1", "")
-        transitions1 = request.form.get("transitions1", "")
-
-        states2 = request.form.get("states2", "")
-        symbols2 = request.form.get("symbols2", "")
-        start2 = request.form.get("start2", "")
-        finals2 = request.form.get("final2", "")
-        transitions2 = request.form.get("transitions2", "")
-
-        # Validasi input tidak kosong
-        if not all([states1, symbols1, start1, finals1, transitions1, 
-                   states2, symbols2, start2, finals2, transitions2]):
-            raise ValueError("Semua field harus diisi")
-
-        # Parsing kedua DFA
-        dfa1 = parse_dfa(states1, symbols1, start1, finals1, transitions1)
-        dfa2 = parse_dfa(states2, symbols2, start2, finals2, transitions2)
-
-        # Cek ekivalensi
-        equivalent = are_equivalent(dfa1, dfa2)
-        result = "Kedua DFA adalah ekuivalen." if equivalent else "Kedua DFA tidak ekuivalen."
-
-        return render_template("equivalent.html", result=result)
-    
+        type1 = request.form.get("type1", "dfa")
+        type2 = request.form.get("type2", "dfa")
+        side1 = _equivalence_fields(1, type1)
+        side2 = _equivalence_fields(2, type2)
+
+        # Hasil di-cache per pasangan input; yang belum ada dihitung di process pool
+        key = fingerprint("equivalence", [type1, side1, type2, side2])
+        outcome = automata_cache.get(key)
+        if outcome is None:
+            outcome = offloader.run("equivalence", equivalence_job, type1, side1, type2, side2)
+            automata_cache.set(key, outcome)
+        equivalent, counterexample, accepted_by_first = outcome
+
+        label = "Kedua DFA" if type1 == type2 == "dfa" else "Kedua automata"
+        result = f"{label} adalah ekuivalen." if equivalent else f"{label} tidak ekuivalen."
+        reason = None
+        if counterexample is not None:
+            word = "".join(counterexample) or "ε"
+            accepted_by = "automata 1" if accepted_by_first else "automata 2"
+            reason = f"String terpendek pembeda: '{word}' (hanya diterima oleh {accepted_by})."
+
+        return render_template("equivalent.html", result=result, reason=reason)
+
+    except Saturated as e:
+        return _busy("equivalent.html", e)
     except Exception as e:
-        return render_template("equivalent.html", error=f"Error: {str(e)}")
\ No newline at end of file
+        return render_template("equivalent.html", error=f"Error: {str(e)}")
+
+def _equivalence_fields(n, kind):
+    """Ambil field form untuk automata ke-n; regex cukup satu field"""
+    if kind == "regex":
+        return {"regex": request.form.get(f"regex{n}", "")}
+    fields = {
+        "states": request.form.get(f"states{n}", ""),
+        "symbols": request.form.get(f"symbols{n}", ""),
+        "start": request.form.get(f"start{n}", ""),
+        "finals": request.form.get(f"final{n}", ""),
+        "transitions": request.form.get(f"transitions{n}", ""),
+    }
+    # Validasi input tidak kosong (NFA boleh tanpa final state dan transisi)
+    required = fields if kind == "dfa" else {k: fields[k] for k in ("states", "symbols", "start")}
+    if not all(required.values()):
+        raise ValueError("Semua field harus diisi")
+    return fields
+
+@main.route('/cache/stats')
+def cache_stats():
+    return jsonify(automata_cache.stats())
+
+@main.route('/metrics')
+def metrics():
+    stats = automata_cache.stats()
+    gauges = {f"cache_{key}": stats[key] for key in ("size", "hits", "misses", "hit_rate", "evictions")}
+    gauges.update(offload_gauges())
+    if automata_store is not None:
+        gauges.update({f"store_{key}": value for key, value in automata_store.stats().items()
+                       if key in ("entries", "bytes")})
+    return Response(render_prometheus(gauges), mimetype="text/plain; version=0.0.4")
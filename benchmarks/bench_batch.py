@@ -0,0 +1,57 @@
+"""Throughput batch minimisasi (app.logic.batch) untuk beberapa jumlah worker.
+
+Jalankan dari root repo:
+
+    python -m benchmarks.bench_batch
+    python -m benchmarks.bench_batch --jobs 2000 --states 500 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+
+from app.logic.batch import run_batch
+from benchmarks.generators import random_dfa
+
+
+def make_jobs(n_jobs, n_states, n_symbols):
+    jobs = []
+    for i in range(n_jobs):
+        dfa = random_dfa(n_states, n_symbols, seed=i)
+        jobs.append({"id": i, "automaton": {
+            "type": "dfa",
+            "states": sorted(dfa.states),
+            "alphabet": sorted(dfa.alphabet),
+            "start": dfa.start_state,
+            "finals": sorted(dfa.final_states),
+            "transitions": [[s, a, t] for (s, a), t in dfa.transitions.items()],
+        }})
+    return jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--states", type=int, default=300)
+    parser.add_argument("--symbols", type=int, default=2)
+    parser.add_argument("--chunk-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    args = parser.parse_args(argv)
+
+    jobs = make_jobs(args.jobs, args.states, args.symbols)
+    print(f"{args.jobs} job, {args.states} state per DFA, {os.cpu_count()} core")
+    print(f"{'workers':>8} {'detik':>8} {'job/s':>9} {'speedup':>8}")
+    base = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = list(run_batch(jobs, workers=workers, chunk_size=args.chunk_size))
+        elapsed = time.perf_counter() - start
+        if not all(r["ok"] for r in results):
+            raise SystemExit("Ada job yang gagal")
+        rate = len(results) / elapsed
+        base = base or rate
+        print(f"{workers:>8} {elapsed:8.2f} {rate:9.1f} {rate / base:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Bandingkan engine minimisasi DFA (hopcroft vs legacy) pada DFA acak.
+
+Jalankan dari root repo:
+
+    python -m benchmarks.bench_minimization
+    python -m benchmarks.bench_minimization --sizes 100 1000 10000 --legacy-max 1000
+"""
+import argparse
+import time
+
+from benchmarks.generators import random_dfa
+
+
+def time_engine(dfa, engine):
+    start = time.perf_counter()
+    minimized = dfa.minimize(engine=engine)
+    return time.perf_counter() - start, len(minimized.states)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--symbols", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="lewati engine legacy untuk DFA yang lebih besar dari ini")
+    args = parser.parse_args(argv)
+
+    print(f"{'states':>8} {'hopcroft (s)':>14} {'legacy (s)':>12} {'minimal':>8}")
+    for n in args.sizes:
+        dfa = random_dfa(n, args.symbols, seed=args.seed)
+        fast, size = time_engine(dfa, "hopcroft")
+        if n <= args.legacy_max:
+            slow, legacy_size = time_engine(dfa, "legacy")
+            if legacy_size != size:
+                raise SystemExit(f"Hasil berbeda untuk n={n}: {size} vs {legacy_size}")
+            slow = f"{slow:12.4f}"
+        else:
+            slow = f"{'-':>12}"
+        print(f"{n:>8} {fast:14.4f} {slow} {size:>8}")
+
+
+if __name__ == "__main__":
+    main()
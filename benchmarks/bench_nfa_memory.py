@@ -0,0 +1,58 @@
+"""Memori NFA Thompson: objek State vs CompactNFA (CSR array), diukur dengan tracemalloc.
+
+Jalankan dari root repo:
+
+    python -m benchmarks.bench_nfa_memory
+    python -m benchmarks.bench_nfa_memory --repeat 2000 --min-ratio 5
+"""
+import argparse
+import sys
+import tracemalloc
+
+from app.logic.regex_to_nfa import RegexToNFA
+
+
+def measure(regex, form):
+    """Byte yang masih teralokasi untuk NFA setelah konstruksi selesai."""
+    converter = RegexToNFA()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nfa = converter.regex_to_nfa(regex, form=form)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return nfa, after - before
+
+
+def edge_count(nfa):
+    if hasattr(nfa, "edge_targets"):
+        return len(nfa.edge_targets)
+    return sum(len(targets) for state in nfa.states for targets in state.transitions.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pattern", default="(ab|c)*[a-d]+x?")
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--min-ratio", type=float, default=None,
+                        help="keluar dengan status 1 jika rasio penghematan di bawah nilai ini")
+    args = parser.parse_args(argv)
+
+    regex = args.pattern * args.repeat
+    obj, obj_bytes = measure(regex, "object")
+    compact, compact_bytes = measure(regex, "compact")
+    edges = edge_count(obj)
+
+    print(f"regex: {len(regex)} karakter, {len(obj.states)} state, {edges} edge")
+    print(f"{'form':>8} {'bytes':>12} {'bytes/edge':>11}")
+    print(f"{'object':>8} {obj_bytes:>12} {obj_bytes / edges:11.1f}")
+    print(f"{'compact':>8} {compact_bytes:>12} {compact_bytes / edges:11.1f}")
+    ratio = obj_bytes / compact_bytes
+    print(f"rasio: {ratio:.1f}x")
+
+    if args.min_ratio is not None and ratio < args.min_ratio:
+        print(f"FAIL: rasio di bawah {args.min_ratio}x")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Latensi per karakter: NFA berbasis objek State vs BitsetNFA.
+
+Dua perbandingan yang setara: ``path`` memakai ``test_string`` di kedua sisi
+(verdict + jejak state per langkah), ``verdict`` hanya menghitung diterima
+atau tidak (``object_accepts`` vs ``BitsetNFA.accepts``).
+
+Jalankan dari root repo:
+
+    python -m benchmarks.bench_nfa_simulation
+    python -m benchmarks.bench_nfa_simulation --width 50 --length 20000
+"""
+import argparse
+import random
+import time
+
+from app.logic.regex_to_nfa import RegexToNFA
+
+
+def wide_regex(width):
+    """(a|b)*a(a|b)(a|b)... dengan ``width`` posisi, ratusan state NFA."""
+    return "(a|b)*a" + "(a|b)" * width
+
+
+def object_accepts(nfa, string):
+    """Verdict saja untuk NFA objek: simulasi yang sama dengan test_string tanpa path."""
+    current = nfa.epsilon_closure({nfa.initial_state})
+    for symbol in string:
+        if symbol not in nfa.alphabet:
+            return False
+        current = nfa.epsilon_closure(nfa.move(current, symbol))
+        if not current:
+            return False
+    return any(state in nfa.final_states for state in current)
+
+
+def per_char(fn, string):
+    start = time.perf_counter()
+    fn(string)
+    return (time.perf_counter() - start) / max(len(string), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--length", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    string = "".join(rng.choice("ab") for _ in range(args.length))
+    converter = RegexToNFA()
+
+    print(f"{'width':>6} {'states':>7} {'mode':>8} {'object (us/char)':>17} {'bitset (us/char)':>17} {'speedup':>8}")
+    for width in args.width:
+        regex = wide_regex(width)
+        nfa = converter.regex_to_nfa(regex)
+        bitset = converter.regex_to_nfa(regex, form="bitset")
+        pairs = (
+            ("path", nfa.test_string, bitset.test_string),
+            ("verdict", lambda s: object_accepts(nfa, s), bitset.accepts),
+        )
+        for mode, slow_fn, fast_fn in pairs:
+            slow = per_char(slow_fn, string)
+            fast = per_char(fast_fn, string)
+            print(f"{width:>6} {len(nfa.states):>7} {mode:>8} {slow * 1e6:17.2f} {fast * 1e6:17.2f} "
+                  f"{slow / fast:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Ukur waktu import ``create_app()`` dengan ``python -X importtime``.
+
+Keluar dengan status 1 jika total waktu import melewati budget atau jika
+backend gambar (matplotlib/networkx) ikut ter-import saat startup.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --budget-ms 400 --top 15
+
+Pengecekan yang sama dijalankan oleh ``tests/test_startup.py``.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+SNIPPET = (
+    "import sys; from app import create_app; create_app(); "
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))"
+)
+HEAVY_MODULES = ("matplotlib", "networkx")
+DEFAULT_BUDGET_MS = 500.0
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(runs=3):
+    """Jalankan import di proses baru; kembalikan (total_us, per_modul, heavy) dari run tercepat."""
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SNIPPET.format(heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True, cwd=ROOT,
+        )
+        modules = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            # Indentasi nama menunjukkan kedalaman import; top-level tanpa indentasi
+            modules[name[1:].rstrip()] = (int(self_us), int(cumulative_us))
+        total = sum(cumulative for name, (_, cumulative) in modules.items()
+                    if not name.startswith(" "))
+        heavy = [m for m in proc.stdout.strip().split(",") if m]
+        if best is None or total < best[0]:
+            best = (total, modules, heavy)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    total, modules, heavy = measure(args.runs)
+    slowest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    print(f"{'cumulative (ms)':>16} {'self (ms)':>10}  module")
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{cumulative_us / 1000:16.1f} {self_us / 1000:10.1f}  {name.strip()}")
+    print(f"\ntotal import time: {total / 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: backend gambar ter-import saat startup: {', '.join(heavy)}")
+        failed = True
+    if total / 1000 > args.budget_ms:
+        print("FAIL: waktu import melewati budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Generator input benchmark yang deterministik (semua memakai seed).
+
+DFA dikembalikan sebagai ``minimization_dfa.DFA``; helper ``as_parsed`` dan
+``as_form`` mengubahnya ke bentuk yang dipakai ``tes_equivalen`` dan ``run_dfa``.
+"""
+import random
+
+from app.logic.minimization_dfa import DFA
+
+
+def random_dfa(n_states, n_symbols=2, final_ratio=0.3, seed=0):
+    """DFA lengkap dengan transisi acak; sebagian besar state biasanya tetap berbeda."""
+    rng = random.Random(seed)
+    states = [f"s{i}" for i in range(n_states)]
+    alphabet = [str(a) for a in range(n_symbols)]
+    finals = [s for s in states if rng.random() < final_ratio]
+    transitions = {
+        (s, a): states[rng.randrange(n_states)]
+        for s in states for a in alphabet
+    }
+    return DFA(states, alphabet, states[0], finals, transitions)
+
+
+def counter_dfa(n, copies=4):
+    """Hitung 'a' modulo ``n * copies`` tapi terima kelipatan ``n``: minimal tepat ``n`` state.
+
+    Semua state saling terhubung dalam satu siklus, sehingga refinement
+    harus berjalan beberapa putaran sebelum kelas-kelasnya stabil.
+    """
+    size = n * copies
+    states = [f"c{i}" for i in range(size)]
+    transitions = {}
+    for i, state in enumerate(states):
+        transitions[(state, "a")] = states[(i + 1) % size]
+        transitions[(state, "b")] = state
+    finals = [states[i] for i in range(0, size, n)]
+    return DFA(states, ["a", "b"], states[0], finals, transitions)
+
+
+def blowup_regex(n):
+    """(a|b)*a(a|b){n}: NFA n+O(1) state, DFA ekuivalen butuh 2^(n+1) state."""
+    return f"(a|b)*a(a|b){{{n}}}"
+
+
+def nested_star_regex(depth):
+    """((a*)*)*... bersarang: banyak rantai epsilon untuk closure."""
+    regex = "a"
+    for _ in range(depth):
+        regex = f"({regex})*"
+    return regex
+
+
+def alternation_regex(n_words, length=6, seed=0):
+    """Gabungan ``n_words`` kata acak atas {a, b, c}."""
+    rng = random.Random(seed)
+    words = {"".join(rng.choice("abc") for _ in range(length)) for _ in range(n_words)}
+    return "|".join(sorted(words))
+
+
+def random_string(length, alphabet="ab", seed=0):
+    rng = random.Random(seed)
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def as_parsed(dfa):
+    """DFA -> dict berformat hasil ``tes_equivalen.parse_dfa`` (view di atas ``Automaton``)."""
+    return dfa.automaton.parsed()
+
+
+def as_form(dfa):
+    """DFA -> argumen teks ``run_dfa`` (transisi 'asal simbol tujuan' per baris)."""
+    return {
+        "states": sorted(dfa.states),
+        "alphabet": sorted(dfa.alphabet),
+        "start_state": dfa.start_state,
+        "accept_states": sorted(dfa.final_states),
+        "transitions_input": "\n".join(f"{s} {a} {t}" for (s, a), t in dfa.transitions.items()),
+    }
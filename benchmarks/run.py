@@ -0,0 +1,334 @@
+"""Suite benchmark untuk semua algoritma di app/logic, dengan baseline JSON.
+
+Jalankan dari root repo:
+
+    python -m benchmarks.run                                   # semua case
+    python -m benchmarks.run --quick -k minimize               # ukuran kecil, filter nama
+    python -m benchmarks.run --output hasil.json
+    python -m benchmarks.run --quick --save-baseline           # tulis benchmarks/baseline.json
+    python -m benchmarks.run --quick --baseline benchmarks/baseline.json --threshold 0.25
+
+Setiap case menyiapkan input dari generator ber-seed (benchmarks/generators.py)
+di luar pengukuran, lalu fungsi yang diukur dijalankan ``--repeat`` kali
+setelah satu putaran pemanasan. Yang dibandingkan dengan baseline adalah
+median; case yang lebih lambat dari ``baseline * (1 + threshold)`` ditandai
+REGRESI dan status keluar menjadi 1.
+
+benchmarks/baseline.json yang di-commit adalah hasil mode ``--quick``; case
+hanya dibandingkan jika ukurannya sama, jadi CI menjalankan perintah terakhir
+di atas (juga dengan ``--quick``). Baseline bergantung pada mesin: setelah
+mengganti runner CI atau sengaja mengubah performa, buat ulang dengan
+``--quick --save-baseline`` di mesin tersebut dan commit hasilnya.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from app.logic.bitset_nfa import BitsetNFA
+from app.logic.derivatives import DerivativeMatcher
+from app.logic.incremental_min import IncrementalMinimizer
+from app.logic.minimization_dfa import DFA
+from app.logic.nfa_to_dfa import SubsetDFA, determinize
+from app.logic.preprocess import prune_dfa
+from app.logic.regex_parser import parse_regex
+from app.logic.regex_to_nfa import RegexToNFA
+from app.logic.store import AutomataStore
+from app.logic.tes_dfa import compile_dfa, run_dfa, run_dfa_batch
+from app.logic.tes_equivalen import are_equivalent, check_language_equivalence, lazy_automaton
+from benchmarks.generators import (
+    alternation_regex, as_form, as_parsed, blowup_regex, counter_dfa, nested_star_regex,
+    random_dfa, random_string,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+CASES = {}
+
+
+def case(name, quick, full):
+    """Daftarkan case: ``fn(size)`` menyiapkan input lalu mengembalikan callable tanpa argumen."""
+    def register(fn):
+        CASES[name] = (fn, quick, full)
+        return fn
+    return register
+
+
+@case("minimize/hopcroft/random", quick=500, full=5000)
+def _(n):
+    dfa = random_dfa(n, 2, seed=1)
+    return lambda: dfa.minimize()
+
+
+@case("minimize/hopcroft/counter", quick=100, full=1000)
+def _(n):
+    dfa = counter_dfa(n, copies=8)
+    return lambda: dfa.minimize()
+
+
+@case("minimize/legacy/counter", quick=20, full=60)
+def _(n):
+    dfa = counter_dfa(n, copies=4)
+    return lambda: dfa.minimize(engine="legacy")
+
+
+@case("minimize/incremental/edit", quick=2000, full=20000)
+def _(n):
+    # Pohon biner: mengubah status final satu daun hanya menyentuh jalur ke akar
+    states = [f"p{i}" for i in range(n)]
+    transitions = {}
+    for i, state in enumerate(states):
+        for k, symbol in enumerate("ab"):
+            child = 2 * i + 1 + k
+            transitions[(state, symbol)] = states[child] if child < n else state
+    finals = set(states[n // 2::3])
+    leaf = states[n - 1]
+    versions = [prune_dfa(DFA(states, "ab", states[0], f, transitions)) for f in (finals, finals ^ {leaf})]
+    minimizer = IncrementalMinimizer(versions[0])
+    state = {"i": 0}
+
+    def run():
+        state["i"] ^= 1
+        minimizer.update(versions[state["i"]])
+    return run
+
+
+@case("prune/random", quick=2000, full=20000)
+def _(n):
+    dfa = random_dfa(n, 2, final_ratio=0.01, seed=2)
+    return lambda: prune_dfa(dfa)
+
+
+@case("equivalence/hopcroft-karp/counter", quick=200, full=2000)
+def _(n):
+    left, right = as_parsed(counter_dfa(n, copies=2)), as_parsed(counter_dfa(n, copies=3))
+    return lambda: are_equivalent(left, right)
+
+
+@case("equivalence/lazy/blowup-regex", quick=6, full=10)
+def _(n):
+    def run():
+        # Automata lazy dibuat ulang supaya cache subset construction tidak terbawa
+        left = lazy_automaton("regex", regex=blowup_regex(n))
+        right = lazy_automaton("regex", regex=f"(a|b)*a(a|b){{{n - 1}}}(a|b)")
+        check_language_equivalence(left, right)
+    return run
+
+
+@case("regex_to_nfa/parse/alternation", quick=200, full=2000)
+def _(n):
+    regex = alternation_regex(n, seed=3)
+    return lambda: parse_regex(regex)
+
+
+@case("regex_to_nfa/object/alternation", quick=200, full=2000)
+def _(n):
+    regex = alternation_regex(n, seed=3)
+    converter = RegexToNFA()
+    return lambda: converter.regex_to_nfa(regex)
+
+
+@case("regex_to_nfa/compact/alternation", quick=200, full=2000)
+def _(n):
+    regex = alternation_regex(n, seed=3)
+    converter = RegexToNFA()
+    return lambda: converter.regex_to_nfa(regex, form="compact")
+
+
+@case("nfa/test_string/nested-star", quick=200, full=2000)
+def _(n):
+    nfa = RegexToNFA().regex_to_nfa(nested_star_regex(20))
+    string = "a" * n
+    return lambda: nfa.test_string(string)
+
+
+@case("nfa/test_string/blowup", quick=500, full=5000)
+def _(n):
+    nfa = RegexToNFA().regex_to_nfa(blowup_regex(12))
+    string = random_string(n, seed=4)
+    return lambda: nfa.test_string(string)
+
+
+@case("nfa/bitset/blowup", quick=5000, full=50000)
+def _(n):
+    nfa = BitsetNFA.from_nfa(RegexToNFA().regex_to_nfa(blowup_regex(12)))
+    string = random_string(n, seed=4)
+    return lambda: nfa.accepts(string)
+
+
+@case("nfa_to_dfa/subset/blowup", quick=8, full=12)
+def _(n):
+    nfa = RegexToNFA().regex_to_nfa(blowup_regex(n))
+    return lambda: SubsetDFA(nfa).to_dfa()
+
+
+@case("nfa_to_dfa/determinize/bounded", quick=2000, full=20000)
+def _(n):
+    nfa = RegexToNFA().regex_to_nfa(blowup_regex(18))
+    return lambda: determinize(nfa, max_states=n)
+
+
+@case("nfa/hybrid/blowup", quick=5000, full=50000)
+def _(n):
+    nfa = RegexToNFA().regex_to_nfa(blowup_regex(12))
+    string = random_string(n, seed=4)
+
+    def run():
+        # Cache DFA jauh di bawah 2^13 state: sebagian besar string lewat fallback NFA
+        SubsetDFA(nfa, max_states=256, hybrid=True).accepts(string)
+    return run
+
+
+# Regex sekali pakai: bangun matcher lalu uji satu string (jalur /regex-to-nfa)
+@case("regex_match/thompson/alternation", quick=200, full=2000)
+def _(n):
+    regex = alternation_regex(n, seed=3)
+    string = random_string(1000, alphabet="abc", seed=7)
+    return lambda: SubsetDFA(RegexToNFA().regex_to_nfa(regex)).accepts(string)
+
+
+@case("regex_match/derivative/alternation", quick=200, full=2000)
+def _(n):
+    regex = alternation_regex(n, seed=3)
+    string = random_string(1000, alphabet="abc", seed=7)
+    return lambda: DerivativeMatcher(regex).accepts(string)
+
+
+@case("regex_match/thompson/blowup", quick=5000, full=50000)
+def _(n):
+    regex = blowup_regex(10)
+    string = random_string(n, seed=4)
+    return lambda: SubsetDFA(RegexToNFA().regex_to_nfa(regex)).accepts(string)
+
+
+@case("regex_match/derivative/blowup", quick=5000, full=50000)
+def _(n):
+    regex = blowup_regex(10)
+    string = random_string(n, seed=4)
+    return lambda: DerivativeMatcher(regex).accepts(string)
+
+
+@case("run_dfa/trace/random", quick=5000, full=50000)
+def _(n):
+    form = as_form(random_dfa(200, 2, seed=5))
+    string = random_string(n, alphabet="01", seed=6)
+    return lambda: run_dfa(test_string=string, trace=True, **form)
+
+
+@case("run_dfa/compiled/accepts", quick=20000, full=200000)
+def _(n):
+    dfa = random_dfa(200, 2, seed=5)
+    compiled = compile_dfa(dfa.states, dfa.alphabet, dfa.start_state, dfa.final_states, dfa.transitions)
+    string = random_string(n, alphabet="01", seed=6)
+    return lambda: compiled.accepts(string)
+
+
+@case("run_dfa/batch/python", quick=500, full=5000)
+def _(n):
+    dfa = random_dfa(200, 2, seed=5)
+    compiled = compile_dfa(dfa.states, dfa.alphabet, dfa.start_state, dfa.final_states, dfa.transitions)
+    strings = [random_string(40, alphabet="01", seed=i) for i in range(n)]
+    return lambda: run_dfa_batch(compiled, strings, vectorized=False)
+
+
+# Warm-up setelah restart: kompilasi ulang vs memuat tabel dari store (mmap)
+@case("store/compile/random", quick=5000, full=50000)
+def _(n):
+    dfa = random_dfa(n, 2, seed=8)
+    return lambda: compile_dfa(dfa.states, dfa.alphabet, dfa.start_state, dfa.final_states, dfa.transitions)
+
+
+@case("store/mmap-load/random", quick=5000, full=50000)
+def _(n):
+    dfa = random_dfa(n, 2, seed=8)
+    directory = tempfile.TemporaryDirectory(prefix="tba-bench-")
+    store = AutomataStore(directory.name)
+    store.put("bench", compile_dfa(dfa.states, dfa.alphabet, dfa.start_state, dfa.final_states, dfa.transitions))
+
+    def load(directory=directory):
+        # Closure memegang ``directory``: dihapus begitu case selesai diukur
+        return store.get("bench")
+    return load
+
+
+def measure(fn, repeat):
+    fn()  # pemanasan
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "repeat": repeat}
+
+
+def compare(results, baseline, threshold):
+    """List (nama, rasio median sekarang/baseline, regresi?) untuk case dengan ukuran sama."""
+    rows = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before or not before.get("median") or before.get("size") != current["size"]:
+            continue
+        ratio = current["median"] / before["median"]
+        rows.append((name, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="hanya case yang namanya mengandung teks ini")
+    parser.add_argument("--quick", action="store_true", help="ukuran input kecil")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="simpan hasil sebagai JSON")
+    parser.add_argument("--baseline", help="bandingkan dengan file JSON hasil sebelumnya")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="batas perlambatan relatif sebelum dianggap regresi (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"tulis hasil ke {DEFAULT_BASELINE}")
+    args = parser.parse_args(argv)
+
+    selected = [name for name in CASES if args.filter in name]
+    if not selected:
+        raise SystemExit(f"Tidak ada case yang cocok dengan '{args.filter}'")
+
+    results = {}
+    print(f"{'case':<40} {'size':>7} {'median (ms)':>12} {'min (ms)':>10}")
+    for name in selected:
+        fn, quick, full = CASES[name]
+        size = quick if args.quick else full
+        stats = measure(fn(size), args.repeat)
+        stats["size"] = size
+        results[name] = stats
+        print(f"{name:<40} {size:>7} {stats['median'] * 1e3:12.3f} {stats['min'] * 1e3:10.3f}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    for path in filter(None, [args.output, DEFAULT_BASELINE if args.save_baseline else None]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"hasil ditulis ke {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline.get("results", {}), args.threshold)
+        print(f"\n{'case':<40} {'vs baseline':>12}")
+        for name, ratio, regressed in rows:
+            flag = "  REGRESI" if regressed else ""
+            print(f"{name:<40} {ratio:11.2f}x{flag}")
+        if any(regressed for _, _, regressed in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Hopcroft-Karp (tabel integer dan lazy) dibandingkan dengan pencarian brute force."""
+import itertools
+import random
+
+from app.logic.nfa_to_dfa import SubsetDFA
+from app.logic.regex_to_nfa import RegexToNFA
+from app.logic.tes_equivalen import (
+    ParsedDFAView, accepts, check_equivalence, check_language_equivalence, parse_dfa,
+)
+
+
+def _random_dfa(rng, symbols):
+    states = [f"s{i}" for i in range(rng.randint(1, 4))]
+    transitions = "\n".join(f"{s},{a},{rng.choice(states)}" for s in states for a in symbols)
+    finals = [s for s in states if rng.random() < 0.4]
+    return parse_dfa(",".join(states), ",".join(symbols), "s0", ",".join(finals), transitions)
+
+
+def _shortest_difference(left, right, symbols, max_length=8):
+    for n in range(max_length + 1):
+        for word in itertools.product(symbols, repeat=n):
+            if accepts(left, list(word)) != accepts(right, list(word)):
+                return list(word)
+    return None
+
+
+def test_dfa_equivalence_matches_brute_force():
+    rng = random.Random(3)
+    for i in range(300):
+        left = _random_dfa(rng, ["a", "b"] if i % 2 else ["a"])
+        right = _random_dfa(rng, rng.choice([["a"], ["b"], ["a", "b"]]))
+        symbols = sorted(set(left["symbols"]) | set(right["symbols"]))
+        expected = _shortest_difference(left, right, symbols)
+
+        for equivalent, counterexample in (
+            check_equivalence(left, right),
+            check_language_equivalence(ParsedDFAView(left), ParsedDFAView(right)),
+        ):
+            assert equivalent == (expected is None)
+            if expected is not None:
+                # Counterexample terpendek (boleh berbeda, panjangnya sama) dan memang pembeda
+                assert len(counterexample) == len(expected)
+                assert accepts(left, counterexample) != accepts(right, counterexample)
+
+
+def test_regex_equivalence():
+    converter = RegexToNFA()
+
+    def lazy(regex):
+        return SubsetDFA(converter.regex_to_nfa(regex))
+
+    assert check_language_equivalence(lazy("(a|b)*"), lazy("(a*b*)*")) == (True, None)
+    equivalent, counterexample = check_language_equivalence(lazy("(a|b)*abb"), lazy("(a|b)*a(a|b)b"))
+    assert not equivalent
+    assert "".join(counterexample) == "aab"
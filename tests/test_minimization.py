@@ -0,0 +1,97 @@
+"""Hopcroft dan minimisasi inkremental dibandingkan dengan engine lama (legacy)."""
+import random
+
+import pytest
+
+from app.logic.incremental_min import IncrementalMinimizer, RebuildRequired
+from app.logic.minimization_dfa import DFA
+from app.logic.tes_equivalen import check_equivalence
+from benchmarks.generators import as_parsed, counter_dfa, random_dfa
+
+
+def _equivalent(left, right):
+    return check_equivalence(as_parsed(left), as_parsed(right))[0]
+
+
+def _same(left, right):
+    return (left.states == right.states and left.start_state == right.start_state
+            and left.final_states == right.final_states
+            and dict(left.transitions.items()) == dict(right.transitions.items()))
+
+
+def _random_dfas(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        dfa = random_dfa(rng.randint(1, 30), rng.randint(1, 3), seed=i)
+        if i % 3 == 0:
+            # DFA parsial: transisi yang hilang menuju dead state implisit
+            transitions = {k: v for k, v in dfa.transitions.items() if rng.random() < 0.7}
+            dfa = DFA(dfa.states, dfa.alphabet, dfa.start_state, dfa.final_states, transitions)
+        yield dfa
+
+
+@pytest.mark.parametrize("prune", [True, False])
+def test_hopcroft_matches_legacy(prune):
+    for dfa in _random_dfas(150):
+        hopcroft = dfa.minimize(engine="hopcroft", prune=prune)
+        legacy = dfa.minimize(engine="legacy", prune=prune)
+        assert len(hopcroft.states) == len(legacy.states)
+        assert _equivalent(hopcroft, legacy)
+        assert _equivalent(hopcroft, dfa)
+
+
+def test_counter_dfa_minimal_size():
+    for n in (1, 3, 7):
+        assert len(counter_dfa(n).minimize().states) == n
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        random_dfa(3).minimize(engine="brzozowski")
+
+
+def _edit(rng, dfa, edits):
+    transitions = dict(dfa.transitions.items())
+    states = sorted(dfa.states)
+    for _ in range(edits):
+        transitions[rng.choice(sorted(transitions))] = rng.choice(states)
+    finals = set(dfa.final_states)
+    if rng.random() < 0.3:
+        finals ^= {rng.choice(states)}
+    return DFA(dfa.states, dfa.alphabet, dfa.start_state, finals, transitions)
+
+
+def test_incremental_matches_full_minimize():
+    rng = random.Random(1)
+    for seed in range(60):
+        dfa = random_dfa(40, 2, seed=seed)
+        minimizer = IncrementalMinimizer(dfa)
+        for _ in range(5):
+            dfa = _edit(rng, dfa, rng.choice([1, 1, 2, 30]))
+            assert _same(minimizer.update(dfa), dfa.minimize(engine="hopcroft", prune=False))
+
+
+def test_incremental_alphabet_change():
+    dfa = random_dfa(20, 2, seed=4)
+    minimizer = IncrementalMinimizer(dfa)
+    wider = random_dfa(20, 3, seed=5)
+    assert _same(minimizer.update(wider), wider.minimize(engine="hopcroft", prune=False))
+    assert minimizer.last_update["mode"] == "full"
+
+
+def test_incremental_rebuild_required_leaves_session_unchanged():
+    rng = random.Random(2)
+    raised = 0
+    for seed in range(40):
+        dfa = random_dfa(40, 2, seed=seed)
+        minimizer = IncrementalMinimizer(dfa)
+        edited = _edit(rng, dfa, 40)
+        try:
+            minimizer.update(edited, rebuild=False)
+        except RebuildRequired:
+            raised += 1
+            assert _same(minimizer.minimized(), dfa.minimize(engine="hopcroft", prune=False))
+            # Sesi tetap bisa dipakai untuk update berikutnya
+            small = _edit(rng, dfa, 1)
+            assert _same(minimizer.update(small), small.minimize(engine="hopcroft", prune=False))
+    assert raised
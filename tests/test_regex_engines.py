@@ -0,0 +1,100 @@
+"""Semua engine regex dibandingkan dengan ``re.fullmatch`` pada regex acak."""
+import itertools
+import random
+import re
+
+import pytest
+
+from app.logic.derivatives import DerivativeMatcher
+from app.logic.nfa_to_dfa import SubsetDFA
+from app.logic.regex_parser import MAX_DEPTH, MAX_NESTING, RegexSyntaxError, parse_regex
+from app.logic.regex_to_nfa import RegexToNFA
+
+ALPHABET = "ab"
+# Semua string sampai panjang 5, ditambah simbol di luar alfabet regex
+STRINGS = ["".join(w) for n in range(6) for w in itertools.product(ALPHABET, repeat=n)] + ["c", "abc"]
+
+
+def _random_regex(rng, depth):
+    """(regex sintaks aplikasi, regex Python) untuk bahasa yang sama."""
+    if depth == 0 or rng.random() < 0.25:
+        return rng.choice([("a", "a"), ("b", "b"), ("[ab]", "[ab]"), ("&", "")])
+    kind = rng.choice(["cat", "alt", "star", "plus", "opt", "repeat"])
+    if kind in ("cat", "alt"):
+        left, right = _random_regex(rng, depth - 1), _random_regex(rng, depth - 1)
+        sep = "|" if kind == "alt" else ""
+        return f"({left[0]}{sep}{right[0]})", f"(?:{left[1]}{sep}{right[1]})"
+    inner, py = _random_regex(rng, depth - 1)
+    if kind == "repeat":
+        low = rng.randint(0, 2)
+        high = rng.choice([low, low + 1, low + 2, None])
+        op = f"{{{low},}}" if high is None else f"{{{low},{high}}}"
+    else:
+        op = {"star": "*", "plus": "+", "opt": "?"}[kind]
+    return f"({inner}){op}", f"(?:{py}){op}"
+
+
+def _cases(count=120, seed=0):
+    rng = random.Random(seed)
+    return [_random_regex(rng, rng.randint(1, 4)) for _ in range(count)]
+
+
+def _engines(regex):
+    converter = RegexToNFA()
+    nfa = converter.regex_to_nfa(regex)
+    compact = converter.regex_to_nfa(regex, form="compact")
+    bitset = converter.regex_to_nfa(regex, form="bitset")
+    subset = SubsetDFA(nfa)
+    hybrid = SubsetDFA(nfa, max_states=2, hybrid=True)
+    derivative = DerivativeMatcher(regex)
+    return {
+        "nfa": lambda s: nfa.test_string(s)[0],
+        "compact": lambda s: compact.test_string(s)[0],
+        "bitset": bitset.accepts,
+        "subset": subset.accepts,
+        "subset-trace": lambda s: subset.trace(s).accepted,
+        "hybrid": hybrid.accepts,
+        "derivative": derivative.accepts,
+        "derivative-trace": lambda s: derivative.trace(s).accepted,
+    }
+
+
+@pytest.mark.parametrize("regex,python", _cases())
+def test_engines_match_re(regex, python):
+    pattern = re.compile(python)
+    for name, accepts in _engines(regex).items():
+        for string in STRINGS:
+            expected = pattern.fullmatch(string) is not None
+            assert accepts(string) == expected, (name, regex, string)
+
+
+@pytest.mark.parametrize("regex,python", [
+    ("(a|b)*abb", "(?:a|b)*abb"),
+    ("a{3}", "a{3}"),
+    ("(ab|&)+", "(?:ab|)+"),
+    ("[ab]?b*", "[ab]?b*"),
+])
+def test_known_regexes(regex, python):
+    pattern = re.compile(python)
+    for name, accepts in _engines(regex).items():
+        for string in STRINGS:
+            assert accepts(string) == (pattern.fullmatch(string) is not None), (name, regex, string)
+
+
+def test_deep_nesting_within_limits():
+    regex = "a"
+    for _ in range(MAX_NESTING):
+        regex = f"(a|b{regex})*"
+    for form in ("object", "compact"):
+        assert RegexToNFA().regex_to_nfa(regex, form=form).test_string("ab" * 50)[0]
+    assert DerivativeMatcher(regex).accepts("ab" * 50)
+    assert RegexToNFA().regex_to_nfa("a" + "*" * (MAX_DEPTH - 1)).test_string("aaa")[0]
+
+
+@pytest.mark.parametrize("regex", [
+    "(" * (MAX_NESTING + 1) + "a" + ")" * (MAX_NESTING + 1),
+    "a" + "*" * MAX_DEPTH,
+])
+def test_too_deep_is_syntax_error(regex):
+    with pytest.raises(RegexSyntaxError, match="bersarang"):
+        parse_regex(regex)
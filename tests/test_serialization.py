@@ -0,0 +1,77 @@
+"""Format packed TBAD: round-trip pack/unpack, encode_packed, dan data rusak."""
+import base64
+import struct
+
+import pytest
+
+from app.logic.minimization_dfa import DFA
+from app.logic.serialization import (
+    HEADER, compiled_to_schema, encode_packed, pack_dfa, schema_fingerprint, to_compiled_dfa,
+    to_dfa, unpack_dfa, validate_automaton,
+)
+from app.logic.tes_dfa import compile_dfa
+from benchmarks.generators import random_dfa, random_string
+
+
+def _compiled(dfa):
+    return compile_dfa(dfa.states, dfa.alphabet, dfa.start_state, dfa.final_states, dfa.transitions)
+
+
+def _same_language(left, right, alphabet, count=200):
+    for i in range(count):
+        string = random_string(i % 25, alphabet="".join(alphabet), seed=i)
+        assert left.accepts(string) == right.accepts(string), string
+
+
+@pytest.mark.parametrize("n_states,n_symbols", [(1, 1), (7, 2), (300, 3)])
+def test_pack_unpack_roundtrip(n_states, n_symbols):
+    original = _compiled(random_dfa(n_states, n_symbols, seed=n_states))
+    restored = unpack_dfa(pack_dfa(original))
+    assert compiled_to_schema(restored) == compiled_to_schema(original)
+    assert pack_dfa(restored) == pack_dfa(original)
+    _same_language(original, restored, original.symbols)
+
+
+def test_partial_dfa_roundtrip():
+    partial = DFA(["a", "b"], ["0", "1"], "a", ["b"], {("a", "0"): "b"})
+    restored = to_dfa({"type": "dfa", "encoding": "packed", "data": pack_dfa(_compiled(partial))})
+    assert dict(restored.transitions.items()) == {("a", "0"): "b"}
+    assert restored.final_states == {"b"}
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_encode_packed_roundtrip(binary):
+    original = _compiled(random_dfa(50, 2, seed=3))
+    encoded = encode_packed(original, binary=binary)
+    assert isinstance(encoded["data"], bytes if binary else str)
+    data = validate_automaton(encoded)
+    assert isinstance(data["data"], bytes)
+    assert compiled_to_schema(to_compiled_dfa(data)) == compiled_to_schema(original)
+
+
+def test_packed_fingerprint_ignores_transport_encoding():
+    original = _compiled(random_dfa(10, 2, seed=1))
+    text = validate_automaton(encode_packed(original))
+    binary = validate_automaton(encode_packed(original, binary=True))
+    assert schema_fingerprint(text) == schema_fingerprint(binary)
+
+
+@pytest.mark.parametrize("value", [None, 5, ["x"], "%%%"])
+def test_invalid_packed_data(value):
+    with pytest.raises(ValueError):
+        validate_automaton({"type": "dfa", "encoding": "packed", "data": value})
+
+
+def test_corrupt_packed_data():
+    data = bytearray(pack_dfa(_compiled(random_dfa(5, 2, seed=2))))
+    with pytest.raises(ValueError):
+        unpack_dfa(bytes(data[:HEADER.size + 4]))
+    with pytest.raises(ValueError):
+        unpack_dfa(b"XXXX" + bytes(data[4:]))
+    for bad in (10 ** 6, -3, 1):  # di luar tabel, negatif, bukan awal baris
+        struct.pack_into("<i", data, HEADER.size, bad)
+        with pytest.raises(ValueError):
+            unpack_dfa(bytes(data))
+    with pytest.raises(ValueError):
+        to_compiled_dfa(validate_automaton({"type": "dfa", "encoding": "packed",
+                                            "data": base64.b64encode(bytes(data)).decode()}))
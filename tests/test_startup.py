@@ -0,0 +1,18 @@
+"""Startup ``create_app()``: budget waktu import dan backend gambar yang lazy."""
+import os
+
+from benchmarks.bench_startup import DEFAULT_BUDGET_MS, measure
+
+# Mesin CI yang lambat bisa melonggarkan budget lewat environment
+BUDGET_MS = float(os.environ.get("TBA_STARTUP_BUDGET_MS") or DEFAULT_BUDGET_MS)
+
+
+def test_import_time_within_budget():
+    total_us, _, _ = measure(runs=3)
+    assert total_us / 1000 <= BUDGET_MS, f"import create_app {total_us / 1000:.1f} ms > {BUDGET_MS:.0f} ms"
+
+
+def test_drawing_backends_not_imported_at_startup():
+    # Diukur di proses baru: proses pytest bisa saja sudah meng-import matplotlib
+    _, _, heavy = measure(runs=1)
+    assert heavy == []
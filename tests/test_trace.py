@@ -0,0 +1,46 @@
+"""Paginasi ``Trace`` dibandingkan dengan path lengkap ``NFA.test_string``."""
+from app.logic.derivatives import DerivativeMatcher
+from app.logic.nfa_to_dfa import SubsetDFA
+from app.logic.regex_to_nfa import RegexToNFA
+
+
+def _pages(trace, size, collapse):
+    rows = []
+    start = 1
+    while start is not None:
+        page = trace.page(start, size, collapse=collapse)
+        rows.extend(page["rows"])
+        start = page["next"]
+    return rows
+
+
+def test_pages_cover_full_path():
+    nfa = RegexToNFA().regex_to_nfa("(a|b)*abb")
+    string = "ab" * 40 + "aaab" + "abb"
+    accepted, path = nfa.test_string(string)
+    trace = SubsetDFA(nfa).trace(string)
+    assert trace.accepted == accepted
+    assert trace.steps == len(string)
+
+    for size in (1, 7, 100):
+        rows = _pages(trace, size, collapse=False)
+        assert [row["step"] for row in rows] == list(range(1, len(string) + 1))
+        assert [row["symbol"] for row in rows] == list(string)
+        assert [row["to"] for row in rows] == [states for states, _ in path[1:]]
+
+
+def test_collapsed_pages_sum_to_steps():
+    string = "a" * 500 + "b" * 3
+    trace = DerivativeMatcher("a*b*").trace(string)
+    for size in (2, 1000):
+        rows = _pages(trace, size, collapse=True)
+        assert sum(row["count"] for row in rows) == len(string)
+    # Langkah yang tetap di konfigurasi sama digabung dalam satu baris
+    assert len(rows) < 10
+
+
+def test_truncated_trace():
+    trace = SubsetDFA(RegexToNFA().regex_to_nfa("a*")).trace("a" * 50, max_steps=10)
+    assert trace.truncated
+    assert trace.accepted
+    assert trace.page(1, 100)["stop"] <= 11